@@ -32,6 +32,8 @@ class Aging:
         # refresh variables for aging
         self.refresh_time_in_processed_instructions = refresh_rate
         self.time_of_last_refresh = 0
+        # virtual time of the last processed access
+        self.time_of_last_tick = 0
 
         self.keep_states: bool = keep_states
         self.table_states: list = []
@@ -50,6 +52,21 @@ class Aging:
         for elem in self.frame_queue:
             elem.aging_value >>= 1
 
+    def skip_idle_ticks(self):
+        """
+        Accounts for ticks of accesses which were not processed by the algorithm (accesses of other sets
+        in set-partitioned simulation, where virtual time advances by more than one access). No page is
+        referenced during them, so counters are only shifted at refreshes.
+        """
+        idle_ticks = self.page_table.total_memory_accesses - self.time_of_last_tick - 1
+        self.time_of_last_tick = self.page_table.total_memory_accesses
+        if idle_ticks <= 0:
+            return
+        ticks = self.time_of_last_refresh + idle_ticks
+        for _ in range(min(ticks // self.refresh_time_in_processed_instructions, Aging.COUNTER_LENGTH)):
+            self.shift_age_counter()
+        self.time_of_last_refresh = ticks % self.refresh_time_in_processed_instructions
+
     def collect_data_on_references_during_this_tick(self):
         """
         Checks if it is time to refresh counters.
@@ -77,8 +94,8 @@ class Aging:
         :return:
         """
         for elem in self.frame_queue:
-            # check for it a hit
-            if elem.vpn == vpn:
+            # check for it a hit, free frames hold no page (their vpn is 0 until the first eviction)
+            if elem.in_use and elem.vpn == vpn:
                 self.hit = True
 
                 if read_or_write == 'W':
@@ -94,8 +111,7 @@ class Aging:
         """
         for elem in self.frame_queue:
             if not elem.in_use:
-                elem.in_use = True
-                elem.vpn = vpn
+                self.page_table.map_page(elem, vpn)
                 if read_or_write == 'W':
                     elem.dirty = True
                 elem.reference = True
@@ -146,68 +162,74 @@ class Aging:
         :param ppn:
         """
         removal_page = self.frame_queue[ppn]
+        self.page_table.unmap_page(removal_page)
         removal_page.aging_value = 0
-        removal_page.in_use = False
         removal_page.reference = False
         removal_page.dirty = False
-        removal_page.vpn = None
 
     def get_next_address(self):
         """
         Consume current value at trace[0] and remove it from the list.
         :return: next address
         """
-        self.page_table.total_memory_accesses += 1
         return self.trace.pop(0)
 
+    def step(self, next_address):
+        """
+        Processes single memory access
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+        next_read_or_write = next_address[1]
+
+        self.skip_idle_ticks()
+        self.add_or_update_page(next_vpn, next_read_or_write)
+        self.collect_data_on_references_during_this_tick()
+
+        if self.hit:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->HIT",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+        elif not self.evict:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - NO EVICTION",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+            self.page_table.page_faults += 1
+        elif self.evict and not self.dirty:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT CLEAN",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+            self.page_table.page_faults += 1
+        else:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT DIRTY",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+            self.page_table.page_faults += 1
+
+        LOG.debug("Frame table:")
+        for page in self.frame_queue:
+            LOG.debug("%s", page)
+        LOG.debug("")
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
     def run_algorithm(self) -> rt.ResultTuple:
         """
         Processes each instruction and runs aging algorithm
         :return: ResultTuple
         """
         while self.trace:
-            self.hit = False
-            self.evict = False
-            self.dirty = False
-
-            next_address = self.get_next_address()
-            next_vpn = self.page_table.get_vpn(next_address[0])
-            next_read_or_write = next_address[1]
-
-            self.add_or_update_page(next_vpn, next_read_or_write)
-            self.collect_data_on_references_during_this_tick()
-
-            if self.hit:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->HIT",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-            elif not self.evict:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - NO EVICTION",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-                self.page_table.page_faults += 1
-            elif self.evict and not self.dirty:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT CLEAN",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-                self.page_table.page_faults += 1
-            else:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT DIRTY",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-                self.page_table.page_faults += 1
-
-            LOG.debug("Frame table:")
-            for page in self.frame_queue:
-                LOG.debug("%s", page)
-            LOG.debug("")
-
-            if self.keep_states:
-                self.table_states.append(copy.deepcopy(self.page_table))
+            self.step(self.get_next_address())
 
         self.print_results()
         return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
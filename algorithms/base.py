@@ -0,0 +1,76 @@
+"""
+Common part of page replacement algorithms: PPN assignment and logging of accesses and final results
+"""
+import logging
+
+
+class ReplacementAlgorithm:
+    """
+    Base of page replacement algorithms running on a page table.
+    Subclasses keep `page_table`, `frame_list` (frame table) and `hit`, `evict`, `dirty` flags of the last access.
+    Messages are logged by the logger of the subclass module.
+    """
+
+    def initialize_ppns(self):
+        """
+        Assigns PPNs (Physical Page Numbers) to each frame from page_table.
+        """
+        counter: int = 0
+        for elem in self.frame_list:
+            elem.ppn = counter
+            counter += 1
+
+    def get_frames(self) -> list:
+        """
+        :return: frames logged after every access
+        """
+        return self.page_table.frame_table
+
+    def get_parameters(self) -> list:
+        """
+        :return: list of tuples (name, value) of algorithm parameters logged with final result
+        """
+        return []
+
+    def print_trace(self, next_address, next_vpn):
+        """
+        Prints result for one page in trace
+        :param next_address: next page address
+        :param next_vpn: next virtual page number
+        """
+        log = logging.getLogger(self.__module__)
+        if self.hit:
+            log.debug("Memory address: %s VPN=%s:: number %s \n\t->HIT",
+                      str(next_address[0]), str(next_vpn),
+                      str(self.page_table.total_memory_accesses))
+        elif not self.evict:
+            log.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - NO EVICTION",
+                      str(next_address[0]),
+                      str(next_vpn),
+                      str(self.page_table.total_memory_accesses))
+        elif self.evict and not self.dirty:
+            log.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT CLEAN",
+                      str(next_address[0]),
+                      str(next_vpn),
+                      str(self.page_table.total_memory_accesses))
+        else:
+            log.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT DIRTY",
+                      str(next_address[0]),
+                      str(next_vpn),
+                      str(self.page_table.total_memory_accesses))
+
+        for page in self.get_frames():
+            log.debug("%s", page)
+
+    def print_results(self):
+        """
+        Prints algorithm final result
+        """
+        log = logging.getLogger(self.__module__)
+        log.info("Algorithm: %s", self)
+        log.info("Number of frames:      %s", str(len(self.page_table.frame_table)))
+        for name, value in self.get_parameters():
+            log.info("%-23s%s", name + ':', str(value))
+        log.info("Total Memory Accesses: %s", str(self.page_table.total_memory_accesses))
+        log.info("Total Page Faults:     %s", str(self.page_table.page_faults))
+        log.info("Total Writes to Disk:  %s", str(self.page_table.writes_to_disk))
@@ -21,6 +21,8 @@ class Clock:
         self.page_table: pt.PageTable = page_table
         self.trace: list = trace
         self.frame_queue: cq.CircularQueue = page_table.frame_queue
+        # number of swap daemon invocations
+        self.swap_daemon_runs: int = 0
 
         self.hit: bool = False
         self.evict: bool = False
@@ -44,29 +46,32 @@ class Clock:
 
         # Run the algorithm while we have items left in the trace
         while self.trace:
-            self.hit = False
-            self.evict = False
-            self.dirty = False
+            # Remove next item from the trace, so it isn't processed a second time
+            self.step(self.trace.pop(0))
 
-            # Pull out next item of the trace
-            next_address = self.trace[0]
-            next_vpn = self.page_table.get_vpn(next_address[0])
+        self.print_results()
+        return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
+                              self.page_table.page_faults, self.page_table.writes_to_disk, 'N/A')
 
-            # Run it in our algorithm
-            self.add_page_or_update(next_address)
+    def step(self, next_address):
+        """
+        Processes single memory access
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
 
-            # Remove it from the trace, so it isn't processed a second time
-            self.trace.pop(0)
-            self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
 
-            self.print_trace(next_address, next_vpn)
+        # Run it in our algorithm
+        self.add_page_or_update(next_address)
+        self.page_table.total_memory_accesses += 1
 
-            if self.keep_states:
-                self.table_states.append(copy.deepcopy(self.page_table))
+        self.print_trace(next_address, next_vpn)
 
-        self.print_results()
-        return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
-                              self.page_table.page_faults, self.page_table.writes_to_disk, 'N/A')
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
 
     def add_page_or_update(self, mem_address):
         """
@@ -103,7 +108,8 @@ class Clock:
         :return: if page is present in frame queue
         """
         for elem in self.frame_queue.list:
-            if elem.vpn == vpn:
+            # free frames hold no page (their vpn is 0 until the first eviction)
+            if elem.in_use and elem.vpn == vpn:
                 self.hit = True
 
                 if read_or_write == 'W':
@@ -122,6 +128,7 @@ class Clock:
         """
         while victim_frame is None:
             # Run the swap daemon, and account for the number of writes to disk
+            self.swap_daemon_runs += 1
             num_disk_writes = self.frame_queue.flush_dirty_and_unreferenced_pages()
             self.page_table.writes_to_disk += num_disk_writes
             # If we write to disk, we did a dirty eviction
@@ -0,0 +1,339 @@
+"""
+CLOCK-Pro page replacement algorithm implementation
+"""
+import copy
+import logging
+
+import algorithms.base as base
+import page_table as pt
+import result_tuple as rt
+
+LOG = logging.getLogger(__name__)
+
+HOT = 'hot'
+COLD = 'cold'
+
+
+class ClockProPage:
+    """
+    Single entry of the CLOCK-Pro circular list.
+    Resident (hot or cold) entries hold a frame of the page table,
+    non-resident cold entries in their test period have no frame.
+    """
+
+    def __init__(self, vpn):
+        self.vpn = vpn
+        self.status: str = COLD
+        # cold page is in its test period
+        self.test: bool = True
+        self.frame = None
+        self.prev: ClockProPage = self
+        self.next: ClockProPage = self
+
+
+class ClockPro(base.ReplacementAlgorithm):
+    """
+    Provides CLOCK-Pro page replacement algorithm implementation
+    for given table of pages and trace dataset.
+
+    All pages are kept on one circular list, new and promoted pages are put at its head (just behind hand_hot).
+    The list is swept by three hands:
+    - hand_cold evicts unreferenced resident cold pages (if in test period, they stay on the list as
+      non-resident pages) and promotes cold pages referenced during their test period to hot,
+    - hand_hot demotes unreferenced hot pages to cold and terminates test periods of cold pages it passes,
+    - hand_test terminates test periods of cold pages, so that number of non-resident pages stays bounded.
+    A cold page accessed during its test period grows cold target, an expired test period shrinks it.
+    The number of non-resident pages never exceeds the number of frames.
+
+    Dirty pages are written to disk when evicted, as in LRU.remove. There is no swap daemon as in Clock:
+    Clock's victim search skips dirty pages and can only progress after a flush, hand_cold evicts
+    an unreferenced cold page whether it's dirty or not, so dirty pages are never written before eviction.
+    """
+
+    def __init__(self, page_table: pt.PageTable, trace: list, keep_states: bool = False):
+        self.page_table: pt.PageTable = page_table
+        self.trace: list = trace
+        self.frame_list: list = page_table.frame_table
+
+        self.initialize_ppns()
+
+        # frames which are not used by any resident page, lowest ppn is used first
+        self.free_frames: list = list(reversed(self.frame_list))
+        # KEY = VPN, VALUE = ClockProPage (resident and non-resident pages)
+        self.pages: dict = {}
+
+        self.hand_hot: ClockProPage = None
+        self.hand_cold: ClockProPage = None
+        self.hand_test: ClockProPage = None
+
+        self.max_resident: int = len(self.frame_list)
+        self.cold_target: int = 1
+        self.count_hot: int = 0
+        self.count_cold: int = 0
+        self.count_non_resident: int = 0
+
+        self.hit: bool = False
+        self.evict: bool = False
+        self.dirty: bool = False
+
+        self.keep_states: bool = keep_states
+        self.table_states: list = []
+        self.debug: bool = LOG.isEnabledFor(logging.DEBUG)
+
+    def __str__(self) -> str:
+        return 'ClockPro'
+
+    def get_table_states(self):
+        return self.table_states
+
+    def run_algorithm(self) -> rt.ResultTuple:
+        """
+        Executes CLOCK-Pro algorithm
+        :return: tuple with algorithm final result
+        """
+        self.page_table.total_memory_accesses = 0
+
+        for next_address in self.trace:
+            self.step(next_address)
+
+        self.print_results()
+        return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
+                              self.page_table.page_faults, self.page_table.writes_to_disk, 'N/A')
+
+    def step(self, next_address):
+        """
+        Processes single memory access
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+
+        self.access(next_vpn, next_address[1])
+
+        if self.debug:
+            self.print_trace(next_address, next_vpn)
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
+    def access(self, vpn, read_or_write):
+        """
+        Takes care of next page in trace
+        :param vpn: virtual page number
+        :param read_or_write: access type
+        """
+        page = self.pages.get(vpn)
+
+        if page is not None and page.frame is not None:
+            self.hit = True
+            page.frame.reference = True
+            self.mark_access(page.frame, read_or_write)
+            return
+
+        self.page_table.page_faults += 1
+
+        if page is None:
+            page = ClockProPage(vpn)
+            self.pages[vpn] = page
+        else:
+            # non-resident page accessed during its test period: it has a small reuse distance
+            self.count_non_resident -= 1
+            self.grow_cold_target()
+            self.unlink(page)
+            page.status = HOT
+            page.test = False
+
+        while not self.free_frames:
+            self.run_hand_cold()
+
+        self.link_at_head(page)
+        if page.status == HOT:
+            self.count_hot += 1
+        else:
+            self.count_cold += 1
+
+        page.frame = self.free_frames.pop()
+        self.page_table.map_page(page.frame, vpn)
+        page.frame.reference = False
+        self.mark_access(page.frame, read_or_write)
+
+        self.balance_hot_pages()
+        while self.count_non_resident > self.max_resident:
+            self.run_hand_test()
+
+    @staticmethod
+    def mark_access(frame, read_or_write):
+        """
+        Sets dirty bit for write accesses.
+        :param frame: accessed frame
+        :param read_or_write: access type
+        """
+        if read_or_write == 'W':
+            frame.dirty = True
+
+    def grow_cold_target(self):
+        """
+        Gives more frames to cold pages (up to all frames).
+        """
+        if self.cold_target < self.max_resident:
+            self.cold_target += 1
+
+    def shrink_cold_target(self):
+        """
+        Gives more frames to hot pages (at least one frame stays reserved for cold pages).
+        """
+        if self.cold_target > 1:
+            self.cold_target -= 1
+
+    def balance_hot_pages(self):
+        """
+        Demotes hot pages until they fit in the space not reserved for cold pages.
+        """
+        while self.count_hot > self.max_resident - self.cold_target:
+            self.run_hand_hot()
+
+    def link_at_head(self, page: ClockProPage):
+        """
+        Links page in just behind hand_hot (list head).
+        :param page: page to be linked
+        """
+        if self.hand_hot is None:
+            page.prev = page.next = page
+            self.hand_hot = self.hand_cold = self.hand_test = page
+            return
+
+        page.next = self.hand_hot
+        page.prev = self.hand_hot.prev
+        page.prev.next = page
+        self.hand_hot.prev = page
+
+    def unlink(self, page: ClockProPage):
+        """
+        Unlinks page from the circular list, moving hands pointing at it one step forward.
+        :param page: page to be unlinked
+        """
+        if page.next is page:
+            self.hand_hot = self.hand_cold = self.hand_test = None
+            return
+
+        if page is self.hand_hot:
+            self.hand_hot = page.next
+        if page is self.hand_cold:
+            self.hand_cold = page.next
+        if page is self.hand_test:
+            self.hand_test = page.next
+
+        page.prev.next = page.next
+        page.next.prev = page.prev
+        page.prev = page.next = page
+
+    def run_hand_cold(self):
+        """
+        Moves hand_cold until a resident cold page is evicted.
+        Referenced cold page in its test period is promoted to hot,
+        referenced cold page out of its test period starts a new one.
+        Evicted page in its test period stays on the list as a non-resident page.
+        """
+        if self.count_cold == 0:
+            self.run_hand_hot()
+
+        while True:
+            page = self.hand_cold
+            self.hand_cold = page.next
+
+            if page.status != COLD or page.frame is None:
+                continue
+
+            if not page.frame.reference:
+                self.remove(page)
+                self.count_cold -= 1
+                if page.test:
+                    self.count_non_resident += 1
+                else:
+                    self.unlink(page)
+                    del self.pages[page.vpn]
+                return
+
+            page.frame.reference = False
+            self.unlink(page)
+            self.link_at_head(page)
+            if page.test:
+                page.status = HOT
+                page.test = False
+                self.count_cold -= 1
+                self.count_hot += 1
+                self.grow_cold_target()
+                self.balance_hot_pages()
+            else:
+                page.test = True
+
+    def run_hand_hot(self):
+        """
+        Moves hand_hot until a hot page is demoted to cold, hot pages with reference bit set get a second chance.
+        Test periods of cold pages are terminated on its way.
+        """
+        while True:
+            page = self.hand_hot
+            self.hand_hot = page.next
+
+            if page.status == COLD:
+                if page.test:
+                    self.end_test_period(page)
+                continue
+
+            if page.frame.reference:
+                page.frame.reference = False
+                continue
+
+            page.status = COLD
+            page.test = False
+            self.count_hot -= 1
+            self.count_cold += 1
+            return
+
+    def run_hand_test(self):
+        """
+        Moves hand_test until a non-resident page is removed, terminating test periods on its way.
+        """
+        while True:
+            page = self.hand_test
+            self.hand_test = page.next
+
+            if page.status == COLD and page.test:
+                resident = page.frame is not None
+                self.end_test_period(page)
+                if not resident:
+                    return
+
+    def end_test_period(self, page: ClockProPage):
+        """
+        Terminates test period of cold page and shrinks cold target. Non-resident page is removed from the list.
+        :param page: cold page in its test period
+        """
+        page.test = False
+        self.shrink_cold_target()
+        if page.frame is None:
+            self.count_non_resident -= 1
+            self.unlink(page)
+            del self.pages[page.vpn]
+
+    def remove(self, page: ClockProPage):
+        """
+        Releases frame of evicted page, a dirty page is written to disk.
+        :param page: page to be evicted
+        """
+        self.evict = True
+        removal_frame = page.frame
+        # if the page is dirty, we need to do a disk write
+        if removal_frame.dirty:
+            self.dirty = True
+            self.page_table.writes_to_disk += 1
+        self.page_table.unmap_page(removal_frame)
+        removal_frame.reference = False
+        removal_frame.dirty = False
+        self.free_frames.append(removal_frame)
+        page.frame = None
@@ -0,0 +1,149 @@
+"""
+LFU (Least Frequently Used) page replacement algorithm implementation
+"""
+import collections
+import copy
+import logging
+
+import algorithms.base as base
+import page_table as pt
+import result_tuple as rt
+
+LOG = logging.getLogger(__name__)
+
+
+class LFU(base.ReplacementAlgorithm):
+    """
+    Provides LFU page replacement algorithm implementation
+    for given table of pages and trace dataset.
+
+    Resident pages are grouped in buckets by access frequency. Every bucket keeps its pages
+    in order of last access, so the victim (least recently used page of the lowest frequency bucket)
+    is found in constant time. Frequency of an evicted page is forgotten.
+    """
+
+    def __init__(self, page_table: pt.PageTable, trace: list, keep_states: bool = False):
+        self.page_table: pt.PageTable = page_table
+        self.trace: list = trace
+        self.frame_list: list = page_table.frame_table
+
+        self.initialize_ppns()
+
+        # KEY = VPN, VALUE = resident frame (map of the page table)
+        self.resident: dict = page_table.resident
+        # KEY = VPN, VALUE = number of accesses since page was loaded
+        self.frequency: dict = {}
+        # KEY = frequency, VALUE = ordered VPNs with this frequency, least recently used first
+        self.buckets: dict = {}
+        self.min_frequency: int = 0
+        # PPN of the next empty frame
+        self.next_empty: int = 0
+
+        self.hit: bool = False
+        self.evict: bool = False
+        self.dirty: bool = False
+
+        self.keep_states: bool = keep_states
+        self.table_states: list = []
+        self.debug: bool = LOG.isEnabledFor(logging.DEBUG)
+
+    def __str__(self) -> str:
+        return 'LFU'
+
+    def get_table_states(self):
+        return self.table_states
+
+    def run_algorithm(self) -> rt.ResultTuple:
+        """
+        Executes LFU algorithm
+        :return: tuple with algorithm final result
+        """
+        self.page_table.total_memory_accesses = 0
+
+        for next_address in self.trace:
+            self.step(next_address)
+
+        self.print_results()
+        return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
+                              self.page_table.page_faults, self.page_table.writes_to_disk, 'N/A')
+
+    def step(self, next_address):
+        """
+        Processes single memory access
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+
+        self.access(next_vpn, next_address[1])
+
+        if self.debug:
+            self.print_trace(next_address, next_vpn)
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
+    def access(self, vpn, read_or_write):
+        """
+        Takes care of next page in trace
+        :param vpn: virtual page number
+        :param read_or_write: access type
+        """
+        frame = self.resident.get(vpn)
+
+        if frame is None:
+            self.page_table.page_faults += 1
+            if self.next_empty < len(self.frame_list):
+                frame = self.frame_list[self.next_empty]
+                self.next_empty += 1
+            else:
+                bucket = self.buckets[self.min_frequency]
+                victim_vpn, _ = bucket.popitem(last=False)
+                if not bucket:
+                    del self.buckets[self.min_frequency]
+                del self.frequency[victim_vpn]
+                frame = self.resident[victim_vpn]
+                self.remove(frame)
+            self.page_table.map_page(frame, vpn)
+            self.frequency[vpn] = 1
+            self.buckets.setdefault(1, collections.OrderedDict())[vpn] = None
+            self.min_frequency = 1
+        else:
+            self.hit = True
+            self.increment_frequency(vpn)
+
+        if read_or_write == 'W':
+            frame.dirty = True
+
+    def increment_frequency(self, vpn):
+        """
+        Moves page to the bucket of the next frequency.
+        :param vpn: virtual page number of a resident page
+        """
+        frequency = self.frequency[vpn]
+        bucket = self.buckets[frequency]
+        del bucket[vpn]
+        if not bucket:
+            del self.buckets[frequency]
+            if self.min_frequency == frequency:
+                self.min_frequency = frequency + 1
+
+        self.frequency[vpn] = frequency + 1
+        self.buckets.setdefault(frequency + 1, collections.OrderedDict())[vpn] = None
+
+    def remove(self, removal_frame):
+        """
+        Evicts page held by given frame.
+        :param removal_frame: frame of the least frequently used page
+        """
+        self.evict = True
+        # if the page is dirty, we need to do a disk write
+        if removal_frame.dirty:
+            self.dirty = True
+            self.page_table.writes_to_disk += 1
+        self.page_table.unmap_page(removal_frame)
+        removal_frame.dirty = False
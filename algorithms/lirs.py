@@ -0,0 +1,264 @@
+"""
+LIRS (Low Inter-reference Recency Set) page replacement algorithm implementation
+"""
+import collections
+import copy
+import logging
+
+import algorithms.base as base
+import page_table as pt
+import result_tuple as rt
+
+LOG = logging.getLogger(__name__)
+
+
+class LIRSPage:
+    """
+    Page tracked by LIRS. Resident pages hold a frame of the page table.
+    """
+
+    def __init__(self, vpn):
+        self.vpn = vpn
+        self.lir: bool = False
+        self.frame = None
+
+
+class LIRS(base.ReplacementAlgorithm):
+    """
+    Provides LIRS page replacement algorithm implementation
+    for given table of pages and trace dataset.
+
+    Pages are divided into LIR (low inter-reference recency) and HIR pages.
+    - stack S keeps recency order of LIR pages and of HIR pages (resident or not) more recent than
+      the bottom LIR page; its bottom is always a LIR page (stack pruning),
+    - queue Q keeps resident HIR pages, its front is the eviction victim.
+    A HIR page referenced again while still in stack S becomes LIR and the bottom LIR page is demoted.
+    Non-resident HIR pages are bounded by non_resident_limit (number of frames by default).
+
+    Dirty pages are written to disk when evicted, as in LRU.remove. There is no swap daemon as in Clock:
+    the victim is always the front of queue Q, dirty or not, so dirty pages are never written before eviction.
+    """
+    HIR_PERCENTAGE = 1
+
+    def __init__(self, page_table: pt.PageTable, trace: list, keep_states: bool = False,
+                 non_resident_limit: int = None):
+        self.page_table: pt.PageTable = page_table
+        self.trace: list = trace
+        self.frame_list: list = page_table.frame_table
+
+        self.initialize_ppns()
+
+        num_frames = len(self.frame_list)
+        hir_capacity = max(1, num_frames * LIRS.HIR_PERCENTAGE // 100)
+        self.lir_capacity: int = max(1, num_frames - hir_capacity)
+        self.lir_count: int = 0
+        self.non_resident_limit: int = num_frames if non_resident_limit is None else non_resident_limit
+
+        # frames which are not used by any resident page, lowest ppn is used first
+        self.free_frames: list = list(reversed(self.frame_list))
+        # KEY = VPN, VALUE = LIRSPage (resident pages and non-resident pages kept in stack S)
+        self.pages: dict = {}
+        # first item is the bottom of the stack
+        self.stack: collections.OrderedDict = collections.OrderedDict()
+        # first item is the front of the queue
+        self.queue: collections.OrderedDict = collections.OrderedDict()
+        # non-resident HIR pages in stack S, oldest first
+        self.non_resident: collections.OrderedDict = collections.OrderedDict()
+
+        self.hit: bool = False
+        self.evict: bool = False
+        self.dirty: bool = False
+
+        self.keep_states: bool = keep_states
+        self.table_states: list = []
+        self.debug: bool = LOG.isEnabledFor(logging.DEBUG)
+
+    def __str__(self) -> str:
+        return 'LIRS'
+
+    def get_table_states(self):
+        return self.table_states
+
+    def run_algorithm(self) -> rt.ResultTuple:
+        """
+        Executes LIRS algorithm
+        :return: tuple with algorithm final result
+        """
+        self.page_table.total_memory_accesses = 0
+
+        for next_address in self.trace:
+            self.step(next_address)
+
+        self.print_results()
+        return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
+                              self.page_table.page_faults, self.page_table.writes_to_disk, 'N/A')
+
+    def step(self, next_address):
+        """
+        Processes single memory access
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+
+        self.access(next_vpn, next_address[1])
+
+        if self.debug:
+            self.print_trace(next_address, next_vpn)
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
+    def access(self, vpn, read_or_write):
+        """
+        Takes care of next page in trace
+        :param vpn: virtual page number
+        :param read_or_write: access type
+        """
+        page = self.pages.get(vpn)
+
+        if page is not None and page.frame is not None:
+            self.hit = True
+            self.mark_access(page.frame, read_or_write)
+            if page.lir:
+                self.hit_lir(page)
+            else:
+                self.hit_resident_hir(page)
+            return
+
+        self.page_table.page_faults += 1
+
+        if page is None:
+            page = LIRSPage(vpn)
+        else:
+            # keep the page out of the non-resident bound while making room for it
+            del self.non_resident[vpn]
+
+        if not self.free_frames:
+            self.evict_resident_hir()
+
+        self.pages[vpn] = page
+        page.frame = self.free_frames.pop()
+        self.page_table.map_page(page.frame, vpn)
+        self.mark_access(page.frame, read_or_write)
+
+        if vpn in self.stack:
+            # non-resident HIR page with small inter-reference recency
+            self.stack.move_to_end(vpn)
+            self.promote(page)
+        elif self.lir_count < self.lir_capacity:
+            # warm-up: LIR set is not full yet
+            page.lir = True
+            self.lir_count += 1
+            self.stack[vpn] = page
+        else:
+            self.stack[vpn] = page
+            self.queue[vpn] = page
+
+    @staticmethod
+    def mark_access(frame, read_or_write):
+        """
+        Sets dirty bit for write accesses.
+        :param frame: accessed frame
+        :param read_or_write: access type
+        """
+        frame.reference = True
+        if read_or_write == 'W':
+            frame.dirty = True
+
+    def hit_lir(self, page: LIRSPage):
+        """
+        Moves LIR page to the top of stack S.
+        :param page: accessed page
+        """
+        was_bottom = next(iter(self.stack)) == page.vpn
+        self.stack.move_to_end(page.vpn)
+        if was_bottom:
+            self.prune_stack()
+
+    def hit_resident_hir(self, page: LIRSPage):
+        """
+        Resident HIR page in stack S becomes LIR, otherwise it's moved to the top of S and to the end of Q.
+        :param page: accessed page
+        """
+        if page.vpn in self.stack:
+            self.stack.move_to_end(page.vpn)
+            del self.queue[page.vpn]
+            self.promote(page)
+        else:
+            self.stack[page.vpn] = page
+            self.queue.move_to_end(page.vpn)
+
+    def promote(self, page: LIRSPage):
+        """
+        Turns HIR page into LIR page and demotes the bottom LIR page of stack S.
+        :param page: page at the top of stack S
+        """
+        page.lir = True
+        self.lir_count += 1
+        self.demote_bottom_lir()
+
+    def demote_bottom_lir(self):
+        """
+        Moves bottom LIR page of stack S to the end of queue Q and prunes the stack.
+        """
+        vpn, page = self.stack.popitem(last=False)
+        page.lir = False
+        self.lir_count -= 1
+        self.queue[vpn] = page
+        self.prune_stack()
+
+    def prune_stack(self):
+        """
+        Removes HIR pages from the bottom of stack S, so that the bottom page is LIR.
+        Non-resident pages removed from the stack are forgotten.
+        """
+        while self.stack:
+            vpn, page = next(iter(self.stack.items()))
+            if page.lir:
+                return
+            del self.stack[vpn]
+            if page.frame is None:
+                self.non_resident.pop(vpn, None)
+                self.pages.pop(vpn, None)
+
+    def evict_resident_hir(self):
+        """
+        Evicts the front page of queue Q. If it is still in stack S, it is kept there as non-resident.
+        """
+        if not self.queue:
+            # all frames are held by LIR pages (single frame table)
+            self.demote_bottom_lir()
+
+        vpn, page = self.queue.popitem(last=False)
+        self.remove(page)
+
+        if vpn in self.stack:
+            self.non_resident[vpn] = page
+            while len(self.non_resident) > self.non_resident_limit:
+                oldest_vpn, _ = self.non_resident.popitem(last=False)
+                del self.stack[oldest_vpn]
+                del self.pages[oldest_vpn]
+        else:
+            del self.pages[vpn]
+
+    def remove(self, page: LIRSPage):
+        """
+        Releases frame of evicted page, a dirty page is written to disk.
+        :param page: page to be evicted
+        """
+        self.evict = True
+        removal_frame = page.frame
+        # if the page is dirty, we need to do a disk write
+        if removal_frame.dirty:
+            self.dirty = True
+            self.page_table.writes_to_disk += 1
+        self.page_table.unmap_page(removal_frame)
+        removal_frame.reference = False
+        removal_frame.dirty = False
+        self.free_frames.append(removal_frame)
+        page.frame = None
@@ -0,0 +1,178 @@
+"""
+Bounded-lookahead OPT page replacement algorithm implementation
+"""
+import collections
+import copy
+import logging
+
+import algorithms.base as base
+import page_table as pt
+import result_tuple as rt
+
+LOG = logging.getLogger(__name__)
+
+
+class LookaheadOpt(base.ReplacementAlgorithm):
+    """
+    OPT which sees only the next `lookahead` accesses instead of the whole trace, so it can run on streams.
+
+    Accesses are fed one by one, each access is processed when `lookahead` accesses after it are known.
+    A sliding next-use index keeps positions of the buffered accesses of every page.
+    On eviction the page whose next use is the farthest is chosen, pages not used within the lookahead
+    window are the farthest (ties are broken by the lowest ppn, as in OPT).
+    Memory usage is O(lookahead + frames).
+    """
+    DEFAULT_LOOKAHEAD = 1000
+
+    def __init__(self, page_table: pt.PageTable, trace, lookahead: int = DEFAULT_LOOKAHEAD,
+                 keep_states: bool = False):
+        self.page_table: pt.PageTable = page_table
+        self.trace = trace
+        self.frame_list: list = page_table.frame_table
+        self.lookahead: int = lookahead
+
+        self.initialize_ppns()
+
+        # frames which are not used by any page, lowest ppn is used first
+        self.free_frames: list = list(reversed(self.frame_list))
+        # KEY = VPN, VALUE = resident frame (map of the page table)
+        self.resident: dict = page_table.resident
+
+        # fed accesses which are not processed yet
+        self.window: collections.deque = collections.deque()
+        # KEY = VPN, VALUE = deque of positions of the page accesses in the window
+        self.next_uses: dict = {}
+        # position of the next fed access
+        self.fed: int = 0
+
+        self.hit: bool = False
+        self.evict: bool = False
+        self.dirty: bool = False
+
+        self.keep_states: bool = keep_states
+        self.table_states: list = []
+        self.debug: bool = LOG.isEnabledFor(logging.DEBUG)
+
+    def __str__(self) -> str:
+        return 'LookaheadOpt'
+
+    def get_parameters(self) -> list:
+        return [('Lookahead', self.lookahead)]
+
+    def get_table_states(self):
+        return self.table_states
+
+    def run_algorithm(self) -> rt.ResultTuple:
+        """
+        Executes bounded-lookahead OPT algorithm
+        :return: tuple with algorithm final result
+        """
+        for next_address in self.trace:
+            self.feed(next_address)
+        self.flush()
+
+        self.print_results()
+        return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
+                              self.page_table.page_faults, self.page_table.writes_to_disk, self.lookahead)
+
+    def feed(self, next_address):
+        """
+        Adds access to the lookahead window, processes the oldest access once the window is full.
+        :param next_address: tuple (memory address, R/W)
+        """
+        vpn = self.page_table.get_vpn(next_address[0])
+        self.window.append(next_address)
+        uses = self.next_uses.get(vpn)
+        if uses is None:
+            uses = self.next_uses[vpn] = collections.deque()
+        uses.append(self.fed)
+        self.fed += 1
+
+        if len(self.window) > self.lookahead:
+            self.step(self.window.popleft())
+
+    def flush(self):
+        """
+        Processes all accesses left in the window (end of trace).
+        """
+        while self.window:
+            self.step(self.window.popleft())
+
+    def step(self, next_address):
+        """
+        Processes single memory access. The access has to be already removed from the window.
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+
+        uses = self.next_uses[next_vpn]
+        uses.popleft()
+        if not uses:
+            del self.next_uses[next_vpn]
+
+        self.access(next_vpn, next_address[1])
+
+        if self.debug:
+            self.print_trace(next_address, next_vpn)
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
+    def access(self, vpn, read_or_write):
+        """
+        Takes care of next page in trace
+        :param vpn: virtual page number
+        :param read_or_write: access type
+        """
+        frame = self.resident.get(vpn)
+
+        if frame is not None:
+            self.hit = True
+        else:
+            self.page_table.page_faults += 1
+            if not self.free_frames:
+                self.remove(self.find_victim())
+
+            frame = self.free_frames.pop()
+            self.page_table.map_page(frame, vpn)
+
+        if read_or_write == 'W':
+            frame.dirty = True
+
+    def find_victim(self):
+        """
+        :return: resident frame whose page is used again the farthest in the lookahead window
+        """
+        victim = None
+        farthest = -1
+        never_used = self.fed
+
+        for frame in self.frame_list:
+            uses = self.next_uses.get(frame.vpn)
+            next_use = uses[0] if uses else never_used
+            if next_use > farthest:
+                victim = frame
+                farthest = next_use
+                if next_use == never_used:
+                    break
+
+        return victim
+
+    def remove(self, frame):
+        """
+        Releases evicted frame.
+        :param frame: frame to be evicted
+        """
+        self.evict = True
+        # if the page is dirty, we need to do a disk write
+        if frame.dirty:
+            self.dirty = True
+            self.page_table.writes_to_disk += 1
+        self.page_table.unmap_page(frame)
+        frame.dirty = False
+        self.free_frames.append(frame)
@@ -59,24 +59,7 @@ class LRU:
 
         # run the algorithm while we have items left in the trace
         while self.trace:
-            # reset output variables
-            self.hit = False
-            self.evict = False
-            self.dirty = False
-
-            # pull out next item of the trace
-            next_address = self.get_next_address()
-            next_vpn = self.page_table.get_vpn(next_address[0])
-            next_read_or_write = next_address[1]
-
-            # run it in our algorithm
-            if not self.add_or_update_successful(next_vpn, next_read_or_write):
-                self.add_after_page_fault(next_vpn, next_read_or_write)
-
-            self.print_trace(next_address, next_vpn)
-
-            if self.keep_states:
-                self.table_states.append(copy.deepcopy(self.page_table))
+            self.step(self.get_next_address())
 
         self.print_results()
         return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
@@ -87,9 +70,31 @@ class LRU:
         Consume current value at trace[0] and remove it from the list.
         :return: next address
         """
-        self.page_table.total_memory_accesses += 1
         return self.trace.pop(0)
 
+    def step(self, next_address):
+        """
+        Processes single memory access
+        :param next_address: tuple (memory address, R/W)
+        """
+        # reset output variables
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+        next_read_or_write = next_address[1]
+
+        # run it in our algorithm
+        if not self.add_or_update_successful(next_vpn, next_read_or_write):
+            self.add_after_page_fault(next_vpn, next_read_or_write)
+
+        self.print_trace(next_address, next_vpn)
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
     def add_or_update_successful(self, vpn, read_or_write):
         """
         Takes care of next page in trace
@@ -114,11 +119,9 @@ class LRU:
         :return: was page in frame table
         """
         for elem in self.frame_list:
-            # check for it a hit
-            if elem.vpn == vpn:
+            # check for it a hit, free frames hold no page (their vpn is 0 until the first eviction)
+            if elem.in_use and elem.vpn == vpn:
                 self.hit = True
-                elem.in_use = True
-                elem.vpn = vpn
 
                 if read_or_write == 'W':
                     elem.dirty = True
@@ -136,8 +139,7 @@ class LRU:
         """
         for elem in self.frame_list:
             if not elem.in_use:
-                elem.in_use = True
-                elem.vpn = vpn
+                self.page_table.map_page(elem, vpn)
                 # if we're doing a write, need to set dirty bit
                 if read_or_write == 'W':
                     elem.dirty = True
@@ -174,9 +176,8 @@ class LRU:
         # if the page is dirty, we need to do a disk write
         if removal_page.dirty:
             self.dirty = True
-        removal_page.in_use = False
+        self.page_table.unmap_page(removal_page)
         removal_page.dirty = False
-        removal_page.vpn = None
 
     def print_trace(self, next_address, next_vpn):
         """
@@ -15,11 +15,16 @@ class Opt:
     An implementation of the optimal page replacement algorithm
     """
 
-    def __init__(self, page_table, trace, keep_states: bool = False):
+    def __init__(self, page_table, trace, keep_states: bool = False, next_uses=None):
+        """
+        :param next_uses: next-use array of the trace (see trace_stats), per-VPN index is built if not given
+        """
         self.page_table = page_table
         self.trace = trace
         # KEY = VPN, VALUE = [NUM_LOADS_UNTIL_USED]
         self.time_until_use_dict = {}
+        # position of the next access of the same page for every access of the trace
+        self.next_uses = next_uses
 
         self.hit = False
         self.evict = False
@@ -29,7 +34,8 @@ class Opt:
         self.table_states: list = []
 
         self.initialize_ppns()
-        self.preprocess_trace()
+        if self.next_uses is None:
+            self.preprocess_trace()
 
     def __str__(self) -> str:
         return 'Opt'
@@ -51,36 +57,90 @@ class Opt:
         Consume current value at trace[0] and remove it from the list.
         :return: next address
         """
-        self.page_table.total_memory_accesses += 1
         return self.trace.pop(0)
 
+    def step(self, next_address):
+        """
+        Processes single memory access. The access has to be already removed from the trace,
+        since the rest of the trace is used to compute time until next access.
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+
+        self.update_counters(next_vpn)
+        self.opt(next_address)
+
+        if self.hit:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->HIT",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+        elif not self.evict:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - NO EVICTION",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+        elif self.evict and not self.dirty:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT CLEAN",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+        else:
+            LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT DIRTY",
+                      next_address[0],
+                      next_vpn,
+                      self.page_table.total_memory_accesses)
+
+        LOG.debug("Frame table:")
+        for page in self.page_table.frame_table:
+            LOG.debug("%s", page)
+        LOG.debug("")
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
     def update_counters(self, vpn):
         """
         Update our counters for how many instructions until next usage of all pages in our page table.
         Pops vpn usage from time_until_use_dict, decrements page_table.frame_table "in_use" frames.
-        Updates counters in page_table.
-        frame.instructions_until_next_reference < -1: means that this address was just processed
+        The counter of the accessed page (if it's resident) is set to the time until its next access.
         :param vpn: virtual page number
         """
-        list_of_memory_accesses = self.time_until_use_dict[vpn]
-        if list_of_memory_accesses:
-            list_of_memory_accesses.pop(0)
+        if self.next_uses is None:
+            list_of_memory_accesses = self.time_until_use_dict[vpn]
+            if list_of_memory_accesses:
+                list_of_memory_accesses.pop(0)
         for frame in self.page_table.frame_table:
             if frame.in_use:
                 frame.instructions_until_next_reference -= 1
-                if frame.instructions_until_next_reference < -1:
-                    frame.instructions_until_next_reference = self.find_time_until_next_access(vpn)
+        if vpn in self.page_table.fast_index:
+            frame = self.page_table.frame_table[self.page_table.fast_index[vpn]]
+            frame.instructions_until_next_reference = self.find_time_until_next_access(vpn)
 
     def find_time_until_next_access(self, vpn):
         """
         Checks if there is a next index in index queue for a vpn. If there is not, then time until next access is never
         (current trace length + 1). Otherwise time until next access is calculated by subtracting the total amount
         of memory accesses, which is the current 'index' of the current trace, from the next index at which VPN appears
+        With next-use array the next index is read at the position of the current access.
         :param vpn: virtual page number
         :return: time until next access
         """
-        next_index_used = self.time_until_use_dict[vpn][0]  # get the number at index 0
-        if next_index_used is None:
+        if self.next_uses is not None:
+            next_index_used = self.next_uses[self.page_table.total_memory_accesses - 1]
+            if next_index_used == len(self.next_uses):
+                next_index_used = None
+        else:
+            next_index_used = self.time_until_use_dict[vpn][0]  # get the number at index 0
+        if next_index_used is None and self.next_uses is not None:
+            # accesses left in the trace, which may be fed access by access instead of held in self.trace
+            time_until_next_access = len(self.next_uses) - self.page_table.total_memory_accesses + 1
+        elif next_index_used is None:
             time_until_next_access = len(self.trace) + 1
         else:
             time_until_next_access = next_index_used - self.page_table.total_memory_accesses
@@ -95,7 +155,7 @@ class Opt:
         page_index = None
         index = 0
         for frame in self.page_table.frame_table:
-            if frame.vpn == vpn:
+            if frame.in_use and frame.vpn == vpn:
                 return index
             index += 1
         return page_index
@@ -137,9 +197,8 @@ class Opt:
             for frame in self.page_table.frame_table:
                 if not frame.in_use:
                     page_added = True
-                    frame.in_use = True
+                    self.page_table.map_page(frame, vpn)
                     frame.dirty = False
-                    frame.vpn = vpn
                     frame.ppn = index
                     frame.instructions_until_next_reference = self.find_time_until_next_access(vpn)
                     self.page_table.fast_index[vpn] = frame.ppn
@@ -170,8 +229,7 @@ class Opt:
 
         removal_frame = self.page_table.frame_table[least_needed]
         self.page_table.fast_index.pop(removal_frame.vpn)
-        removal_frame.in_use = False
-        removal_frame.vpn = None
+        self.page_table.unmap_page(removal_frame)
         removal_frame.instructions_until_next_reference = None
         if removal_frame.dirty:
             self.page_table.writes_to_disk += 1
@@ -187,44 +245,7 @@ class Opt:
         :return:
         """
         while self.trace:
-            self.hit = False
-            self.evict = False
-            self.dirty = False
-
-            next_address = self.get_next_address()
-            next_vpn = self.page_table.get_vpn(next_address[0])
-
-            self.update_counters(next_vpn)
-            self.opt(next_address)
-
-            if self.hit:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->HIT",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-            elif not self.evict:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - NO EVICTION",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-            elif self.evict and not self.dirty:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT CLEAN",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-            else:
-                LOG.debug("Memory address: %s VPN=%s:: number %s \n\t->PAGE FAULT - EVICT DIRTY",
-                          next_address[0],
-                          next_vpn,
-                          self.page_table.total_memory_accesses)
-
-            LOG.debug("Frame table:")
-            for page in self.page_table.frame_table:
-                LOG.debug("%s", page)
-            LOG.debug("")
-
-            if self.keep_states:
-                self.table_states.append(copy.deepcopy(self.page_table))
+            self.step(self.get_next_address())
 
         self.print_results()
         return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
@@ -0,0 +1,165 @@
+"""
+WSClock (working set clock) page replacement algorithm implementation
+"""
+import collections
+import copy
+import logging
+
+import circular_queue as cq
+import algorithms.base as base
+import page_table as pt
+import result_tuple as rt
+
+LOG = logging.getLogger(__name__)
+
+
+class WSClock(base.ReplacementAlgorithm):
+    """
+    Provides WSClock page replacement algorithm implementation
+    for given table of pages and trace dataset.
+
+    Every frame keeps the virtual time (number of processed accesses) of its last use.
+    On a page fault the hand looks for a clean page which is out of the working set,
+    i.e. it wasn't used during the last `window` accesses. Writes of old dirty pages are scheduled
+    asynchronously and the hand moves on, instead of waiting for the write; a page is clean once
+    the hand comes back to it. A write to a page whose write is pending makes it dirty again.
+
+    The size of the working set W(t, window) (number of distinct pages used during the last
+    `window` accesses) is sampled every `sample_interval` accesses.
+    """
+    DEFAULT_WINDOW = 100
+
+    def __init__(self, page_table: pt.PageTable, trace: list, window: int = DEFAULT_WINDOW,
+                 sample_interval: int = None, keep_states: bool = False):
+        if window < 1:
+            raise ValueError("Working set window should be positive.")
+        self.page_table: pt.PageTable = page_table
+        self.trace: list = trace
+        self.frame_queue: cq.WorkingSetQueue = cq.WorkingSetQueue(page_table.num_frames, page_table)
+        page_table.frame_queue = self.frame_queue
+
+        self.window: int = window
+        self.sample_interval: int = sample_interval if sample_interval else window
+
+        # KEY = VPN, VALUE = resident frame (map of the page table)
+        self.resident: dict = page_table.resident
+
+        # KEY = VPN, VALUE = virtual time of last use (pages used during the last window only)
+        self.last_use: dict = {}
+        # (virtual time, VPN) of accesses during the last window
+        self.window_accesses: collections.deque = collections.deque()
+        # series of tuples (virtual time, working set size, resident pages)
+        self.working_set_sizes: list = []
+
+        self.hit: bool = False
+        self.evict: bool = False
+        self.dirty: bool = False
+
+        self.keep_states: bool = keep_states
+        self.table_states: list = []
+        self.debug: bool = LOG.isEnabledFor(logging.DEBUG)
+
+    def __str__(self) -> str:
+        return 'WSClock'
+
+    def get_frames(self) -> list:
+        return self.frame_queue.list
+
+    def get_parameters(self) -> list:
+        return [('Window', self.window)]
+
+    def get_table_states(self):
+        return self.table_states
+
+    def get_working_set_sizes(self):
+        return self.working_set_sizes
+
+    def run_algorithm(self) -> rt.ResultTuple:
+        """
+        Executes WSClock algorithm
+        :return: tuple with algorithm final result
+        """
+        self.page_table.total_memory_accesses = 0
+
+        for next_address in self.trace:
+            self.step(next_address)
+
+        self.print_results()
+        return rt.ResultTuple(len(self.page_table.frame_table), self.page_table.total_memory_accesses,
+                              self.page_table.page_faults, self.page_table.writes_to_disk, self.window)
+
+    def step(self, next_address):
+        """
+        Processes single memory access
+        :param next_address: tuple (memory address, R/W)
+        """
+        self.hit = False
+        self.evict = False
+        self.dirty = False
+
+        self.page_table.total_memory_accesses += 1
+        next_vpn = self.page_table.get_vpn(next_address[0])
+
+        self.access(next_vpn, next_address[1])
+        self.update_working_set(next_vpn)
+
+        if self.debug:
+            self.print_trace(next_address, next_vpn)
+
+        if self.keep_states:
+            self.table_states.append(copy.deepcopy(self.page_table))
+
+    def access(self, vpn, read_or_write):
+        """
+        Takes care of next page in trace
+        :param vpn: virtual page number
+        :param read_or_write: access type
+        """
+        virtual_time = self.page_table.total_memory_accesses
+        frame = self.resident.get(vpn)
+
+        if frame is None:
+            self.page_table.page_faults += 1
+
+            victim_ppn, scheduled_writes = self.frame_queue.find_working_set_victim(virtual_time, self.window)
+            self.page_table.writes_to_disk += scheduled_writes
+            if victim_ppn is None:
+                # all pages are dirty and no write is pending, write the page under the hand synchronously
+                victim_ppn = self.frame_queue.pointer
+                self.page_table.writes_to_disk += 1
+                self.dirty = True
+
+            frame = self.frame_queue.list[victim_ppn]
+            if frame.in_use:
+                self.evict = True
+                self.frame_queue.remove(victim_ppn)
+
+            self.page_table.map_page(frame, vpn)
+            self.frame_queue.pointer = (victim_ppn + 1) % self.frame_queue.qsize
+        else:
+            self.hit = True
+
+        frame.reference = True
+        frame.last_use = virtual_time
+        if read_or_write == 'W':
+            frame.dirty = True
+            # the scheduled write holds the old content, the page stays dirty
+            frame.write_pending = False
+
+    def update_working_set(self, vpn):
+        """
+        Tracks pages used during the last window and samples working set size.
+        :param vpn: virtual page number of current access
+        """
+        virtual_time = self.page_table.total_memory_accesses
+        self.last_use[vpn] = virtual_time
+        self.window_accesses.append((virtual_time, vpn))
+
+        while self.window_accesses and self.window_accesses[0][0] <= virtual_time - self.window:
+            time, old_vpn = self.window_accesses.popleft()
+            # page leaves the working set unless it was used again
+            if self.last_use[old_vpn] == time:
+                del self.last_use[old_vpn]
+
+        if virtual_time % self.sample_interval == 0:
+            self.working_set_sizes.append((virtual_time, len(self.last_use), len(self.resident)))
@@ -0,0 +1,167 @@
+"""
+Per-page fault attribution
+
+Counts page faults, evictions and dirty writes (writebacks of evicted pages and Clock swap daemon flushes)
+of every page in Space-Saving sketches: at most `capacity` pages are counted at once, a new page replaces
+the least counted one and inherits its count as the error bound. Every page counted more than
+`total / capacity` times is guaranteed to be in the sketch, so memory stays bounded on traces with millions
+of unique pages and the heavy hitters are still found.
+
+Evictions are recorded with the dirty bit of the evicted page when the algorithm releases its frame through
+the page table's unmap_page, so it works for every algorithm and costs nothing per access. Writes of
+resident pages (Clock swap daemon flushes, WSClock scheduled writes) are attributed to the pages written
+since their last write access, which are only looked up when an access writes more pages than it evicts dirty.
+"""
+import heapq
+
+DEFAULT_CAPACITY = 1024
+FAULTS = 'faults'
+EVICTIONS = 'evictions'
+DIRTY_WRITES = 'dirty_writes'
+METRICS = (FAULTS, EVICTIONS, DIRTY_WRITES)
+
+TOPK_HEADER = ('alg', 'metric', 'rank', 'vpn', 'count', 'error')
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy-hitter sketch of at most `capacity` counters.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("Sketch capacity should be positive.")
+        self.capacity: int = capacity
+        # KEY = counted key, VALUE = count (overestimated by at most the error)
+        self.counts: dict = {}
+        # KEY = counted key, VALUE = count the key inherited when it replaced another one
+        self.errors: dict = {}
+        # (count, key), entries whose count is outdated are skipped when popped
+        self.heap: list = []
+        self.total: int = 0
+
+    def add(self, key, count: int = 1):
+        """
+        :param key: counted key
+        :param count: increment
+        """
+        self.total += count
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+        else:
+            min_count, min_key = self.pop_min()
+            del self.counts[min_key]
+            del self.errors[min_key]
+            self.counts[key] = min_count + count
+            self.errors[key] = min_count
+        heapq.heappush(self.heap, (self.counts[key], key))
+        if len(self.heap) > 4 * self.capacity:
+            self.heap = [(key_count, counted) for counted, key_count in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def pop_min(self) -> tuple:
+        """
+        :return: tuple (count, key) of the least counted key
+        """
+        while True:
+            min_count, min_key = heapq.heappop(self.heap)
+            if self.counts.get(min_key) == min_count:
+                return min_count, min_key
+
+    def top(self, k: int) -> list:
+        """
+        :param k: number of keys
+        :return: list of up to k tuples (key, count, error), the most counted first
+        """
+        return sorted(((key, count, self.errors[key]) for key, count in self.counts.items()),
+                      key=lambda item: (-item[1], item[2]))[:k]
+
+
+class FaultAttribution:
+    """
+    Attributes page faults, evictions and dirty writes of an algorithm run to pages.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        :param capacity: number of counters of every sketch
+        """
+        # KEY = metric, VALUE = sketch
+        self.sketches: dict = {metric: SpaceSaving(capacity) for metric in METRICS}
+        # VPNs of resident pages written since their last write to disk was attributed
+        self.dirty: set = set()
+        # (VPN, dirty bit) of pages evicted during current access
+        self.evicted: list = []
+
+    def attach(self, alg):
+        """
+        Attributes the effects of every access processed by algorithm's step.
+        :param alg: algorithm instance
+        :return: algorithm instance
+        """
+        step = alg.step
+        page_table = alg.page_table
+        unmap_page = page_table.unmap_page
+
+        def unmap_page_with_attribution(frame):
+            if frame.in_use:
+                self.evicted.append((frame.vpn, frame.dirty))
+            unmap_page(frame)
+
+        def step_with_attribution(next_address):
+            vpn = page_table.get_vpn(next_address[0])
+            page_faults = page_table.page_faults
+            writes_to_disk = page_table.writes_to_disk
+            step(next_address)
+            if page_table.page_faults > page_faults:
+                self.sketches[FAULTS].add(vpn, page_table.page_faults - page_faults)
+            writes_to_disk = page_table.writes_to_disk - writes_to_disk
+            if self.evicted:
+                writes_to_disk -= self.count_evictions()
+            if writes_to_disk > 0:
+                self.count_flushes(page_table)
+            if next_address[1] == 'W':
+                self.dirty.add(vpn)
+
+        page_table.unmap_page = unmap_page_with_attribution
+        alg.step = step_with_attribution
+        return alg
+
+    def count_evictions(self) -> int:
+        """
+        Counts pages evicted during current access, dirty ones are written to disk. A page which was written
+        and is evicted clean was flushed by the swap daemon during this access.
+        :return: number of writes of evicted pages
+        """
+        writes_to_disk = 0
+        for vpn, dirty in self.evicted:
+            self.sketches[EVICTIONS].add(vpn)
+            if dirty or vpn in self.dirty:
+                self.dirty.discard(vpn)
+                self.sketches[DIRTY_WRITES].add(vpn)
+                writes_to_disk += 1
+        self.evicted = []
+        return writes_to_disk
+
+    def count_flushes(self, page_table):
+        """
+        Counts writes of resident pages: pages which became clean or have their write scheduled (WSClock).
+        """
+        for vpn in list(self.dirty):
+            frame = page_table.resident[vpn]
+            if not frame.dirty or frame.write_pending:
+                self.dirty.discard(vpn)
+                self.sketches[DIRTY_WRITES].add(vpn)
+
+    def get_rows(self, alg_name: str, k: int) -> list:
+        """
+        :param alg_name: algorithm name written in every row
+        :param k: number of pages of every metric
+        :return: rows of TOPK_HEADER columns
+        """
+        return [(alg_name, metric, rank, '{:x}'.format(vpn) if isinstance(vpn, int) else vpn, count, error)
+                for metric in METRICS
+                for rank, (vpn, count, error) in enumerate(self.sketches[metric].top(k), 1)]
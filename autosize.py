@@ -0,0 +1,379 @@
+"""
+Memory auto-sizing: the smallest number of frames meeting a target fault rate
+
+Stack algorithms (LRU, OPT) have the inclusion property: pages resident with c frames are resident with c + 1
+frames, so a single pass over the trace computes the stack distance of every access and the whole miss curve
+(page faults for every number of frames) follows from the distance histogram.
+- LRU: stack distance = number of distinct pages accessed since the previous access of the page,
+  counted with a Fenwick tree over access positions in O(n log n),
+- OPT: Mattson's priority stack, pages are ordered by their next use (the sooner, the higher), O(n * frames).
+
+Other algorithms (Clock, Aging, ...) are not stack algorithms, their faults are counted by simulation:
+galloping (1, 2, 4, ... frames) finds a range containing the answer, then the range is narrowed by k-ary search.
+Every round simulates up to `workers` frame counts in parallel, worker processes share one decoded trace.
+The search assumes the number of faults doesn't grow with the number of frames (no Belady's anomaly).
+"""
+import collections
+import concurrent.futures
+import logging
+import os
+
+import page_table as pt
+
+LOG = logging.getLogger(__name__)
+
+CURVE = 'miss-curve'
+SEARCH = 'search'
+
+# initial number of positions of Fenwick tree used to compute LRU stack distances
+MIN_TREE_SIZE = 1 << 16
+
+# decoded trace and algorithm factory of worker process
+_trace: list = []
+_factory = None
+
+
+def iterate_reuse(vpns):
+    """
+    Computes LRU stack distance (number of distinct pages accessed since the previous access of the page,
+    the page itself included) and inter-reference gap (accesses since the previous access) of every access.
+    Fenwick tree marks the last access of every page. Its positions are renumbered when it's full,
+    so it holds O(distinct pages) positions instead of O(accesses) and the trace can be a stream.
+    :param vpns: iterable of VPNs
+    :return: a generator of tuples (stack distance, gap), (None, None) for the first access of a page
+    """
+    size = MIN_TREE_SIZE
+    tree = [0] * (size + 1)
+    # KEY = VPN, VALUE = tree position of the last access (starting from 1)
+    last_access = {}
+    # KEY = VPN, VALUE = time of the last access
+    last_time = {}
+    position = 0
+
+    for time, vpn in enumerate(vpns):
+        position += 1
+        if position > size:
+            size, tree = compact_tree(last_access)
+            position = len(last_access) + 1
+
+        previous = last_access.get(vpn)
+        if previous is None:
+            yield None, None
+        else:
+            # pages accessed up to the previous access of the page (inclusive)
+            index = previous
+            accessed_before = 0
+            while index:
+                accessed_before += tree[index]
+                index &= index - 1
+            yield len(last_access) - accessed_before + 1, time - last_time[vpn]
+
+            index = previous
+            while index <= size:
+                tree[index] -= 1
+                index += index & -index
+
+        index = position
+        while index <= size:
+            tree[index] += 1
+            index += index & -index
+        last_access[vpn] = position
+        last_time[vpn] = time
+
+
+def compact_tree(last_access: dict) -> tuple:
+    """
+    Renumbers last accesses of pages to positions 1, 2, ... (keeping their order) in a new Fenwick tree
+    with room for at least as many new accesses.
+    :param last_access: KEY = VPN, VALUE = tree position of the last access, renumbered in place
+    :return: tuple (size of the tree, tree)
+    """
+    live = sorted(last_access, key=last_access.get)
+    size = max(MIN_TREE_SIZE, 2 * len(live))
+    tree = [0] * (size + 1)
+    for index, vpn in enumerate(live, 1):
+        last_access[vpn] = index
+        tree[index] = 1
+    for index in range(1, size + 1):
+        parent = index + (index & -index)
+        if parent <= size:
+            tree[parent] += tree[index]
+    return size, tree
+
+
+def lru_stack_distances(vpns):
+    """
+    :param vpns: iterable of VPNs
+    :return: a generator of LRU stack distances of accesses (None for the first access of a page)
+    """
+    for distance, _ in iterate_reuse(vpns):
+        yield distance
+
+
+def get_next_uses(vpns: list) -> list:
+    """
+    :param vpns: list of VPNs
+    :return: position of the next access of the same page for every access (length of the trace if none)
+    """
+    never = len(vpns)
+    next_uses = [never] * never
+    # KEY = VPN, VALUE = position of the nearest access from the end
+    upcoming = {}
+    for position in range(never - 1, -1, -1):
+        vpn = vpns[position]
+        next_uses[position] = upcoming.get(vpn, never)
+        upcoming[vpn] = position
+    return next_uses
+
+
+def opt_stack_distances(vpns: list, max_frames: int, next_uses=None):
+    """
+    :param vpns: list of VPNs
+    :param max_frames: depth of the stack, deeper distances are reported as None
+    :param next_uses: next-use array of the trace (see get_next_uses), computed if not given
+    :return: a generator of OPT stack distances of accesses (None for misses with `max_frames` frames)
+    """
+    if next_uses is None:
+        next_uses = get_next_uses(vpns)
+    # pages ordered by priority, stack[:c] is content of memory with c frames
+    stack = []
+    # KEY = VPN, VALUE = next use of the page
+    priority = {}
+
+    for position, vpn in enumerate(vpns):
+        distance = None
+        if stack and stack[0] == vpn:
+            distance = 1
+        elif stack:
+            # accessed page goes on top, the page pushed down competes with the pages below,
+            # the one used later keeps going down
+            carry = stack[0]
+            stack[0] = vpn
+            for depth in range(1, len(stack)):
+                current = stack[depth]
+                if current == vpn:
+                    stack[depth] = carry
+                    distance = depth + 1
+                    break
+                if priority[current] > priority[carry]:
+                    stack[depth] = carry
+                    carry = current
+            else:
+                if len(stack) < max_frames:
+                    stack.append(carry)
+                else:
+                    del priority[carry]
+        elif max_frames > 0:
+            stack.append(vpn)
+        priority[vpn] = next_uses[position]
+        yield distance
+
+
+def get_miss_curve(distances, max_frames: int) -> list:
+    """
+    :param distances: stack distances of all accesses (None - miss with any number of frames)
+    :param max_frames: length of the curve
+    :return: list of page faults indexed by number of frames, from 0 to `max_frames`
+    """
+    histogram = collections.Counter(distances)
+    cold_accesses = histogram.pop(None, 0)
+    return get_histogram_miss_curve(histogram, cold_accesses, max_frames)
+
+
+def get_histogram_miss_curve(reuse_histogram: dict, cold_accesses: int, max_frames: int) -> list:
+    """
+    :param reuse_histogram: KEY = stack distance, VALUE = number of accesses
+    :param cold_accesses: number of accesses which miss with any number of frames
+    :param max_frames: length of the curve
+    :return: list of page faults indexed by number of frames, from 0 to `max_frames`
+    """
+    # accesses with stack distance d (up to `max_frames`) hit with d or more frames
+    histogram = [0] * (max_frames + 1)
+    page_faults = cold_accesses
+    for distance, count in reuse_histogram.items():
+        if distance > max_frames:
+            page_faults += count
+        else:
+            histogram[distance] += count
+
+    curve = [0] * (max_frames + 1)
+    for frames in range(max_frames, -1, -1):
+        curve[frames] = page_faults
+        page_faults += histogram[frames]
+    return curve
+
+
+def lru_miss_curve(vpns: list, max_frames: int = None) -> list:
+    """
+    :param vpns: list of VPNs
+    :param max_frames: length of the curve, number of distinct pages by default
+    :return: list of LRU page faults indexed by number of frames
+    """
+    if max_frames is None:
+        max_frames = len(set(vpns))
+    return get_miss_curve(lru_stack_distances(vpns), max_frames)
+
+
+def opt_miss_curve(vpns: list, max_frames: int = None, next_uses=None) -> list:
+    """
+    :param vpns: list of VPNs
+    :param max_frames: length of the curve, number of distinct pages by default
+    :param next_uses: next-use array of the trace, computed if not given
+    :return: list of OPT page faults indexed by number of frames
+    """
+    if max_frames is None:
+        max_frames = len(set(vpns))
+    return get_miss_curve(opt_stack_distances(vpns, max_frames, next_uses), max_frames)
+
+
+def min_frames_from_curve(curve: list, max_faults: int):
+    """
+    :param curve: page faults indexed by number of frames
+    :param max_faults: maximal acceptable number of page faults
+    :return: smallest positive number of frames with at most `max_faults` page faults, None if there is none
+    """
+    for frames in range(1, len(curve)):
+        if curve[frames] <= max_faults:
+            return frames
+    return None
+
+
+def init_worker(trace: list, factory):
+    """
+    Keeps decoded trace and algorithm factory in worker process, so they are passed once per worker
+    (shared copy-on-write with forked workers) rather than once per simulation.
+    :param trace: list of tuples (VPN, R/W)
+    :param factory: function (algorithm class, page table, trace) -> algorithm instance
+    """
+    global _trace, _factory
+    _trace = trace
+    _factory = factory
+
+
+def count_faults(algorithm, num_frames: int) -> tuple:
+    """
+    Simulates algorithm on the trace of worker process.
+    :param algorithm: algorithm class
+    :param num_frames: number of frames in RAM
+    :return: tuple (algorithm name, page faults)
+    """
+    page_table = pt.DecodedPageTable(num_frames)
+    alg = _factory(algorithm, page_table, [])
+    for next_address in _trace:
+        alg.step(next_address)
+    return alg.__str__(), page_table.page_faults
+
+
+class FrameSearch:
+    """
+    Parallel galloping and k-ary search of the smallest number of frames with at most `max_faults` page faults.
+    """
+
+    def __init__(self, executor: concurrent.futures.Executor, workers: int):
+        self.executor = executor
+        self.workers: int = workers
+
+    def simulate(self, algorithm, frame_counts: list, page_faults: dict) -> str:
+        """
+        Simulates algorithm for every number of frames in parallel.
+        :param algorithm: algorithm class
+        :param frame_counts: numbers of frames to simulate
+        :param page_faults: KEY = number of frames, VALUE = page faults, filled with results
+        :return: algorithm name
+        """
+        name = algorithm.__name__
+        futures = {frames: self.executor.submit(count_faults, algorithm, frames) for frames in frame_counts}
+        for frames, future in futures.items():
+            name, page_faults[frames] = future.result()
+        LOG.info("%s: %s", name, {frames: page_faults[frames] for frames in frame_counts})
+        return name
+
+    def search(self, algorithm, max_faults: int, max_frames: int) -> tuple:
+        """
+        :param algorithm: algorithm class
+        :param max_faults: maximal acceptable number of page faults
+        :param max_frames: number of frames with only compulsory page faults (number of distinct pages)
+        :return: tuple (algorithm name, number of frames, page faults), number of frames is None
+                 if the target can't be met
+        """
+        # KEY = number of frames, VALUE = page faults
+        page_faults = {}
+        # the target is not met with `low` frames, it is met with `high` frames
+        low, high = 0, None
+        name = algorithm.__name__
+
+        candidate = 1
+        while high is None:
+            frame_counts = []
+            while len(frame_counts) < self.workers and candidate < max_frames:
+                frame_counts.append(candidate)
+                candidate *= 2
+            if candidate >= max_frames:
+                frame_counts.append(max_frames)
+            name = self.simulate(algorithm, frame_counts, page_faults)
+            for frames in frame_counts:
+                if page_faults[frames] <= max_faults:
+                    high = frames
+                    break
+                low = frames
+            if high is None and frame_counts[-1] == max_frames:
+                return name, None, page_faults[max_frames]
+
+        while high - low > 1:
+            points = min(self.workers, high - low - 1)
+            frame_counts = sorted({low + (high - low) * index // (points + 1) for index in range(1, points + 1)})
+            self.simulate(algorithm, frame_counts, page_faults)
+            for frames in frame_counts:
+                if page_faults[frames] <= max_faults:
+                    high = frames
+                    break
+                low = frames
+
+        return name, high, page_faults[high]
+
+
+def autosize(trace: list, target_fault_rate: float, search_algorithms, factory, workers: int = None,
+             stats=None) -> tuple:
+    """
+    Finds the smallest number of frames meeting the target fault rate for LRU, OPT and every searched algorithm.
+    :param trace: list of tuples (VPN, R/W) decoded by page_table.decode_trace
+    :param target_fault_rate: maximal acceptable page faults / memory accesses
+    :param search_algorithms: algorithm classes sized by simulation
+    :param factory: function (algorithm class, page table, trace) -> algorithm instance, has to be picklable
+    :param workers: number of worker processes (number of CPUs by default)
+    :param stats: trace_stats.TraceStats of the trace, miss curves are computed from scratch if not given
+    :return: tuple (list of tuples (algorithm name, number of frames or None, page faults, method),
+             LRU miss curve, OPT miss curve)
+    """
+    vpns = [access[0] for access in trace]
+    max_faults = int(target_fault_rate * len(vpns))
+    results = []
+
+    if stats is not None:
+        max_frames = stats.unique_pages
+        lru_curve = stats.lru_miss_curve(max_frames)
+        next_uses = stats.next_uses
+    else:
+        max_frames = len(set(vpns))
+        lru_curve = lru_miss_curve(vpns, max_frames)
+        next_uses = None
+    lru_frames = min_frames_from_curve(lru_curve, max_faults)
+    results.append(('LRU', lru_frames, lru_curve[lru_frames or max_frames], CURVE))
+    LOG.info("LRU: %s frames", lru_frames)
+
+    # OPT never faults more than LRU, so its curve is needed only up to the LRU answer
+    opt_curve = opt_miss_curve(vpns, lru_frames or max_frames, next_uses)
+    opt_frames = min_frames_from_curve(opt_curve, max_faults)
+    results.append(('Opt', opt_frames, opt_curve[opt_frames or -1], CURVE))
+    LOG.info("Opt: %s frames", opt_frames)
+
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                                initargs=(trace, factory)) as executor:
+        frame_search = FrameSearch(executor, workers)
+        for algorithm in search_algorithms:
+            name, frames, page_faults = frame_search.search(algorithm, max_faults, max_frames)
+            results.append((name, frames, page_faults, SEARCH))
+            LOG.info("%s: %s frames", name, frames)
+
+    return results, lru_curve, opt_curve
@@ -1,5 +1,5 @@
 """
-Circular queue implementation for use in the clock algorithm
+Circular queue implementation for use in the clock and WSClock algorithms
 """
 import page_table as pt
 
@@ -9,12 +9,14 @@ class CircularQueue:
     Circular queue structure that takes initial size as parameter
     """
 
-    def __init__(self, queue_size):
+    def __init__(self, queue_size, page_table):
         """
         Must be a queue of frames
         :param queue_size: initial queue size
+        :param page_table: page table mapping VPNs to frames of the queue
         """
         self.qsize = queue_size
+        self.page_table = page_table
         self.pointer = 0
         self.list = []
         for i in range(0, queue_size):
@@ -37,8 +39,8 @@ class CircularQueue:
             # also need to check if we're just doing an update
             if not elem.in_use or elem.vpn == vpn:
                 added = True
-                elem.in_use = True
-                elem.vpn = vpn
+                if not elem.in_use:
+                    self.page_table.map_page(elem, vpn)
                 # if we're doing a write, need to set dirty bit
                 if read_or_write == 'W':
                     elem.dirty = True
@@ -56,10 +58,10 @@ class CircularQueue:
         :param ppn: the victim page
         """
         removal_page = self.list[ppn]
-        removal_page.in_use = False
+        self.page_table.unmap_page(removal_page)
         removal_page.referenced = False
         removal_page.dirty = False
-        removal_page.vpn = None
+        removal_page.write_pending = False
 
     def find_victim(self):
         """
@@ -99,3 +101,62 @@ class CircularQueue:
                 number_of_disk_writes += 1
 
         return number_of_disk_writes
+
+
+class WorkingSetQueue(CircularQueue):
+    """
+    Circular queue of frames which knows the virtual time of last use of each frame (WSClock)
+    """
+
+    def find_working_set_victim(self, virtual_time, window):
+        """
+        Moves the hand looking for a clean page which is not in the working set
+        (not used during last `window` accesses). Referenced pages get their reference bit cleared.
+        Old dirty pages get their write to disk scheduled and the hand moves on, the write is
+        asynchronous: the page stays dirty until the hand comes back to it, then the write is done.
+        If no page is found during one revolution, the hand moves on until it finds a clean page
+        (pages written during the revolution are clean when the hand reaches them again).
+        :param virtual_time: current virtual time (number of processed accesses)
+        :param window: working set window (tau)
+        :return: tuple (victim ppn or None if all frames are dirty and no write is pending,
+                 number of scheduled writes)
+        """
+        scheduled_writes = 0
+
+        for _ in range(0, self.qsize):
+            elem = self.list[self.pointer]
+            if not elem.in_use:
+                return elem.ppn, scheduled_writes
+
+            self.complete_write(elem)
+            if elem.reference:
+                elem.reference = False
+            elif virtual_time - elem.last_use > window:
+                if not elem.dirty:
+                    return elem.ppn, scheduled_writes
+                if not elem.write_pending:
+                    # schedule write to disk, the page is clean when the hand comes back
+                    elem.write_pending = True
+                    scheduled_writes += 1
+
+            self.pointer = (self.pointer + 1) % self.qsize
+
+        # whole working set is in memory, take the first clean page
+        for _ in range(0, self.qsize):
+            elem = self.list[self.pointer]
+            self.complete_write(elem)
+            if not elem.dirty:
+                return elem.ppn, scheduled_writes
+            self.pointer = (self.pointer + 1) % self.qsize
+
+        return None, scheduled_writes
+
+    @staticmethod
+    def complete_write(elem):
+        """
+        Finishes scheduled write of the page under the hand, the page is clean afterwards.
+        :param elem: frame under the hand
+        """
+        if elem.write_pending:
+            elem.write_pending = False
+            elem.dirty = False
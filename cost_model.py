@@ -0,0 +1,132 @@
+"""
+Effective access time cost model
+
+Turns every memory access of an algorithm run into a latency:
+- RAM hit costs RAM latency,
+- page fault additionally reads the page from the swap device,
+- dirty writeback (eviction or Clock swap daemon flush) writes a page to the swap device.
+The swap device serves one request at a time. With synchronous writeback the faulting access waits
+for its writes, with asynchronous writeback writes are queued on the device after the read and delay
+only the requests which come after them.
+"""
+import collections
+
+RAM_LATENCY = 100
+
+SYNC = 'sync'
+ASYNC = 'async'
+WRITEBACKS = (SYNC, ASYNC)
+
+
+class DeviceProfile:
+    """
+    Latencies [ns] of single page read and write of swap device
+    """
+
+    def __init__(self, name: str, read_latency: int, write_latency: int):
+        self.name = name
+        self.read_latency = read_latency
+        self.write_latency = write_latency
+
+
+NVME = DeviceProfile('nvme', 25000, 30000)
+SATA_SSD = DeviceProfile('sata-ssd', 100000, 150000)
+HDD = DeviceProfile('hdd', 8000000, 9000000)
+PROFILES = {profile.name: profile for profile in (NVME, SATA_SSD, HDD)}
+
+
+class CostModel:
+    """
+    Accumulates latencies of memory accesses. Latencies are kept as a histogram,
+    so memory doesn't grow with trace length.
+    """
+
+    def __init__(self, profile: DeviceProfile, writeback: str = ASYNC, ram_latency: int = RAM_LATENCY):
+        self.profile: DeviceProfile = profile
+        self.writeback: str = writeback
+        self.ram_latency: int = ram_latency
+
+        # simulated time [ns] and time when swap device finishes all queued requests
+        self.now: int = 0
+        self.device_busy_until: int = 0
+
+        # KEY = latency, VALUE = number of accesses
+        self.latencies: collections.Counter = collections.Counter()
+        self.total_latency: int = 0
+        self.accesses: int = 0
+
+    def record(self, page_faults: int, writes: int):
+        """
+        Computes latency of single memory access.
+        :param page_faults: number of pages read from swap device during the access (0 for a hit)
+        :param writes: number of dirty pages written to swap device during the access
+        :return: latency [ns]
+        """
+        latency = self.ram_latency
+        if self.writeback == SYNC:
+            latency += self.use_device(self.now, writes * self.profile.write_latency
+                                       + page_faults * self.profile.read_latency)
+        else:
+            latency += self.use_device(self.now, page_faults * self.profile.read_latency)
+            self.use_device(self.now, writes * self.profile.write_latency)
+
+        self.now += latency
+        self.latencies[latency] += 1
+        self.total_latency += latency
+        self.accesses += 1
+        return latency
+
+    def use_device(self, time: int, duration: int) -> int:
+        """
+        Queues request on swap device.
+        :param time: time when request is issued
+        :param duration: time needed to serve request
+        :return: time from issuing the request until it's served
+        """
+        if not duration:
+            return 0
+        self.device_busy_until = max(time, self.device_busy_until) + duration
+        return self.device_busy_until - time
+
+    def attach(self, alg):
+        """
+        Records latency of every access processed by algorithm's step.
+        :param alg: algorithm instance
+        :return: algorithm instance
+        """
+        step = alg.step
+        page_table = alg.page_table
+
+        def step_with_cost(next_address):
+            page_faults = page_table.page_faults
+            writes = page_table.writes_to_disk
+            step(next_address)
+            self.record(page_table.page_faults - page_faults, page_table.writes_to_disk - writes)
+
+        alg.step = step_with_cost
+        return alg
+
+    def effective_access_time(self) -> float:
+        """
+        :return: mean latency [ns]
+        """
+        return self.total_latency / self.accesses if self.accesses else 0
+
+    def percentile(self, percent: float) -> int:
+        """
+        :param percent: percentile, e.g. 99
+        :return: latency [ns] not exceeded by `percent` % of accesses
+        """
+        rank = self.accesses * percent / 100
+        count = 0
+        for latency in sorted(self.latencies):
+            count += self.latencies[latency]
+            if count >= rank:
+                return latency
+        return 0
+
+    def get_result(self):
+        """
+        :return: columns appended to results CSV: effective access time, p50 and p99 latency [ns]
+        """
+        return round(self.effective_access_time(), 2), self.percentile(50), self.percentile(99)
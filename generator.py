@@ -1,56 +1,344 @@
 """
 Trace file generator.
+
+Workload is a mix of regions laid out one after another in virtual address space. Every access picks a region
+(with probability proportional to its weight), the region's locality model picks a page within the region
+and the access is a write with the region's write ratio. Models:
+- uniform - pages drawn uniformly (no locality),
+- zipf - page of rank k is drawn with probability proportional to 1 / k^exponent (hot and cold pages),
+- phases - accesses are uniform within a working set of `working_set` pages, the working set is drawn anew
+  every `phase_length` accesses of the region,
+- scan - sequential pass over the region (each page is accessed `run` times in a row), wrapping at its end,
+- loop - the same sequential pattern repeated over a small region (e.g. a loop over an array).
+
+Workload is given as `<model>:<param>=<value>,...;<model>:...`, e.g.
+`zipf:pages=1000,exponent=1.2,write=0.1,weight=3;scan:pages=20000,write=0`.
+Accesses are generated and written in blocks, so trace size doesn't affect memory usage.
+Generation is driven by one seeded random generator, the same seed produces the same trace.
+
+With `--shards` the trace is split into shards of (almost) equal size generated in parallel. Every shard is
+generated from its own seed derived from the seed and the shard number (regions start afresh in every shard),
+so the trace depends on the seed and the number of shards, never on the number of workers.
+Shards are concatenated into the output file, or with `--index` they are kept and listed
+in shard index `<output>.shards`, which is read as one trace by input_parser.
+
+Usage:  python generator.py [--pages <accesses>] [--workload <workload>] [--seed <seed>] [--output <tracefile>]
+            [--shards <shards> [--workers <workers>] [--index]]
 """
 
+import abc
 import argparse
+import concurrent.futures
+import itertools
 import os
 import random
+import shutil
+
+import input_parser as iparser
 
 OUTPUT_DIRECTORY = 'data/'
 
+BLOCK_SIZE = 65536
+DEFAULT_SEED = 0
+
 
 class Generator:
     """
-    Generates random output file representing memory for given number of pages.
+    Generates output file representing memory accesses of a workload (uniform random pages by default).
     """
-    def __init__(self, pages: int):
+    def __init__(self, pages: int, workload: str = None, seed=DEFAULT_SEED, output_file: str = None):
+        """
+        :param pages: number of accesses (output file size in lines)
+        :param workload: workload specification, uniform random pages by default
+        :param seed: seed of random generator (int or str)
+        :param output_file: path to output file, `data/<number of pages>[_<models>].trace` by default
+        """
         self.pages = pages
+        self.workload_spec = workload
+        self.workload = Workload(parse_workload(workload) if workload else [UniformRegion()])
+        self.seed = seed
+        self.output_file = output_file or self.get_default_output_file(workload)
+
+    def get_default_output_file(self, workload: str) -> str:
+        """
+        :param workload: workload specification
+        :return: `data/<number of pages>.trace` or `data/<number of pages>_<model>_<model>....trace`
+        """
+        name = str(self.pages)
+        if workload:
+            name += ''.join('_' + region.MODEL for region in self.workload.regions)
+        return OUTPUT_DIRECTORY + name + '.trace'
 
     def generate(self):
         """
-        Generates output file `<number of pages>.trace` in `data` directory.
+        Generates output file (`<number of pages>.trace` in `data` directory by default).
         """
-        self.create_data_dir()
-        filename: str = OUTPUT_DIRECTORY + str(self.pages) + '.trace'
-        with open(filename, 'w+') as file:
-            for _ in range(self.pages):
-                file.write(RandomPage().__repr__())
+        self.create_output_dir()
+        with open(self.output_file, 'w+') as file:
+            for block in self.workload.iterate_blocks(self.pages, random.Random(self.seed)):
+                file.write(block)
 
-    @staticmethod
-    def create_data_dir():
+    def create_output_dir(self):
         """
-        Creates directory `data` in project root.
+        Creates directory of output file (`data` in project root by default).
         """
-        if not os.path.exists(OUTPUT_DIRECTORY):
-            os.makedirs(OUTPUT_DIRECTORY)
+        directory = os.path.dirname(self.output_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+
+def generate_shard(pages: int, workload: str, seed: str, output_file: str) -> str:
+    """
+    Generates one shard (in worker process).
+    :return: path to shard file
+    """
+    Generator(pages, workload, seed, output_file).generate()
+    return output_file
+
+
+def get_shard_seed(seed: int, shard: int) -> str:
+    """
+    :param seed: seed of the whole trace
+    :param shard: shard number
+    :return: seed of the shard
+    """
+    return '{}/{}'.format(seed, shard)
+
+
+class ShardedGenerator(Generator):
+    """
+    Generates output file in independently seeded shards on a worker process pool.
+    """
+    def __init__(self, pages: int, workload: str = None, seed: int = DEFAULT_SEED, output_file: str = None,
+                 shards: int = 1, workers: int = None, index: bool = False):
+        """
+        :param shards: number of shards
+        :param workers: number of worker processes (number of CPUs by default)
+        :param index: keep shard files and write shard index instead of concatenating them
+        """
+        super().__init__(pages, workload, seed, output_file)
+        if shards < 1:
+            raise ValueError("Number of shards should be positive.")
+        self.shards: int = shards
+        self.workers: int = workers
+        self.index: bool = index
+
+    def get_shard_sizes(self) -> list:
+        """
+        :return: number of accesses of every shard, the remainder goes to the first shards
+        """
+        return [self.pages // self.shards + (1 if shard < self.pages % self.shards else 0)
+                for shard in range(self.shards)]
+
+    def get_shard_file(self, shard: int) -> str:
+        """
+        :param shard: shard number
+        :return: `<output without extension>.<shard>.trace`
+        """
+        return '{}.{:04d}.trace'.format(os.path.splitext(self.output_file)[0], shard)
+
+    def get_index_file(self) -> str:
+        """
+        :return: `<output without extension>.shards`
+        """
+        return os.path.splitext(self.output_file)[0] + iparser.SHARD_INDEX_SUFFIX
+
+    def generate(self):
+        """
+        Generates shards in parallel, then concatenates them into output file (in shard order)
+        or writes shard index.
+        """
+        self.create_output_dir()
+        shard_files = [self.get_shard_file(shard) for shard in range(self.shards)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as executor:
+            generated = executor.map(generate_shard, self.get_shard_sizes(), itertools.repeat(self.workload_spec),
+                                     [get_shard_seed(self.seed, shard) for shard in range(self.shards)],
+                                     shard_files)
+            if self.index:
+                list(generated)
+                with open(self.get_index_file(), 'w') as index:
+                    index.writelines(os.path.basename(shard_file) + '\n' for shard_file in shard_files)
+                return
+
+            with open(self.output_file, 'wb') as output:
+                # shards are appended as soon as they (and all shards before them) are ready
+                for shard_file in generated:
+                    with open(shard_file, 'rb') as shard:
+                        shutil.copyfileobj(shard, output)
+                    os.remove(shard_file)
 
 
 VPN_UPPER_BOUND = 80  # max: 20**2-1 = 399
 READ_PROBABILITY = 85  # in %
+# VPN is written as 5 hex digits
+MAX_PAGES = 1 << 20
 
 
-class RandomPage:
+class Region(abc.ABC):
     """
-    Representation of page in memory consisting of random page address and read or write access.
+    Range of `pages` pages accessed according to a locality model.
     """
+    MODEL = None
 
-    def __init__(self):
-        self.vpn = '{:05x}'.format(random.randint(0, VPN_UPPER_BOUND))
-        self.ppn = '{:03x}'.format(random.getrandbits(12))
-        self.r_w = 'W' if random.randint(0, 100) > READ_PROBABILITY else 'R'
+    def __init__(self, pages: int = VPN_UPPER_BOUND + 1, write: float = (100 - READ_PROBABILITY) / 100,
+                 weight: float = 1):
+        """
+        :param pages: number of pages of the region
+        :param write: probability of write access
+        :param weight: relative share of accesses of the whole workload
+        """
+        if pages < 1 or not 0 <= write <= 1 or weight <= 0:
+            raise ValueError("Region of {} model needs positive pages and weight, and write ratio in [0, 1]."
+                             .format(self.MODEL))
+        self.pages: int = pages
+        self.write: float = write
+        self.weight: float = weight
+
+    @abc.abstractmethod
+    def draw(self, generator: random.Random, count: int) -> list:
+        """
+        :param generator: random generator
+        :param count: number of accesses
+        :return: list of `count` next pages (relative to the region start)
+        """
+
+
+class UniformRegion(Region):
+    MODEL = 'uniform'
+
+    def draw(self, generator: random.Random, count: int) -> list:
+        return [generator.randrange(self.pages) for _ in range(count)]
+
+
+class ZipfRegion(Region):
+    MODEL = 'zipf'
+
+    def __init__(self, exponent: float = 1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.exponent: float = exponent
+        # cumulative weights of page ranks, page 0 is the hottest
+        self.cum_weights: list = list(itertools.accumulate(1 / rank ** exponent
+                                                           for rank in range(1, self.pages + 1)))
+
+    def draw(self, generator: random.Random, count: int) -> list:
+        return generator.choices(range(self.pages), cum_weights=self.cum_weights, k=count)
+
+
+class PhaseRegion(Region):
+    MODEL = 'phases'
+
+    def __init__(self, working_set: int = 16, phase_length: int = 10000, **kwargs):
+        super().__init__(**kwargs)
+        if not 0 < working_set <= self.pages or phase_length < 1:
+            raise ValueError("Working set should fit in the region and phase length should be positive.")
+        self.working_set_size: int = working_set
+        self.phase_length: int = phase_length
+        self.working_set: list = []
+        # accesses left in the current phase
+        self.remaining: int = 0
+
+    def draw(self, generator: random.Random, count: int) -> list:
+        pages = []
+        while count:
+            if not self.remaining:
+                self.working_set = generator.sample(range(self.pages), self.working_set_size)
+                self.remaining = self.phase_length
+            drawn = min(count, self.remaining)
+            pages += generator.choices(self.working_set, k=drawn)
+            self.remaining -= drawn
+            count -= drawn
+        return pages
+
+
+class ScanRegion(Region):
+    MODEL = 'scan'
+
+    def __init__(self, run: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        if run < 1:
+            raise ValueError("Run should be positive.")
+        self.run: int = run
+        # accesses of the region so far
+        self.position: int = 0
+
+    def draw(self, generator: random.Random, count: int) -> list:
+        start = self.position
+        self.position += count
+        return [(position // self.run) % self.pages for position in range(start, self.position)]
 
-    def __repr__(self):
-        return self.vpn + self.ppn + ' ' + self.r_w + '\n'
+
+class LoopRegion(ScanRegion):
+    MODEL = 'loop'
+
+    def __init__(self, pages: int = 16, **kwargs):
+        super().__init__(pages=pages, **kwargs)
+
+
+MODELS = {region.MODEL: region for region in (UniformRegion, ZipfRegion, PhaseRegion, ScanRegion, LoopRegion)}
+# parameters of regions, all the rest are floats
+INT_PARAMS = ('pages', 'working_set', 'phase_length', 'run')
+
+
+def parse_workload(workload: str) -> list:
+    """
+    :param workload: workload specification, e.g. `zipf:pages=1000,exponent=1.2;scan:pages=20000,write=0`
+    :return: list of regions
+    """
+    regions = []
+    for region_spec in workload.split(';'):
+        model, _, params_spec = region_spec.strip().partition(':')
+        if model not in MODELS:
+            raise ValueError("Unknown model '{}'. Available: {}.".format(model, ', '.join(MODELS)))
+        params = {}
+        for param in filter(None, params_spec.split(',')):
+            key, _, value = param.partition('=')
+            key = key.strip()
+            params[key] = int(value) if key in INT_PARAMS else float(value)
+        try:
+            regions.append(MODELS[model](**params))
+        except TypeError:
+            raise ValueError("Unknown parameter of {} model: {}.".format(model, ', '.join(params)))
+    return regions
+
+
+class Workload:
+    """
+    Regions laid out one after another from VPN 0.
+    """
+
+    def __init__(self, regions: list):
+        if sum(region.pages for region in regions) > MAX_PAGES:
+            raise ValueError("Workload doesn't fit in {} pages.".format(MAX_PAGES))
+        self.regions: list = regions
+        # first VPN of every region
+        self.bases: list = [0] + list(itertools.accumulate(region.pages for region in regions))[:-1]
+        self.cum_weights: list = list(itertools.accumulate(region.weight for region in regions))
+
+    def generate_block(self, generator: random.Random, count: int) -> str:
+        """
+        :param generator: random generator
+        :param count: number of accesses
+        :return: `count` trace lines
+        """
+        picks = generator.choices(range(len(self.regions)), cum_weights=self.cum_weights, k=count)
+        accesses = []
+        for index, region in enumerate(self.regions):
+            region_count = picks.count(index)
+            pages = region.draw(generator, region_count)
+            accesses.append(iter(['{:05x}{:03x} {}\n'.format(self.bases[index] + page, generator.getrandbits(12),
+                                                             'W' if generator.random() < region.write else 'R')
+                                  for page in pages]))
+        return ''.join([next(accesses[index]) for index in picks])
+
+    def iterate_blocks(self, pages: int, generator: random.Random, block_size: int = BLOCK_SIZE):
+        """
+        :param pages: number of accesses
+        :param generator: random generator
+        :param block_size: number of accesses per block
+        :return: a generator of blocks of trace lines
+        """
+        for start in range(0, pages, block_size):
+            yield self.generate_block(generator, min(block_size, pages - start))
 
 
 def main():
@@ -59,8 +347,24 @@ def main():
     """
     parser = argparse.ArgumentParser()
     parser.add_argument("--pages", default=250000, help="number of pages (output file size in lines)")
+    parser.add_argument("--workload", help="workload regions: <model>:<param>=<value>,...;... (models: {})"
+                        .format(', '.join(MODELS)))
+    parser.add_argument("--seed", default=DEFAULT_SEED, type=int, help="seed of random generator")
+    parser.add_argument("--output", help="output file (data/<pages>[_<models>].trace by default)")
+    parser.add_argument("--shards", default=1, type=int, help="number of shards generated in parallel")
+    parser.add_argument("--workers", type=int, help="number of worker processes (number of CPUs by default)")
+    parser.add_argument("--index", action="store_true",
+                        help="keep shards and write shard index <output>.shards instead of concatenating them")
     args = parser.parse_args()
-    Generator(int(args.pages)).generate()
+    try:
+        if args.shards > 1 or args.index:
+            generator = ShardedGenerator(int(args.pages), args.workload, args.seed, args.output, args.shards,
+                                         args.workers, args.index)
+        else:
+            generator = Generator(int(args.pages), args.workload, args.seed, args.output)
+    except ValueError as error:
+        parser.error(str(error))
+    generator.generate()
 
 
 if __name__ == "__main__":
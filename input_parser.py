@@ -1,13 +1,35 @@
 """
 Routine for parsing input from provided .trace files
+
+Besides the synthetic `<MEM> R|W` format of generator.py, streaming importers read Valgrind lackey output
+and plain address-per-line files, all of them possibly gzip or xz compressed.
 """
 
+import gzip
+import io
+import itertools
 import logging
+import lzma
 import os
 import sys
 
 LOGGER = logging.getLogger(__name__)
 
+AUTO = 'auto'
+SYNTHETIC = 'synthetic'
+LACKEY = 'lackey'
+ADDRESSES = 'addresses'
+TRACE_FORMATS = (AUTO, SYNTHETIC, LACKEY, ADDRESSES)
+
+# access type of Valgrind lackey records: instruction fetch, load, store, modify
+LACKEY_RECORDS = {'I': 'R', 'L': 'R', 'S': 'W', 'M': 'W'}
+FORMAT_DETECTION_LINES = 16
+READ_BUFFER_SIZE = 1 << 20
+GZIP_MAGIC = b'\x1f\x8b'
+XZ_MAGIC = b'\xfd7zXZ\x00'
+# index of a trace split into shards (generator.py), one shard file per line, relative to the index
+SHARD_INDEX_SUFFIX = '.shards'
+
 
 def parse_trace_file(file_path):
     """
@@ -40,6 +62,134 @@ def parse_trace_file(file_path):
     return data_point_tuple_list
 
 
+def iterate_trace_file(file_path, trace_format=AUTO):
+    """
+    Lazily parses trace file, reading one line at a time, so the whole trace is never kept in memory.
+    gzip and xz compressed files are decompressed on the fly, shards listed in shard index are read one by one.
+    :param file_path: a string representing the relative file path to our trace in the filesystem
+    :param trace_format: one of TRACE_FORMATS, detected from the first lines by default
+    :return: a generator of tuples: (MEM, R/W) or (MEM, R/W, TIMESTAMP) for lines with a timestamp
+    """
+    if file_path.endswith(SHARD_INDEX_SUFFIX):
+        for shard_file in read_shard_index(file_path):
+            yield from iterate_trace_file(shard_file, trace_format)
+        return
+    with open(file_path, "rb", buffering=READ_BUFFER_SIZE) as raw, open_trace_file(raw) as f:
+        yield from iterate_trace_lines(f, trace_format)
+
+
+def read_shard_index(file_path):
+    """
+    :param file_path: path to shard index
+    :return: list of paths to shard files in trace order
+    """
+    directory = os.path.dirname(file_path)
+    with open(file_path, "r") as f:
+        return [os.path.join(directory, line.strip()) for line in f if line.strip()]
+
+
+def open_trace_file(raw):
+    """
+    Wraps (possibly compressed) trace file for reading text, compression is recognized by magic bytes.
+    The magic bytes are only peeked, so named pipes and stdin are read from their first byte.
+    :param raw: trace file opened for reading bytes (buffered)
+    :return: text file reading the same file
+    """
+    magic = raw.peek(len(XZ_MAGIC))[:len(XZ_MAGIC)]
+    if magic.startswith(GZIP_MAGIC):
+        return io.TextIOWrapper(gzip.GzipFile(fileobj=raw), newline="\n")
+    if magic.startswith(XZ_MAGIC):
+        return io.TextIOWrapper(lzma.LZMAFile(raw), newline="\n")
+    return io.TextIOWrapper(raw, newline="\n")
+
+
+def iterate_trace_lines(lines, trace_format=AUTO):
+    """
+    Parses lines of a trace in given format.
+    :param lines: iterable of text lines
+    :param trace_format: one of TRACE_FORMATS
+    :return: a generator of tuples: (MEM, R/W) or (MEM, R/W, TIMESTAMP)
+    """
+    if trace_format == AUTO:
+        lines = iter(lines)
+        head = list(itertools.islice(lines, FORMAT_DETECTION_LINES))
+        trace_format = detect_format(head)
+        lines = itertools.chain(head, lines)
+
+    if trace_format == LACKEY:
+        return iterate_lackey_lines(lines)
+    if trace_format == ADDRESSES:
+        return iterate_address_lines(lines)
+    if trace_format == SYNTHETIC:
+        return iterate_synthetic_lines(lines)
+    raise ValueError("Unknown trace format: " + trace_format)
+
+
+def detect_format(lines):
+    """
+    :param lines: first lines of a trace
+    :return: SYNTHETIC for `<MEM> R|W` lines, LACKEY for Valgrind lackey output, ADDRESSES otherwise
+    """
+    for line in lines:
+        fields = line.split()
+        if not fields or line.startswith('=='):
+            continue
+        if fields[0] in LACKEY_RECORDS and len(fields) == 2 and ',' in fields[1]:
+            return LACKEY
+        if len(fields) >= 2 and fields[1] in ('R', 'W'):
+            return SYNTHETIC
+        return ADDRESSES
+    return SYNTHETIC
+
+
+def iterate_synthetic_lines(lines):
+    """
+    :param lines: lines `<MEM> R|W [TIMESTAMP]` (format of generator.py)
+    :return: a generator of tuples: (MEM, R/W) or (MEM, R/W, TIMESTAMP)
+    """
+    for line in lines:
+        fields = line.split()
+        if fields:
+            yield tuple(fields)
+
+
+def iterate_lackey_lines(lines):
+    """
+    Parses output of `valgrind --tool=lackey --trace-mem=yes`:
+    `I  <MEM>,<size>` instruction fetch and ` L <MEM>,<size>` load are reads, ` S <MEM>,<size>` store is a write,
+    ` M <MEM>,<size>` modify (load and store of the same address) is a single write.
+    Valgrind messages (`==<pid>== ...`) are skipped.
+    :param lines: lackey output lines
+    :return: a generator of tuples (MEM, R/W)
+    """
+    for line in lines:
+        fields = line.split()
+        if len(fields) != 2:
+            continue
+        access_type = LACKEY_RECORDS.get(fields[0])
+        if access_type is not None:
+            yield fields[1].partition(',')[0], access_type
+
+
+def iterate_address_lines(lines):
+    """
+    Parses files with one hex address (optionally with 0x prefix and R/W column) per line, missing R/W means read.
+    Lines starting with # are comments.
+    :param lines: address lines
+    :return: a generator of tuples (MEM, R/W)
+    :raises ValueError: if R/W column of a line is neither R nor W (case insensitive)
+    """
+    for line in lines:
+        fields = line.split()
+        if not fields or fields[0].startswith('#'):
+            continue
+        address = fields[0][2:] if fields[0][:2] in ('0x', '0X') else fields[0]
+        read_or_write = fields[1].upper() if len(fields) > 1 else 'R'
+        if read_or_write not in ('R', 'W'):
+            raise ValueError("Access type should be R or W: " + line.strip())
+        yield address, read_or_write
+
+
 def hex_string_to_binary_int(hex_string):
     hex_string_to_decimal_int = int(hex_string, 16)
     binary_int = bin(hex_string_to_decimal_int)
@@ -0,0 +1,98 @@
+"""
+Divergence of bounded-lookahead OPT from full OPT
+
+Runs bounded-lookahead OPT for growing lookahead windows and compares its page faults and writes
+with full OPT (lookahead covering the whole trace). Trace file is read lazily, so every bounded run keeps
+only O(lookahead + frames) accesses in memory.
+
+Usage:  python lookahead_divergence.py --numframes <numframes> --tracefile <tracefile> [--lookaheads <w1,w2,...>]
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+
+import algorithms.lookahead_opt as lookahead_opt
+import input_parser as iparser
+import page_table as pt
+import vmsim
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_LOOKAHEADS = (1, 10, 100, 1000, 10000)
+
+
+def run_lookahead_opt(trace_file: str, num_frames: int, lookahead: int) -> tuple:
+    """
+    :param trace_file: path to trace file
+    :param num_frames: number of frames in RAM
+    :param lookahead: lookahead window [accesses]
+    :return: tuple (page faults, writes to disk)
+    """
+    page_table = pt.PageTable(num_frames)
+    alg = lookahead_opt.LookaheadOpt(page_table, iparser.iterate_trace_file(trace_file), lookahead)
+    alg.run_algorithm()
+    return page_table.page_faults, page_table.writes_to_disk
+
+
+def divergence(trace_file: str, num_frames: int, lookaheads) -> list:
+    """
+    Compares bounded-lookahead OPT with full OPT.
+    :param trace_file: path to trace file
+    :param num_frames: number of frames in RAM
+    :param lookaheads: lookahead windows to compare
+    :return: list of tuples (lookahead, page faults, writes, full OPT page faults, full OPT writes,
+             extra page faults, extra page faults [%])
+    """
+    # counted in a streaming pass, full OPT is bounded-lookahead OPT with lookahead covering the whole trace
+    trace_length = sum(1 for _ in iparser.iterate_trace_file(trace_file))
+    opt_faults, opt_writes = run_lookahead_opt(trace_file, num_frames, trace_length)
+
+    results = []
+    for lookahead in lookaheads:
+        page_faults, writes = run_lookahead_opt(trace_file, num_frames, lookahead)
+        extra_faults = page_faults - opt_faults
+        extra_faults_percent = round(100 * extra_faults / opt_faults, 2) if opt_faults else 0
+        results.append((lookahead, page_faults, writes, opt_faults, opt_writes, extra_faults, extra_faults_percent))
+        LOG.info("Lookahead %s: %s page faults (%s%% more than OPT)", lookahead, page_faults, extra_faults_percent)
+    return results
+
+
+def serialize_results(results, output_file: str):
+    """
+    Writes divergence results to CSV file.
+    :param results: an array of divergence tuples
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(('lookahead', 'page_faults', 'writes', 'opt_page_faults', 'opt_writes',
+                         'extra_page_faults', 'extra_page_faults_percent'))
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--numframes", default=3, help="numframes")
+    parser.add_argument("--tracefile", required=True, help="tracefile: <tracefile>")
+    parser.add_argument("--lookaheads", help="comma separated lookahead windows, e.g. 10,100,1000")
+    args = parser.parse_args()
+
+    LOG.info("Parsed args: %s", vars(args))
+
+    num_frames = int(args.numframes)
+    lookaheads = [int(elem) for elem in args.lookaheads.split(',')] if args.lookaheads else DEFAULT_LOOKAHEADS
+
+    if not os.path.isfile(args.tracefile):
+        LOG.error("Trace file '%s' doesn't exist. Terminating.", args.tracefile)
+        sys.exit(0)
+
+    results = divergence(args.tracefile, num_frames, lookaheads)
+
+    output_file = os.path.splitext(vmsim.create_results_dir(args.tracefile, num_frames))[0] + '_lookahead.csv'
+    serialize_results(results, output_file)
+
+
+if __name__ == "__main__":
+    main()
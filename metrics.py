@@ -0,0 +1,85 @@
+"""
+Windowed time-series metrics
+
+Every `window` accesses a line with statistics of the last window is appended to a line-delimited JSON file:
+- fault_rate – page faults per access,
+- dirty_write_rate – writes to disk per access,
+- resident_pages – number of frames holding a page at the end of the window,
+- swap_daemon_runs – Clock swap daemon invocations during the window (null for other algorithms).
+Lines are flushed as soon as they are written, so the file can be followed while the simulation runs.
+"""
+import json
+
+
+class WindowedMetrics:
+    """
+    Collects statistics of an algorithm run in windows of fixed number of accesses.
+    """
+
+    def __init__(self, output, window: int, alg_name: str):
+        """
+        :param output: opened text file, lines are appended to it
+        :param window: number of accesses in one window
+        :param alg_name: algorithm name written in every line
+        """
+        self.output = output
+        self.window: int = window
+        self.alg_name: str = alg_name
+        self.alg = None
+
+        # counters at the start of current window
+        self.accesses: int = 0
+        self.window_start: int = 0
+        self.page_faults: int = 0
+        self.writes: int = 0
+        self.swap_daemon_runs: int = 0
+
+    def attach(self, alg):
+        """
+        Collects statistics after every access processed by algorithm's step.
+        :param alg: algorithm instance
+        :return: algorithm instance
+        """
+        self.alg = alg
+        step = alg.step
+
+        def step_with_metrics(next_address):
+            step(next_address)
+            self.accesses += 1
+            if self.accesses - self.window_start == self.window:
+                self.write_window()
+
+        alg.step = step_with_metrics
+        return alg
+
+    def write_window(self):
+        """
+        Writes statistics of the current window and starts a new one.
+        """
+        page_table = self.alg.page_table
+        accesses = self.accesses - self.window_start
+        swap_daemon_runs = getattr(self.alg, 'swap_daemon_runs', None)
+
+        line = {
+            'alg': self.alg_name,
+            'start': self.window_start,
+            'accesses': accesses,
+            'fault_rate': (page_table.page_faults - self.page_faults) / accesses,
+            'dirty_write_rate': (page_table.writes_to_disk - self.writes) / accesses,
+            'resident_pages': page_table.resident_pages(),
+            'swap_daemon_runs': None if swap_daemon_runs is None else swap_daemon_runs - self.swap_daemon_runs,
+        }
+        self.output.write(json.dumps(line) + '\n')
+        self.output.flush()
+
+        self.window_start = self.accesses
+        self.page_faults = page_table.page_faults
+        self.writes = page_table.writes_to_disk
+        self.swap_daemon_runs = swap_daemon_runs or 0
+
+    def close(self):
+        """
+        Writes the last (partial) window.
+        """
+        if self.accesses > self.window_start:
+            self.write_window()
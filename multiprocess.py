@@ -0,0 +1,299 @@
+"""
+Multi-process workload simulation for Page Replacement Algorithms
+
+Interleaves several trace files (one per process) into a single stream of memory accesses and runs
+the algorithms on it. VPNs are tagged with process id, so processes never share pages.
+- global replacement: all processes compete for all frames of one physical page table,
+- local replacement: each process gets its own partition of frames.
+Trace files are merged lazily (streaming k-way merge), they are never loaded into memory as a whole.
+
+Usage:  python multiprocess.py --numframes <numframes> --tracefiles <tracefile> [<tracefile> ...]
+            [--schedule round-robin|proportional|timestamped] [--weights <w1,w2,...>] [--quantum <quantum>]
+            [--replacement global|local] [--partitions <f1,f2,...>] [--refresh <refresh>] [--seed <seed>]
+            [--format auto|synthetic|lackey|addresses]
+"""
+import argparse
+import collections
+import csv
+import datetime
+import heapq
+import logging
+import os
+import sys
+
+import algorithms.opt as opt
+import input_parser as iparser
+import page_table as pt
+import result_tuple as rt
+import vmsim
+
+LOG = logging.getLogger(__name__)
+
+ROUND_ROBIN = 'round-robin'
+PROPORTIONAL = 'proportional'
+TIMESTAMPED = 'timestamped'
+SCHEDULES = (ROUND_ROBIN, PROPORTIONAL, TIMESTAMPED)
+
+GLOBAL = 'global'
+LOCAL = 'local'
+REPLACEMENTS = (GLOBAL, LOCAL)
+
+# OPT needs the whole future of the trace, which is not available when traces are merged lazily
+ALGORITHMS = tuple(algorithm for algorithm in vmsim.ALGORITHMS if algorithm != opt.Opt)
+
+# stride of a process with weight 1 in proportional (stride) scheduling
+STRIDE = 1 << 20
+
+
+def round_robin(traces: list, quantum: int = 1):
+    """
+    Takes `quantum` accesses from every process in turn, until all traces are exhausted.
+    :param traces: list of iterators of memory accesses, one per process
+    :param quantum: number of consecutive accesses of one process
+    :return: generator of tuples (pid, memory access)
+    """
+    active = collections.deque(enumerate(traces))
+    while active:
+        pid, trace = active.popleft()
+        for _ in range(quantum):
+            access = next(trace, None)
+            if access is None:
+                break
+            yield pid, access
+        else:
+            active.append((pid, trace))
+
+
+def proportional(traces: list, weights: list):
+    """
+    Stride scheduling: every process gets accesses proportionally to its weight, until its trace is exhausted.
+    Ties are broken by process id, so the schedule is deterministic.
+    :param traces: list of iterators of memory accesses, one per process
+    :param weights: list of positive integer weights, one per process
+    :return: generator of tuples (pid, memory access)
+    """
+    strides = [STRIDE // weight for weight in weights]
+    heap = [(strides[pid], pid) for pid in range(len(traces))]
+    heapq.heapify(heap)
+    while heap:
+        pass_value, pid = heap[0]
+        access = next(traces[pid], None)
+        if access is None:
+            heapq.heappop(heap)
+            continue
+        heapq.heapreplace(heap, (pass_value + strides[pid], pid))
+        yield pid, access
+
+
+def timestamped(traces: list):
+    """
+    Merges accesses of all processes by their timestamp (third column of trace line).
+    Accesses without timestamp are stamped with their index in the trace.
+    Every trace has to be sorted by timestamp.
+    :param traces: list of iterators of memory accesses, one per process
+    :return: generator of tuples (pid, memory access)
+    """
+    def stamp(pid, trace):
+        for index, access in enumerate(trace):
+            timestamp = float(access[2]) if len(access) > 2 else index
+            yield timestamp, pid, access
+
+    for _, pid, access in heapq.merge(*(stamp(pid, trace) for pid, trace in enumerate(traces))):
+        yield pid, access
+
+
+def schedule_accesses(schedule: str, traces: list, weights: list = None, quantum: int = 1):
+    """
+    Interleaves traces of all processes according to schedule.
+    :param schedule: one of SCHEDULES
+    :param traces: list of iterators of memory accesses, one per process
+    :param weights: process weights (proportional schedule only)
+    :param quantum: number of consecutive accesses of one process (round-robin schedule only)
+    :return: generator of tuples (pid, memory access)
+    """
+    if schedule == ROUND_ROBIN:
+        return round_robin(traces, quantum)
+    if schedule == PROPORTIONAL:
+        return proportional(traces, weights if weights else [1] * len(traces))
+    if schedule == TIMESTAMPED:
+        return timestamped(traces)
+    raise ValueError("Unknown schedule: " + schedule)
+
+
+def split_frames(num_frames: int, num_processes: int) -> list:
+    """
+    Splits frames equally between processes, the remainder goes to the first processes.
+    :param num_frames: total number of frames
+    :param num_processes: number of processes
+    :return: list of partition sizes
+    """
+    return [num_frames // num_processes + (1 if pid < num_frames % num_processes else 0)
+            for pid in range(num_processes)]
+
+
+def simulate_global(algorithm, accesses, num_processes: int, num_frames: int, refresh: int, seed: int) -> tuple:
+    """
+    Runs algorithm with global replacement: all processes share one page table.
+    Faults and writes to disk are attributed to the process whose access caused them.
+    :param algorithm: algorithm class
+    :param accesses: iterable of tuples (pid, memory access)
+    :param num_processes: number of processes
+    :param num_frames: number of frames in RAM
+    :param refresh: refresh time (for aging algorithm)
+    :param seed: seed (for random algorithm)
+    :return: algorithm name and list of result tuples: one per process and aggregated one at the end
+    """
+    page_table = pt.ProcessPageTable(num_frames)
+    alg = vmsim.create_algorithm(algorithm, page_table, [], refresh, seed)
+
+    # [memory accesses, page faults, writes to disk] per process
+    stats = [[0, 0, 0] for _ in range(num_processes)]
+    for pid, access in accesses:
+        page_faults = page_table.page_faults
+        writes_to_disk = page_table.writes_to_disk
+
+        alg.step(((pid, access[0]), access[1]))
+
+        process_stats = stats[pid]
+        process_stats[0] += 1
+        process_stats[1] += page_table.page_faults - page_faults
+        process_stats[2] += page_table.writes_to_disk - writes_to_disk
+
+    alg.print_results()
+    refresh_rate = vmsim.get_refresh_rate(alg)
+    results = [rt.ResultTuple(num_frames, accesses_count, page_faults, writes, refresh_rate)
+               for accesses_count, page_faults, writes in stats]
+    results.append(rt.ResultTuple(num_frames, page_table.total_memory_accesses, page_table.page_faults,
+                                  page_table.writes_to_disk, refresh_rate))
+    return alg.__str__(), results
+
+
+def simulate_local(algorithm, accesses, partitions: list, refresh: int, seed: int) -> tuple:
+    """
+    Runs algorithm with local replacement: every process replaces pages only within its own partition of frames.
+    :param algorithm: algorithm class
+    :param accesses: iterable of tuples (pid, memory access)
+    :param partitions: number of frames of every process
+    :param refresh: refresh time (for aging algorithm)
+    :param seed: seed (for random algorithm)
+    :return: algorithm name and list of result tuples: one per process and aggregated one at the end
+    """
+    page_tables = [pt.PageTable(frames) for frames in partitions]
+    algs = [vmsim.create_algorithm(algorithm, page_table, [], refresh, seed) for page_table in page_tables]
+
+    for pid, access in accesses:
+        algs[pid].step(access)
+
+    for alg in algs:
+        alg.print_results()
+    refresh_rate = vmsim.get_refresh_rate(algs[0])
+    results = [rt.ResultTuple(page_table.num_frames, page_table.total_memory_accesses, page_table.page_faults,
+                              page_table.writes_to_disk, refresh_rate) for page_table in page_tables]
+    results.append(rt.ResultTuple(sum(partitions),
+                                  sum(page_table.total_memory_accesses for page_table in page_tables),
+                                  sum(page_table.page_faults for page_table in page_tables),
+                                  sum(page_table.writes_to_disk for page_table in page_tables),
+                                  refresh_rate))
+    return algs[0].__str__(), results
+
+
+def serialize_results(results, output_file: str):
+    """
+    Writes algorithm results to CSV file.
+    :param results: an array of result tuples extended with replacement, schedule and process
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(
+            ('alg', 'trace_file', 'frames', 'total_mem_access', 'page_faults', 'writes', 'refresh', 'total_time',
+             'replacement', 'schedule', 'process'))
+        writer.writerows(results)
+
+
+def create_results_dir(num_frames: int, replacement: str, schedule: str) -> str:
+    """
+    Creates (if doesn't exist) and returns path to write results.
+    :param num_frames: number of frames that were used to perform algorithm
+    :param replacement: global or local replacement
+    :param schedule: schedule used to interleave traces
+    :return: output file path to write results
+    """
+    output_path: str = vmsim.RESULT_DIR + 'multiprocess/'
+    if not os.path.exists(output_path):
+        os.makedirs(output_path)
+    return output_path + '{}_frames_{}_{}.csv'.format(num_frames, replacement, schedule)
+
+
+def parse_int_list(value: str) -> list:
+    """
+    :param value: comma separated integers, e.g. "1,2,3"
+    :return: list of integers or None if value is empty
+    """
+    return [int(elem) for elem in value.split(',')] if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--numframes", default=3, help="numframes")
+    parser.add_argument("--refresh", default=5, help="refresh time [ms] (for aging alg): <refresh>")
+    parser.add_argument("--seed", default=0, help="seed (for random alg): <seed>")
+    parser.add_argument("--tracefiles", nargs='+', required=True, help="one trace file per process")
+    parser.add_argument("--schedule", default=ROUND_ROBIN, choices=SCHEDULES, help="how traces are interleaved")
+    parser.add_argument("--weights", help="comma separated process weights (for proportional schedule)")
+    parser.add_argument("--quantum", default=1, help="consecutive accesses of a process (for round-robin schedule)")
+    parser.add_argument("--replacement", default=GLOBAL, choices=REPLACEMENTS, help="global or local replacement")
+    parser.add_argument("--partitions", help="comma separated frames per process (for local replacement)")
+    parser.add_argument("--format", default=iparser.AUTO, choices=iparser.TRACE_FORMATS, help="trace format")
+    args = parser.parse_args()
+
+    LOG.info("Parsed args: %s", vars(args))
+
+    num_frames = int(args.numframes)
+    refresh = int(args.refresh)
+    seed = int(args.seed)
+    trace_files = args.tracefiles
+    weights = parse_int_list(args.weights)
+    partitions = parse_int_list(args.partitions) or split_frames(num_frames, len(trace_files))
+
+    for trace_file in trace_files:
+        if not os.path.isfile(trace_file):
+            LOG.error("Trace file '%s' doesn't exist. Terminating.", trace_file)
+            sys.exit(0)
+    if weights and (len(weights) != len(trace_files) or min(weights) < 1):
+        LOG.error("There should be one positive weight per trace file. Terminating.")
+        sys.exit(0)
+    if args.replacement == LOCAL and (len(partitions) != len(trace_files) or sum(partitions) > num_frames
+                                      or min(partitions) < 1):
+        LOG.error("Partitions should give at least one frame per trace file and fit in %s frames. Terminating.",
+                  num_frames)
+        sys.exit(0)
+
+    trace_names = [os.path.basename(trace_file) for trace_file in trace_files]
+    results = []
+
+    for algorithm in ALGORITHMS:
+        traces = [iparser.iterate_trace_file(trace_file, args.format) for trace_file in trace_files]
+        accesses = schedule_accesses(args.schedule, traces, weights, int(args.quantum))
+
+        t_0 = datetime.datetime.now()
+        if args.replacement == GLOBAL:
+            alg_name, result_tuples = simulate_global(algorithm, accesses, len(trace_files), num_frames, refresh, seed)
+        else:
+            alg_name, result_tuples = simulate_local(algorithm, accesses, partitions, refresh, seed)
+        t_1 = datetime.datetime.now()
+        total_time = (t_1 - t_0).total_seconds() * 1000
+
+        for pid, result_tuple in enumerate(result_tuples[:-1]):
+            results.append(result_tuple.get_result(alg_name, trace_names[pid], 'N/A')
+                           + (args.replacement, args.schedule, pid))
+        results.append(result_tuples[-1].get_result(alg_name, '+'.join(trace_names), total_time)
+                       + (args.replacement, args.schedule, 'all'))
+        LOG.info("TOTAL %s TIME: %s ms", alg_name, str(total_time))
+
+    output_file = create_results_dir(num_frames, args.replacement, args.schedule)
+    serialize_results(results, output_file)
+
+
+if __name__ == "__main__":
+    main()
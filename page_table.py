@@ -5,10 +5,18 @@
 # This means there are 2^12 bits, or bottom 12 bits of the addresses reserved for
 # intra-page addressing. The rest determine if we are using a page that's already in use
 # So we're looking at the first 20 bits to see if we've got a match.
+#
+# Other page sizes and address widths are supported by decoding the whole trace up front (decode_trace)
+# and running the algorithms on DecodedPageTable.
 
 import circular_queue as cq
 from algorithms.aging import Aging
 
+PAGE_SIZES = {'4K': 1 << 12, '16K': 1 << 14, '64K': 1 << 16, '2M': 1 << 21}
+DEFAULT_PAGE_SIZE = PAGE_SIZES['4K']
+ADDRESS_BITS = (32, 64)
+DEFAULT_ADDRESS_BITS = 32
+
 
 class PageTable:
 
@@ -32,8 +40,38 @@ class PageTable:
         # dictionary enhancing OPT algorithm mapping VPN to PPN
         self.fast_index = dict()
 
+        # KEY = VPN of resident page, VALUE = frame holding it (in frame table or in clock frame queue),
+        # kept by algorithms through map_page and unmap_page
+        self.resident = dict()
+
         # used in clock algorithm
-        self.frame_queue = cq.CircularQueue(self.num_frames)
+        self.frame_queue = cq.CircularQueue(self.num_frames, self)
+
+    def map_page(self, frame, vpn):
+        """
+        Loads page into frame.
+        :param frame: free frame (in frame table or in clock frame queue)
+        :param vpn: virtual page number
+        """
+        frame.in_use = True
+        frame.vpn = vpn
+        self.resident[vpn] = frame
+
+    def unmap_page(self, frame):
+        """
+        Releases frame of evicted page, other bits of the frame are reset by the algorithm.
+        :param frame: frame holding the evicted page (LRU may also release a free frame)
+        """
+        if frame.in_use:
+            del self.resident[frame.vpn]
+        frame.in_use = False
+        frame.vpn = None
+
+    def resident_pages(self):
+        """
+        :return: number of frames holding a page (in frame table or in clock frame queue)
+        """
+        return len(self.resident)
 
     @staticmethod
     def get_vpn(memory_address):
@@ -49,6 +87,85 @@ class PageTable:
         return vpn_value >> 12
 
 
+class ProcessPageTable(PageTable):
+    """
+    Physical page table shared by many processes.
+    Memory addresses are tagged with process id: (pid, memory address),
+    so the same virtual page of two processes is mapped to two different (pid, VPN) pages.
+    """
+
+    def get_vpn(self, memory_address):
+        """
+        Computes process-tagged Virtual Page Number from given tagged memory address
+        :param memory_address: tuple (pid, memory address)
+        :return: tuple (pid, VPN)
+        """
+        pid, address = memory_address
+        return pid, super().get_vpn(address)
+
+
+class DecodedPageTable(PageTable):
+    """
+    Page table for traces decoded up front by decode_trace: memory addresses already are VPNs,
+    so algorithms don't pay for address decoding on every access.
+    """
+
+    def get_vpn(self, memory_address):
+        """
+        :param memory_address: VPN decoded by decode_trace
+        :return: the same VPN
+        """
+        return memory_address
+
+
+def get_vpn_layout(page_size: int, address_bits: int) -> tuple:
+    """
+    :param page_size: page size [B], power of 2
+    :param address_bits: width of virtual address, higher bits of addresses are ignored
+    :return: tuple (mask of VPN bits, number of page offset bits)
+    """
+    return ((1 << address_bits) - 1) & ~(page_size - 1), page_size.bit_length() - 1
+
+
+def get_vpn_decoder(page_size: int = DEFAULT_PAGE_SIZE, address_bits: int = DEFAULT_ADDRESS_BITS):
+    """
+    :param page_size: page size [B], power of 2
+    :param address_bits: width of virtual address
+    :return: function computing VPN from hex memory address
+    """
+    vpn_mask, offset_bits = get_vpn_layout(page_size, address_bits)
+
+    def decode(memory_address):
+        return (int(memory_address, 16) & vpn_mask) >> offset_bits
+
+    return decode
+
+
+def decode_trace(trace: list, page_size: int = DEFAULT_PAGE_SIZE, address_bits: int = DEFAULT_ADDRESS_BITS) -> list:
+    """
+    Decodes memory addresses of the whole trace into VPNs in one pass.
+    :param trace: list of tuples (MEM, R/W)
+    :param page_size: page size [B], power of 2
+    :param address_bits: width of virtual address
+    :return: list of tuples (VPN, R/W), to be run on DecodedPageTable
+    """
+    vpn_mask, offset_bits = get_vpn_layout(page_size, address_bits)
+    return [((int(access[0], 16) & vpn_mask) >> offset_bits, access[1]) for access in trace]
+
+
+def iterate_decoded(accesses, page_size: int = DEFAULT_PAGE_SIZE, address_bits: int = DEFAULT_ADDRESS_BITS):
+    """
+    Decodes memory addresses of a stream into VPNs, each access once.
+    :param accesses: iterable of tuples (MEM, R/W)
+    :param page_size: page size [B], power of 2
+    :param address_bits: width of virtual address
+    :return: a generator of tuples (VPN, R/W), to be run on DecodedPageTable
+    """
+    vpn_mask, offset_bits = get_vpn_layout(page_size, address_bits)
+    for access in accesses:
+        yield (int(access[0], 16) & vpn_mask) >> offset_bits, access[1]
+
+
 class Frame:
     def __init__(self):
         # virtual page number
@@ -68,6 +185,10 @@ class Frame:
         self.aging_value = 0
         # last reference used by LRU algorithm
         self.last_reference = 0
+        # virtual time of last use used by WSClock algorithm
+        self.last_use = 0
+        # write to disk scheduled and not done yet used by WSClock algorithm
+        self.write_pending = False
 
     def __repr__(self):
         return "vpn:\t{}\tppn:\t{}\tdirty:\t{}\tin_use:\t{}\tinstr_until_next_ref:\t{}\treference:\t{}\taging_value:\t{}\tlast_reference\t{}\t".format(
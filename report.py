@@ -0,0 +1,258 @@
+"""
+Chart report
+
+Renders page faults, writes and time charts (grouped bars: frames on x axis, one bar per algorithm) for every trace
+from the results store or the `results/` CSV tree. Charts are written as SVG by hand, no plotting library is needed.
+The `refresh` column holds the parameter of the algorithm (Aging refresh, WSClock window, OPT lookahead), so
+a trace with such results gets charts of every refresh value; algorithms without it are shown in all of them.
+Every chart remembers a hash of the data it was rendered from (`charts.json` in the output directory),
+charts whose data didn't change are not rendered again. The CSV tree is copied into `report.db` in the results
+directory, only files changed since the last report are imported again.
+
+Usage:  python report.py [--db <results.db> | --results <results dir>] [--output <charts dir>]
+            [--algorithms <alg,...>] [--refresh <refresh,...>] [--force]
+"""
+import argparse
+import hashlib
+import html
+import json
+import logging
+import math
+import os
+import sys
+
+import results_store
+
+LOG = logging.getLogger(__name__)
+
+# vmsim.RESULT_DIR, vmsim isn't imported to keep the report light
+DEFAULT_RESULTS_DIR = 'results/'
+DEFAULT_OUTPUT_DIR = DEFAULT_RESULTS_DIR + 'charts/'
+# copy of the CSV tree, kept in the results directory
+REPORT_DB = 'report.db'
+MANIFEST_FILE = 'charts.json'
+# bump to render all charts again when their look changes
+RENDERER_VERSION = 1
+
+# KEY = chart name (file suffix), VALUE = (results column, y axis label)
+CHARTS = {'faults': ('page_faults', 'Page faults'), 'writes': ('writes', 'Writes'), 'time': ('total_time', 'Time [ms]')}
+
+COLORS = ('#4472c4', '#ed7d31', '#a5a5a5', '#ffc000', '#5b9bd5', '#70ad47', '#264478', '#9e480e', '#636363',
+          '#997300', '#255e91')
+WIDTH = 800
+HEIGHT = 450
+# plot margins: left, right, top, bottom
+MARGINS = (70, 20, 50, 80)
+TICKS = 5
+LEGEND_ITEM_WIDTH = 90
+# algorithms in the order vmsim runs them (vmsim.ALGORITHM_NAMES)
+ALGORITHM_ORDER = ('Clock', 'LRU', 'Aging', 'Opt', 'ClockPro', 'LIRS', 'WSClock', 'LFU', 'FIFO', 'RandomReplacement')
+
+
+def get_algorithm_order(algorithm: str) -> tuple:
+    """
+    Sorts algorithms as vmsim runs them, unknown ones at the end.
+    """
+    if algorithm in ALGORITHM_ORDER:
+        return ALGORITHM_ORDER.index(algorithm), ''
+    return len(ALGORITHM_ORDER), str(algorithm)
+
+
+def get_tick_step(max_value: float) -> float:
+    """
+    :param max_value: the highest value on the axis
+    :return: step of about TICKS ticks, 1, 2 or 5 times a power of 10
+    """
+    if max_value <= 0:
+        return 1
+    magnitude = 10 ** math.floor(math.log10(max_value / TICKS))
+    for multiple in (1, 2, 5, 10):
+        if max_value / (multiple * magnitude) <= TICKS:
+            return multiple * magnitude
+    return 10 * magnitude
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else '{:.2f}'.format(value)
+
+
+def render_chart(title: str, y_label: str, algorithms: list, rows: list) -> str:
+    """
+    :param title: chart title
+    :param y_label: y axis label
+    :param algorithms: names of bars in every group
+    :param rows: list of groups: frames followed by value of every algorithm (None if missing)
+    :return: SVG document
+    """
+    left, right, top, bottom = MARGINS
+    plot_width = WIDTH - left - right
+    plot_height = HEIGHT - top - bottom
+    peak = max((value for row in rows for value in row[1:] if value is not None), default=0)
+    step = get_tick_step(peak)
+    max_value = step * max(1, math.ceil(peak / step))
+
+    def y(value: float) -> float:
+        return top + plot_height - value / max_value * plot_height
+
+    svg = ['<svg xmlns="http://www.w3.org/2000/svg" width="{0}" height="{1}" viewBox="0 0 {0} {1}" '
+           'font-family="sans-serif" font-size="11">'.format(WIDTH, HEIGHT),
+           '<rect width="{}" height="{}" fill="white"/>'.format(WIDTH, HEIGHT),
+           '<text x="{}" y="30" font-size="18" text-anchor="middle">{}</text>'.format(WIDTH / 2, html.escape(title))]
+    for tick in range(int(round(max_value / step)) + 1):
+        tick_y = y(tick * step)
+        svg.append('<line x1="{}" y1="{:.1f}" x2="{}" y2="{:.1f}" stroke="#d9d9d9"/>'.format(
+            left, tick_y, WIDTH - right, tick_y))
+        svg.append('<text x="{}" y="{:.1f}" text-anchor="end">{}</text>'.format(
+            left - 6, tick_y + 4, format_value(tick * step)))
+    svg.append('<text transform="translate(16 {:.1f}) rotate(-90)" text-anchor="middle">{}</text>'.format(
+        top + plot_height / 2, html.escape(y_label)))
+
+    group_width = plot_width / max(1, len(rows))
+    bar_width = group_width * 0.8 / max(1, len(algorithms))
+    for group, row in enumerate(rows):
+        group_x = left + group * group_width
+        svg.append('<text x="{:.1f}" y="{}" text-anchor="middle">{}</text>'.format(
+            group_x + group_width / 2, top + plot_height + 16, html.escape(format_value(row[0]))))
+        for index, value in enumerate(row[1:]):
+            if value is None:
+                continue
+            bar_x = group_x + group_width * 0.1 + index * bar_width
+            svg.append('<rect x="{:.1f}" y="{:.1f}" width="{:.1f}" height="{:.1f}" fill="{}"><title>{}: {}</title>'
+                       '</rect>'.format(bar_x, y(value), bar_width * 0.9, top + plot_height - y(value),
+                                        COLORS[index % len(COLORS)], html.escape(algorithms[index]),
+                                        format_value(value)))
+            svg.append('<text x="{:.1f}" y="{:.1f}" font-size="9" text-anchor="middle">{}</text>'.format(
+                bar_x + bar_width * 0.45, y(value) - 3, format_value(value)))
+    svg.append('<text x="{}" y="{}" text-anchor="middle">Frames</text>'.format(
+        left + plot_width / 2, top + plot_height + 36))
+
+    # legend rows centered under the plot
+    per_row = max(1, plot_width // LEGEND_ITEM_WIDTH)
+    for index, algorithm in enumerate(algorithms):
+        row_items = min(per_row, len(algorithms) - index // per_row * per_row)
+        item_x = left + (plot_width - row_items * LEGEND_ITEM_WIDTH) / 2 + index % per_row * LEGEND_ITEM_WIDTH
+        item_y = top + plot_height + 50 + index // per_row * 16
+        svg.append('<rect x="{:.1f}" y="{}" width="10" height="10" fill="{}"/>'.format(
+            item_x, item_y - 9, COLORS[index % len(COLORS)]))
+        svg.append('<text x="{:.1f}" y="{}">{}</text>'.format(item_x + 14, item_y, html.escape(algorithm)))
+    svg.append('</svg>')
+    return '\n'.join(svg) + '\n'
+
+
+def get_chart_file(trace_file: str, chart: str, refresh: int = None) -> str:
+    """
+    :return: chart file name, e.g. `100000_faults.svg` for `100000.trace`, `100000_refresh5_faults.svg`
+             for refresh 5
+    """
+    if refresh is None:
+        return '{}_{}.svg'.format(os.path.splitext(trace_file)[0], chart)
+    return '{}_refresh{}_{}.svg'.format(os.path.splitext(trace_file)[0], refresh, chart)
+
+
+def get_input_hash(algorithms: list, rows: list) -> str:
+    """
+    :return: hash of chart data
+    """
+    return hashlib.sha256(json.dumps([RENDERER_VERSION, algorithms, rows]).encode()).hexdigest()
+
+
+def load_manifest(output_dir: str) -> dict:
+    """
+    :return: KEY = chart file name, VALUE = hash of data it was rendered from
+    """
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE)) as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifest: dict, output_dir: str):
+    temporary_file = os.path.join(output_dir, '{}.{}.tmp'.format(MANIFEST_FILE, os.getpid()))
+    with open(temporary_file, 'w') as output:
+        json.dump(manifest, output, indent=1, sort_keys=True)
+    os.replace(temporary_file, os.path.join(output_dir, MANIFEST_FILE))
+
+
+def generate_report(store: results_store.ResultsStore, output_dir: str, algorithms: list = None,
+                    force: bool = False, refreshes: list = None) -> list:
+    """
+    Renders charts of every trace and refresh value in the store, skips charts whose data didn't change.
+    Results of different refresh values are never averaged together.
+    :param store: results store
+    :param output_dir: directory of SVG files
+    :param algorithms: algorithms shown in the charts, all by default
+    :param force: render all charts
+    :param refreshes: refresh values charted, all by default
+    :return: list of rendered chart files
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    manifest = {} if force else load_manifest(output_dir)
+    filters = {'alg': algorithms} if algorithms else {}
+
+    rendered = []
+    for trace_file in store.distinct('trace_file'):
+        trace_filters = dict(filters, trace_file=[trace_file])
+        trace_refreshes = [refresh for refresh in store.distinct('refresh', trace_filters)
+                           if refresh is not None and (not refreshes or refresh in refreshes)]
+        # results without refresh value are a part of charts of every refresh value
+        groups = [(refresh, dict(trace_filters, refresh=[None, refresh])) for refresh in trace_refreshes] \
+            or [(None, dict(trace_filters, refresh=[None]))]
+        for refresh, chart_filters in groups:
+            for chart, (column, y_label) in CHARTS.items():
+                column_keys, rows = store.pivot(column, 'frames', 'alg', 'avg', chart_filters)
+                order = sorted(range(len(column_keys)), key=lambda index: get_algorithm_order(column_keys[index]))
+                chart_algorithms = [column_keys[index] for index in order]
+                chart_rows = [[row[0]] + [row[1 + index] for index in order] for row in rows if row[0] is not None]
+                if not chart_rows:
+                    continue
+
+                chart_file = get_chart_file(trace_file, chart, refresh)
+                input_hash = get_input_hash(chart_algorithms, chart_rows)
+                if manifest.get(chart_file) == input_hash and os.path.isfile(os.path.join(output_dir, chart_file)):
+                    continue
+                title = trace_file if refresh is None else '{} (refresh {})'.format(trace_file, refresh)
+                with open(os.path.join(output_dir, chart_file), 'w') as output:
+                    output.write(render_chart(title, y_label, chart_algorithms, chart_rows))
+                manifest[chart_file] = input_hash
+                rendered.append(chart_file)
+
+    write_manifest(manifest, output_dir)
+    return rendered
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", help="results database (see results_store)")
+    source.add_argument("--results", default=DEFAULT_RESULTS_DIR, help="directory with result CSV files")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR, help="output directory of SVG charts")
+    parser.add_argument("--algorithms", help="comma separated algorithms shown in the charts (all by default)")
+    parser.add_argument("--refresh", help="comma separated refresh values charted (all by default)")
+    parser.add_argument("--force", action="store_true", help="render all charts even if their data didn't change")
+    args = parser.parse_args()
+
+    if args.db and not os.path.isfile(args.db):
+        LOG.error("Results database '%s' doesn't exist. Terminating.", args.db)
+        sys.exit(0)
+    if not args.db and not os.path.isdir(args.results):
+        LOG.error("Results directory '%s' doesn't exist. Terminating.", args.results)
+        sys.exit(0)
+
+    # CSV files are copied into a store, so both sources are queried the same way (unchanged files aren't read)
+    refreshes = [int(elem) for elem in args.refresh.split(',')] if args.refresh else None
+    store = results_store.ResultsStore(args.db if args.db else os.path.join(args.results, REPORT_DB))
+    try:
+        if not args.db:
+            store.sync_tree(args.results)
+        rendered = generate_report(store, args.output, args.algorithms.split(',') if args.algorithms else None,
+                                   args.force, refreshes)
+    finally:
+        store.close()
+    LOG.info("Rendered %s charts: %s", len(rendered), ', '.join(rendered))
+
+
+if __name__ == "__main__":
+    main()
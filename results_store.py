@@ -0,0 +1,305 @@
+"""
+Append-only results store
+
+Results of all runs are appended to one SQLite database (`results/results.db` by default), indexed by algorithm,
+trace, frames and refresh, so aggregations over thousands of runs don't need to open thousands of CSV files.
+Rows are never updated nor deleted; `N/A` values are stored as NULL.
+
+Commands:
+- import - appends rows of result CSV files (e.g. the whole `results/` tree written by vmsim), files which
+  were already imported and haven't changed since are skipped,
+- pivot - aggregates a value column into a table, e.g. page faults (rows: frames, columns: algorithms).
+
+Usage:  python results_store.py [--db <database>] import <csv file or directory> [...]
+        python results_store.py [--db <database>] pivot [--value page_faults] [--rows frames] [--columns alg]
+            [--agg avg|min|max|sum|count] [--trace <trace_file>] [--alg <alg,...>] [--refresh <refresh>]
+            [--output <csv file>]
+"""
+import argparse
+import csv
+import datetime
+import logging
+import os
+import sqlite3
+import sys
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_DB = 'results/results.db'
+
+NOT_AVAILABLE = 'N/A'
+# columns of vmsim results (vmsim.RESULT_HEADER) with SQL type of every column
+COLUMNS = (('alg', 'TEXT'), ('trace_file', 'TEXT'), ('frames', 'INTEGER'), ('total_mem_access', 'INTEGER'),
+           ('page_faults', 'INTEGER'), ('writes', 'INTEGER'), ('refresh', 'INTEGER'), ('total_time', 'REAL'),
+           ('eat_ns', 'REAL'), ('p50_ns', 'REAL'), ('p99_ns', 'REAL'), ('tlb_hits', 'INTEGER'),
+           ('tlb_misses', 'INTEGER'))
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+AGGREGATES = ('avg', 'min', 'max', 'sum', 'count')
+
+# CSV files with partial results
+SKIPPED_SUFFIXES = ('_snapshots.csv',)
+
+
+class ResultsStore:
+    """
+    SQLite database with results table and log of imported files.
+    """
+
+    def __init__(self, db_file: str = DEFAULT_DB):
+        directory = os.path.dirname(db_file)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.connection = sqlite3.connect(db_file)
+        self.create_tables()
+
+    def create_tables(self):
+        self.connection.executescript(
+            'CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY, {}, source TEXT, recorded_at TEXT);'
+            'CREATE INDEX IF NOT EXISTS results_index ON results (alg, trace_file, frames, refresh);'
+            'CREATE TABLE IF NOT EXISTS imports (source TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);'
+            .format(', '.join('{} {}'.format(name, sql_type) for name, sql_type in COLUMNS)))
+
+    def append(self, rows, source: str = None) -> int:
+        """
+        Appends result rows.
+        :param rows: iterable of result rows, columns in order of COLUMNS (trailing columns may be missing)
+        :param source: file the rows come from
+        :return: number of appended rows
+        """
+        recorded_at = datetime.datetime.now().isoformat(timespec='seconds')
+        records = [tuple(to_sql_value(value) for value in row[:len(COLUMNS)])
+                   + (None,) * (len(COLUMNS) - len(row)) + (source, recorded_at) for row in rows]
+        with self.connection:
+            self.connection.executemany('INSERT INTO results ({}, source, recorded_at) VALUES ({})'.format(
+                ', '.join(COLUMN_NAMES), ', '.join('?' * (len(COLUMNS) + 2))), records)
+        return len(records)
+
+    def import_csv(self, csv_file: str, replace: bool = False) -> int:
+        """
+        Appends rows of result CSV file, unless the file was already imported and hasn't changed since.
+        :param csv_file: path to CSV file with vmsim results header
+        :param replace: rows previously imported from the file are deleted (see sync_tree)
+        :return: number of appended rows
+        """
+        source = os.path.abspath(csv_file)
+        file_stat = os.stat(csv_file)
+        imported = self.connection.execute('SELECT mtime_ns, size FROM imports WHERE source = ?',
+                                           (source,)).fetchone()
+        if imported == (file_stat.st_mtime_ns, file_stat.st_size):
+            return 0
+        if replace and imported:
+            with self.connection:
+                self.connection.execute('DELETE FROM results WHERE source = ?', (source,))
+
+        with open(csv_file) as results:
+            reader = csv.reader(results)
+            header = next(reader, None)
+            if not is_results_header(header):
+                return 0
+            count = self.append(reader, source)
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO imports VALUES (?, ?, ?)',
+                                    (source, file_stat.st_mtime_ns, file_stat.st_size))
+        return count
+
+    def import_tree(self, path: str) -> int:
+        """
+        :param path: CSV file or directory searched recursively for result CSV files
+        :return: number of appended rows
+        """
+        if os.path.isfile(path):
+            return self.import_csv(path)
+        count = 0
+        for directory, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                if name.endswith('.csv') and not name.endswith(SKIPPED_SUFFIXES):
+                    count += self.import_csv(os.path.join(directory, name))
+        return count
+
+    def sync_tree(self, path: str) -> int:
+        """
+        Keeps the store a copy of result CSV files of the directory, unlike append-only import: rows of changed
+        files replace their previous rows and rows of deleted files are dropped.
+        :param path: directory searched recursively for result CSV files
+        :return: number of appended rows
+        """
+        existing = set()
+        count = 0
+        for directory, _, files in sorted(os.walk(path)):
+            for name in sorted(files):
+                if name.endswith('.csv') and not name.endswith(SKIPPED_SUFFIXES):
+                    existing.add(os.path.abspath(os.path.join(directory, name)))
+                    count += self.import_csv(os.path.join(directory, name), replace=True)
+
+        prefix = os.path.join(os.path.abspath(path), '')
+        deleted = [(source,) for source, in self.connection.execute('SELECT source FROM imports')
+                   if source.startswith(prefix) and source not in existing]
+        with self.connection:
+            self.connection.executemany('DELETE FROM results WHERE source = ?', deleted)
+            self.connection.executemany('DELETE FROM imports WHERE source = ?', deleted)
+        return count
+
+    def pivot(self, value: str = 'page_faults', rows: str = 'frames', columns: str = 'alg', aggregate: str = 'avg',
+              filters: dict = None) -> tuple:
+        """
+        Aggregates value column grouped by row and column keys.
+        :param value: column to aggregate
+        :param rows: column whose values are rows of the table
+        :param columns: column whose values are columns of the table
+        :param aggregate: one of AGGREGATES
+        :param filters: KEY = column, VALUE = list of accepted values (None accepts NULL)
+        :return: tuple (column keys, list of rows: row key followed by aggregated values, None for missing ones)
+        """
+        for column in (value, rows, columns):
+            if column not in COLUMN_NAMES:
+                raise ValueError("Unknown column '{}'. Available: {}.".format(column, ', '.join(COLUMN_NAMES)))
+        if aggregate not in AGGREGATES:
+            raise ValueError("Unknown aggregate '{}'. Available: {}.".format(aggregate, ', '.join(AGGREGATES)))
+
+        where, parameters = get_where_clause(filters)
+        query = 'SELECT {rows}, {columns}, {aggregate}({value}) FROM results {where} GROUP BY 1, 2'.format(
+            rows=rows, columns=columns, aggregate=aggregate, value=value, where=where)
+
+        # KEY = (row key, column key), VALUE = aggregated value
+        cells = {(row_key, column_key): result
+                 for row_key, column_key, result in self.connection.execute(query, parameters)}
+        row_keys = sorted({key[0] for key in cells}, key=sort_key)
+        column_keys = sorted({key[1] for key in cells}, key=sort_key)
+        return column_keys, [[row_key] + [cells.get((row_key, column_key)) for column_key in column_keys]
+                             for row_key in row_keys]
+
+    def distinct(self, column: str, filters: dict = None) -> list:
+        """
+        :param column: one of COLUMN_NAMES
+        :param filters: KEY = column, VALUE = list of accepted values (None accepts NULL)
+        :return: sorted distinct values of the column
+        """
+        if column not in COLUMN_NAMES:
+            raise ValueError("Unknown column '{}'. Available: {}.".format(column, ', '.join(COLUMN_NAMES)))
+        where, parameters = get_where_clause(filters)
+        return sorted((value for value, in self.connection.execute(
+            'SELECT DISTINCT {} FROM results {}'.format(column, where), parameters)), key=sort_key)
+
+    def close(self):
+        self.connection.close()
+
+
+def get_where_clause(filters: dict = None) -> tuple:
+    """
+    :param filters: KEY = column, VALUE = list of accepted values (None accepts NULL)
+    :return: tuple (WHERE clause or empty string, list of its parameters)
+    """
+    conditions = []
+    parameters = []
+    for column, accepted in (filters or {}).items():
+        if column not in COLUMN_NAMES:
+            raise ValueError("Unknown column '{}'. Available: {}.".format(column, ', '.join(COLUMN_NAMES)))
+        values = [elem for elem in accepted if elem is not None]
+        alternatives = ['{} IN ({})'.format(column, ', '.join('?' * len(values)))]
+        if None in accepted:
+            alternatives.append('{} IS NULL'.format(column))
+        conditions.append('({})'.format(' OR '.join(alternatives)))
+        parameters += values
+    return ('WHERE ' + ' AND '.join(conditions) if conditions else ''), parameters
+
+
+def to_sql_value(value):
+    """
+    :param value: CSV value
+    :return: None for empty and `N/A` values, the value otherwise (SQLite converts numbers by column type)
+    """
+    return None if value in ('', NOT_AVAILABLE, None) else value
+
+
+def is_results_header(header) -> bool:
+    """
+    :param header: first row of CSV file
+    :return: True if the file has vmsim results columns (possibly without the trailing ones or followed by others,
+             e.g. timing summary, which aren't stored)
+    """
+    return bool(header) and len(header) >= 8 and tuple(header[:len(COLUMN_NAMES)]) == COLUMN_NAMES[:len(header)]
+
+
+def sort_key(value) -> tuple:
+    """
+    Sorts NULLs first, then numbers, then text.
+    """
+    if value is None:
+        return 0, 0, ''
+    if isinstance(value, (int, float)):
+        return 1, value, ''
+    return 2, 0, str(value)
+
+
+def serialize_pivot(column_keys: list, rows: list, row_name: str, output):
+    """
+    Writes pivot table as CSV.
+    :param column_keys: column keys
+    :param rows: rows of the table
+    :param row_name: name of the column of row keys
+    :param output: text file
+    """
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow([row_name] + [NOT_AVAILABLE if key is None else key for key in column_keys])
+    writer.writerows([NOT_AVAILABLE if cell is None else cell for cell in row] for row in rows)
+
+
+def parse_filters(args) -> dict:
+    """
+    :param args: parsed command line arguments
+    :return: KEY = column, VALUE = list of accepted values
+    """
+    filters = {}
+    if args.trace:
+        filters['trace_file'] = args.trace.split(',')
+    if args.alg:
+        filters['alg'] = args.alg.split(',')
+    if args.frames:
+        filters['frames'] = [int(elem) for elem in args.frames.split(',')]
+    if args.refresh:
+        filters['refresh'] = [int(elem) for elem in args.refresh.split(',')]
+    return filters
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=DEFAULT_DB, help="results database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="append rows of result CSV files")
+    import_parser.add_argument("paths", nargs='+', help="CSV files or directories (e.g. results/)")
+
+    pivot_parser = commands.add_parser("pivot", help="aggregate a column into a pivot table (CSV)")
+    pivot_parser.add_argument("--value", default='page_faults', choices=COLUMN_NAMES, help="aggregated column")
+    pivot_parser.add_argument("--rows", default='frames', choices=COLUMN_NAMES, help="column of row keys")
+    pivot_parser.add_argument("--columns", default='alg', choices=COLUMN_NAMES, help="column of column keys")
+    pivot_parser.add_argument("--agg", default='avg', choices=AGGREGATES, help="aggregate function")
+    pivot_parser.add_argument("--trace", help="comma separated trace file names")
+    pivot_parser.add_argument("--alg", help="comma separated algorithms")
+    pivot_parser.add_argument("--frames", help="comma separated numbers of frames")
+    pivot_parser.add_argument("--refresh", help="comma separated refresh times")
+    pivot_parser.add_argument("--output", help="output CSV file (stdout by default)")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    try:
+        if args.command == "import":
+            for path in args.paths:
+                if not os.path.exists(path):
+                    LOG.error("Path '%s' doesn't exist. Terminating.", path)
+                    sys.exit(0)
+                LOG.info("Imported %s rows from %s", store.import_tree(path), path)
+        else:
+            column_keys, rows = store.pivot(args.value, args.rows, args.columns, args.agg, parse_filters(args))
+            if args.output:
+                with open(args.output, "w") as output:
+                    serialize_pivot(column_keys, rows, args.rows, output)
+            else:
+                serialize_pivot(column_keys, rows, args.rows, sys.stdout)
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
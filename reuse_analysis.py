@@ -0,0 +1,130 @@
+"""
+Reuse distance and inter-reference gap analysis
+
+Characterises a trace without running any algorithm, in a single streaming pass over decoded VPNs:
+- reuse (LRU stack) distance - number of distinct pages accessed since the previous access of the page,
+  an access hits in LRU memory of c frames iff its reuse distance is at most c,
+- inter-reference gap - number of accesses since the previous access of the page,
+- access frequency of every page.
+Reuse distances are counted with a Fenwick tree in O(n log m) (m - number of distinct pages),
+memory usage is O(m) - the trace is never loaded as a whole.
+
+Histograms are written to `results/<trace>_trace/`: `reuse_distances.csv`, `gaps.csv`
+(distance or gap, accesses, cumulative share of accesses; first accesses of pages as `cold`)
+and `page_frequencies.csv` (pages ordered by number of accesses). With `--log2` distances and gaps
+are bucketed by powers of two.
+
+Usage:  python reuse_analysis.py --tracefile <tracefile> [--pagesize 4K|16K|64K|2M] [--address-bits 32|64]
+            [--format auto|synthetic|lackey|addresses] [--log2]
+"""
+import argparse
+import collections
+import csv
+import logging
+import os
+import sys
+
+import autosize
+import input_parser as iparser
+import page_table as pt
+import vmsim
+
+LOG = logging.getLogger(__name__)
+
+COLD = 'cold'
+
+
+def analyze(vpns) -> tuple:
+    """
+    :param vpns: iterable of VPNs
+    :return: tuple (reuse distance histogram, gap histogram, accesses of every page) as Counters,
+             first accesses of pages are counted under None key in both histograms
+    """
+    page_accesses = collections.Counter()
+    distances = collections.Counter()
+    gaps = collections.Counter()
+
+    def count_pages():
+        for vpn in vpns:
+            page_accesses[vpn] += 1
+            yield vpn
+
+    for distance, gap in autosize.iterate_reuse(count_pages()):
+        distances[distance] += 1
+        gaps[gap] += 1
+    return distances, gaps, page_accesses
+
+
+def bucket_log2(histogram: collections.Counter) -> collections.Counter:
+    """
+    :param histogram: KEY = distance or gap, VALUE = number of accesses
+    :return: histogram with keys rounded down to powers of 2 (bucket k holds values k..2k-1)
+    """
+    buckets = collections.Counter()
+    for value, count in histogram.items():
+        buckets[None if value is None else 1 << (value.bit_length() - 1)] += count
+    return buckets
+
+
+def serialize_histogram(histogram: collections.Counter, name: str, output_file: str):
+    """
+    Writes histogram to CSV file, cold accesses first, then in ascending order.
+    :param histogram: KEY = distance or gap (None for cold accesses), VALUE = number of accesses
+    :param name: name of the first column
+    :param output_file: path to output file
+    """
+    total = sum(histogram.values())
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow((name, 'accesses', 'cumulative_share'))
+        cumulative = histogram.get(None, 0)
+        if cumulative:
+            writer.writerow((COLD, cumulative, round(cumulative / total, 6)))
+        for value in sorted(key for key in histogram if key is not None):
+            cumulative += histogram[value]
+            writer.writerow((value, histogram[value], round(cumulative / total, 6)))
+
+
+def serialize_page_frequencies(page_accesses: collections.Counter, output_file: str):
+    """
+    Writes number of accesses of every page to CSV file, the most accessed first.
+    :param page_accesses: KEY = VPN, VALUE = number of accesses
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(('vpn', 'accesses'))
+        writer.writerows(('{:x}'.format(vpn), count) for vpn, count in page_accesses.most_common())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tracefile", required=True, help="tracefile: <tracefile>")
+    parser.add_argument("--pagesize", default='4K', choices=pt.PAGE_SIZES.keys(), help="page size")
+    parser.add_argument("--address-bits", default=pt.DEFAULT_ADDRESS_BITS, type=int, choices=pt.ADDRESS_BITS,
+                        help="virtual address width")
+    parser.add_argument("--format", default=iparser.AUTO, choices=iparser.TRACE_FORMATS, help="trace format")
+    parser.add_argument("--log2", action="store_true", help="bucket distances and gaps by powers of 2")
+    args = parser.parse_args()
+
+    LOG.info("Parsed args: %s", vars(args))
+
+    if not os.path.isfile(args.tracefile):
+        LOG.error("Trace file '%s' doesn't exist. Terminating.", args.tracefile)
+        sys.exit(0)
+
+    accesses = pt.iterate_decoded(iparser.iterate_trace_file(args.tracefile, args.format),
+                                  pt.PAGE_SIZES[args.pagesize], args.address_bits)
+    distances, gaps, page_accesses = analyze(access[0] for access in accesses)
+    LOG.info("Accesses: %s, pages: %s", sum(page_accesses.values()), len(page_accesses))
+    if args.log2:
+        distances, gaps = bucket_log2(distances), bucket_log2(gaps)
+
+    output_dir = vmsim.create_trace_results_dir(args.tracefile)
+    serialize_histogram(distances, 'reuse_distance', os.path.join(output_dir, 'reuse_distances.csv'))
+    serialize_histogram(gaps, 'gap', os.path.join(output_dir, 'gaps.csv'))
+    serialize_page_frequencies(page_accesses, os.path.join(output_dir, 'page_frequencies.csv'))
+
+
+if __name__ == "__main__":
+    main()
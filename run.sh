@@ -14,6 +14,8 @@ function print_red () {
 for t in "${TRACES[@]}"
 do
     python generator.py --pages $t
+    # statistics sidecar is computed once and read by all vmsim runs on the trace
+    python trace_stats.py --tracefile data/"${t}".trace
     print_red "Trace ${t} generated"
 done
 
@@ -23,7 +25,7 @@ for t in "${TRACES[@]}"
 do
     for f in "${FRAMES[@]}"
     do
-        python vmsim.py --tracefile=data/"${t}".trace --numframes="${f}"
+        python vmsim.py --tracefile=data/"${t}".trace --numframes="${f}" --stats
         print_red "Algorithms done for: ${t} trace, ${f} frames"
     done
 done
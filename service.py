@@ -0,0 +1,201 @@
+"""
+Local simulation service
+
+Keeps simulator and decoded traces loaded, so that many small runs don't pay interpreter startup,
+imports and trace parsing. Listens on a Unix socket or on a localhost TCP port.
+Protocol: one JSON request per line, one JSON response per line.
+
+Request:  {"trace": <tracefile>, "algorithms": [<name>, ...], "frames": [<numframes>, ...], "refresh": <refresh>,
+           "seed": <seed>}
+          (algorithms - class names from vmsim.ALGORITHMS, all by default; frames - number or list of numbers)
+Response: {"results": [{"alg": ..., "trace_file": ..., "frames": ..., "total_mem_access": ..., "page_faults": ...,
+           "writes": ..., "refresh": ..., "total_time": ...}, ...]} or {"error": <message>}
+
+Every (algorithm, frames) pair is a separate task of a worker process pool.
+Each worker caches decoded traces (invalidated when trace file changes).
+
+Usage:  python service.py [--socket <path> | --port <port>] [--workers <workers>]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import copy
+import json
+import logging
+import os
+import stat
+import time
+
+import input_parser as iparser
+import page_table as pt
+import vmsim
+
+LOG = logging.getLogger(__name__)
+
+HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+TRACE_CACHE_SIZE = 4
+
+RESULT_COLUMNS = ('alg', 'trace_file', 'frames', 'total_mem_access', 'page_faults', 'writes', 'refresh',
+                  'total_time')
+ALGORITHM_NAMES = vmsim.ALGORITHM_NAMES
+
+# KEY = (trace path, modification time, size), VALUE = decoded trace
+_trace_cache: vmsim.TraceCache = vmsim.TraceCache(TRACE_CACHE_SIZE)
+
+
+def load_trace(trace_file: str) -> list:
+    """
+    Returns decoded trace, parsing and decoding the file only if it isn't cached yet or it has changed.
+    :param trace_file: path to trace file
+    :return: list of tuples (VPN, R/W), to be run on DecodedPageTable
+    """
+    file_stat = os.stat(trace_file)
+    key = (os.path.abspath(trace_file), file_stat.st_mtime_ns, file_stat.st_size)
+    return _trace_cache.get(key, lambda: pt.decode_trace(list(iparser.iterate_trace_file(trace_file))))
+
+
+def run_task(trace_file: str, algorithm_name: str, num_frames: int, refresh: int, seed: int) -> dict:
+    """
+    Runs single algorithm (in worker process).
+    :param trace_file: path to trace file
+    :param algorithm_name: class name of algorithm
+    :param num_frames: number of frames in RAM
+    :param refresh: refresh time (for aging algorithm)
+    :param seed: seed (for random algorithm)
+    :return: result tuple as a dictionary
+    """
+    trace = load_trace(trace_file)
+    alg = vmsim.create_algorithm(ALGORITHM_NAMES[algorithm_name], pt.DecodedPageTable(num_frames),
+                                 copy.copy(trace), refresh, seed)
+    t_0 = time.perf_counter()
+    result_tuple = alg.run_algorithm()
+    total_time = (time.perf_counter() - t_0) * 1000
+    return dict(zip(RESULT_COLUMNS, result_tuple.get_result(alg.__str__(), os.path.basename(trace_file),
+                                                            total_time)))
+
+
+def parse_job(request: dict) -> list:
+    """
+    Validates job request and splits it into tasks.
+    :param request: decoded JSON request
+    :return: list of run_task arguments
+    """
+    trace_file = request.get('trace')
+    if not trace_file or not os.path.isfile(trace_file):
+        raise ValueError("Trace file '{}' doesn't exist.".format(trace_file))
+
+    algorithm_names = request.get('algorithms') or list(ALGORITHM_NAMES)
+    unknown = [name for name in algorithm_names if name not in ALGORITHM_NAMES]
+    if unknown:
+        raise ValueError("Unknown algorithms: {}. Available: {}.".format(', '.join(unknown),
+                                                                         ', '.join(ALGORITHM_NAMES)))
+
+    frames = request.get('frames', 3)
+    frames = [int(elem) for elem in frames] if isinstance(frames, list) else [int(frames)]
+    if min(frames) < 1:
+        raise ValueError("Number of frames should be positive.")
+
+    refresh = int(request.get('refresh', 5))
+    seed = int(request.get('seed', 0))
+    return [(trace_file, name, num_frames, refresh, seed) for num_frames in frames for name in algorithm_names]
+
+
+class SimulationService:
+    """
+    Accepts job requests from clients and dispatches their tasks to a worker process pool.
+    """
+
+    def __init__(self, workers: int = None):
+        self.workers: int = workers
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+
+    async def run_job(self, request: dict) -> dict:
+        """
+        :param request: decoded JSON request
+        :return: response to be encoded as JSON
+        """
+        if not isinstance(request, dict):
+            return {'error': 'Request should be a JSON object.'}
+        try:
+            tasks = parse_job(request)
+        except (ValueError, TypeError) as error:
+            return {'error': str(error)}
+
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.gather(*(loop.run_in_executor(self.executor, run_task, *task)
+                                              for task in tasks))
+        except (ValueError, IndexError, OSError) as error:
+            # e.g. malformed trace file
+            return {'error': str(error)}
+        except concurrent.futures.process.BrokenProcessPool as error:
+            # a worker died, following jobs get a new pool
+            LOG.exception("Worker pool of job %s is broken", request)
+            self.executor.shutdown(wait=False)
+            self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            return {'error': 'Worker process failed: {}'.format(error)}
+        except Exception as error:
+            LOG.exception("Job %s failed", request)
+            return {'error': '{}: {}'.format(type(error).__name__, error)}
+        return {'results': results}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves requests of one connection until the client closes it.
+        """
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {'error': 'Request is not valid JSON.'}
+            else:
+                LOG.info("Job: %s", request)
+                response = await self.run_job(request)
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+        writer.close()
+
+    async def serve(self, socket_path: str = None, port: int = DEFAULT_PORT):
+        """
+        Runs the service until it's cancelled.
+        :param socket_path: path to Unix socket, localhost TCP port is used if not given
+        :param port: localhost TCP port
+        """
+        if socket_path:
+            # socket left by a previous run
+            if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(self.handle_client, path=socket_path)
+            LOG.info("Listening on %s", socket_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, HOST, port)
+            LOG.info("Listening on %s:%s", HOST, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--socket", help="Unix socket path (localhost TCP port is used if not given)")
+    parser.add_argument("--port", default=DEFAULT_PORT, help="localhost TCP port")
+    parser.add_argument("--workers", help="number of worker processes (number of CPUs by default)")
+    args = parser.parse_args()
+
+    service = SimulationService(int(args.workers) if args.workers else None)
+    try:
+        asyncio.run(service.serve(args.socket, int(args.port)))
+    except KeyboardInterrupt:
+        LOG.info("Terminating.")
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Client of the local simulation service
+
+Submits one job and prints its results as CSV (same columns as vmsim results) or as JSON.
+
+Usage:  python service_client.py --tracefile <tracefile> [--numframes <f1,f2,...>] [--algorithms <a1,a2,...>]
+            [--refresh <refresh>] [--seed <seed>] [--socket <path> | --port <port>] [--json]
+"""
+import argparse
+import csv
+import json
+import socket
+import sys
+
+import service
+
+
+def submit(request: dict, socket_path: str = None, port: int = service.DEFAULT_PORT) -> dict:
+    """
+    Sends job request to the service and waits for the response.
+    :param request: job request
+    :param socket_path: path to Unix socket of the service, localhost TCP port is used if not given
+    :param port: localhost TCP port of the service
+    :return: decoded response
+    """
+    if socket_path:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(socket_path)
+    else:
+        connection = socket.create_connection((service.HOST, port))
+
+    with connection, connection.makefile('rwb') as stream:
+        stream.write(json.dumps(request).encode() + b'\n')
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tracefile", required=True, help="tracefile: <tracefile>")
+    parser.add_argument("--numframes", default='3', help="comma separated numbers of frames")
+    parser.add_argument("--algorithms", help="comma separated algorithm class names (all by default)")
+    parser.add_argument("--refresh", default=5, help="refresh time [ms] (for aging alg): <refresh>")
+    parser.add_argument("--seed", default=0, help="seed (for random alg): <seed>")
+    parser.add_argument("--socket", help="Unix socket path of the service")
+    parser.add_argument("--port", default=service.DEFAULT_PORT, help="localhost TCP port of the service")
+    parser.add_argument("--json", action="store_true", help="print raw JSON response")
+    args = parser.parse_args()
+
+    request = {
+        'trace': args.tracefile,
+        'algorithms': args.algorithms.split(',') if args.algorithms else None,
+        'frames': [int(elem) for elem in args.numframes.split(',')],
+        'refresh': int(args.refresh),
+        'seed': int(args.seed),
+    }
+    response = submit(request, args.socket, int(args.port))
+
+    if args.json:
+        print(json.dumps(response))
+    elif 'error' in response:
+        print(response['error'], file=sys.stderr)
+        sys.exit(1)
+    else:
+        writer = csv.DictWriter(sys.stdout, service.RESULT_COLUMNS, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(response['results'])
+
+
+if __name__ == "__main__":
+    main()
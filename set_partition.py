@@ -0,0 +1,251 @@
+"""
+Set-partitioned parallel simulation
+
+Models a set-associative page cache: pages are partitioned into `sets` sets by VPN (hash or modulo index),
+every set has its own page table of `numframes / sets` frames and its own replacement, so accesses to different
+sets never interact. The decoded trace is split into per-set traces in one pass, sets are simulated
+on a process pool (all cores for a single huge trace) and their results are merged.
+
+Every access keeps its virtual time in the whole trace. Policies driven by virtual time run on it, as if all sets
+were simulated together: Aging shifts counters at refreshes which happen during accesses of other sets, the WSClock
+window spans accesses of all sets. The other algorithms only see accesses of their set (OPT indexes the next-use
+array of the set trace). The Clock swap daemon isn't driven by time, it runs when the hand of the set finds
+no clean unreferenced page, so every set has its own daemon.
+
+Results are written to `<numframes>_frames_<sets>_sets.csv` with skew of the sets (the busiest set relative
+to the average one, by accesses and by page faults), per-set results to `<numframes>_frames_<sets>_sets_skew.csv`
+reveal conflict hot spots.
+
+Usage:  python set_partition.py --numframes <numframes> --sets <sets> --tracefile <tracefile>
+            [--index hash|modulo] [--algorithms <alg,...>] [--workers <workers>] [--refresh <refresh>]
+            [--seed <seed>] [--window <window>] [--pagesize 4K|16K|64K|2M] [--address-bits 32|64]
+            [--format auto|synthetic|lackey|addresses]
+"""
+import argparse
+import concurrent.futures
+import csv
+import functools
+import logging
+import os
+import sys
+import time
+
+import algorithms.aging as aging
+import algorithms.opt as opt
+import algorithms.wsclock as wsclock
+import autosize
+import input_parser as iparser
+import page_table as pt
+import vmsim
+
+LOG = logging.getLogger(__name__)
+
+HASH = 'hash'
+MODULO = 'modulo'
+INDEXES = (HASH, MODULO)
+
+# 64-bit Fibonacci hashing multiplier (2^64 / golden ratio)
+GOLDEN_RATIO = 0x9E3779B97F4A7C15
+MASK_64 = (1 << 64) - 1
+
+DEFAULT_ALGORITHMS = 'Clock,LRU,Aging,Opt'
+
+# algorithms whose policy depends on virtual time, they run on virtual time of the whole trace
+VIRTUAL_TIME_ALGORITHMS = (aging.Aging, wsclock.WSClock)
+
+RESULT_HEADER = ('alg', 'trace_file', 'frames', 'sets', 'total_mem_access', 'page_faults', 'writes', 'total_time',
+                 'access_skew', 'fault_skew')
+SKEW_HEADER = ('alg', 'set', 'frames', 'total_mem_access', 'unique_pages', 'page_faults', 'writes', 'fault_share')
+
+_set_traces = None
+_factory = None
+
+
+def get_set(vpn: int, sets: int, index: str = HASH) -> int:
+    """
+    :param vpn: virtual page number
+    :param sets: number of sets
+    :param index: HASH (high bits of Fibonacci hash, strided pages are spread) or MODULO (VPN mod sets)
+    :return: set of the page
+    """
+    if index == MODULO:
+        return vpn % sets
+    return (((vpn * GOLDEN_RATIO) & MASK_64) >> 32) % sets
+
+
+def split_trace(accesses, sets: int, index: str = HASH, keep_time: bool = False) -> list:
+    """
+    :param accesses: iterable of tuples (VPN, R/W)
+    :param sets: number of sets
+    :param index: one of INDEXES
+    :param keep_time: every access is a tuple (VPN, R/W, virtual time of the access in the whole trace)
+    :return: list of per-set traces, order of accesses within a set is kept
+    """
+    set_traces = [[] for _ in range(sets)]
+    if keep_time:
+        for virtual_time, access in enumerate(accesses, 1):
+            set_traces[get_set(access[0], sets, index)].append((access[0], access[1], virtual_time))
+        return set_traces
+    for access in accesses:
+        set_traces[get_set(access[0], sets, index)].append(access)
+    return set_traces
+
+
+def init_worker(set_traces: list, factory):
+    """
+    Keeps per-set traces and algorithm factory in worker process, so they are passed once per worker.
+    :param set_traces: list of per-set traces
+    :param factory: function (algorithm class, page table, trace, next_uses) -> algorithm instance
+    """
+    global _set_traces, _factory
+    _set_traces = set_traces
+    _factory = factory
+
+
+def simulate_set(algorithm, set_index: int, frames: int) -> tuple:
+    """
+    Simulates algorithm on the trace of one set. Algorithms driven by virtual time run on virtual time
+    of the whole trace if the set trace keeps it.
+    :param algorithm: algorithm class
+    :param set_index: set
+    :param frames: frames of the set
+    :return: tuple (algorithm name, set, accesses, unique pages, page faults, writes)
+    """
+    trace = _set_traces[set_index]
+    next_uses = autosize.get_next_uses([access[0] for access in trace]) if algorithm == opt.Opt else None
+    page_table = pt.DecodedPageTable(frames)
+    alg = _factory(algorithm, page_table, [], next_uses=next_uses)
+    virtual_time = bool(trace) and len(trace[0]) > 2 and issubclass(algorithm, VIRTUAL_TIME_ALGORITHMS)
+    logging.disable(logging.INFO)
+    try:
+        for next_address in trace:
+            if virtual_time:
+                # step counts the access, so virtual time reaches the time of the access
+                page_table.total_memory_accesses = next_address[2] - 1
+            alg.step(next_address)
+    finally:
+        logging.disable(logging.NOTSET)
+    return (alg.__str__(), set_index, len(trace), len({access[0] for access in trace}), page_table.page_faults,
+            page_table.writes_to_disk)
+
+
+def get_skew(values: list) -> float:
+    """
+    :return: the highest value relative to the average one (1 - no skew)
+    """
+    mean = sum(values) / len(values)
+    return round(max(values) / mean, 3) if mean else 1.0
+
+
+def simulate(set_traces: list, algorithms: list, frames: int, factory, workers: int = None) -> list:
+    """
+    Simulates every algorithm on every set, sets run on a process pool (in this process for one worker).
+    :param set_traces: list of per-set traces
+    :param algorithms: algorithm classes
+    :param frames: frames of every set
+    :param factory: function (algorithm class, page table, trace, next_uses) -> algorithm instance
+    :param workers: number of worker processes (number of CPUs by default)
+    :return: list of per-set results (algorithm name, set, accesses, unique pages, page faults, writes),
+             sorted by algorithm and set
+    """
+    tasks = [(algorithm, set_index) for algorithm in algorithms for set_index in range(len(set_traces))]
+    if workers == 1:
+        init_worker(set_traces, factory)
+        set_results = [simulate_set(algorithm, set_index, frames) for algorithm, set_index in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=init_worker,
+                                                    initargs=(set_traces, factory)) as executor:
+            futures = [executor.submit(simulate_set, algorithm, set_index, frames) for algorithm, set_index in tasks]
+            set_results = [future.result() for future in futures]
+    return set_results
+
+
+def merge_results(set_results: list, algorithms: list, trace_name: str, frames: int, sets: int,
+                  total_time: float) -> tuple:
+    """
+    :return: tuple (merged rows of RESULT_HEADER columns, per-set rows of SKEW_HEADER columns)
+    """
+    results = []
+    skew_rows = []
+    for _ in algorithms:
+        rows = set_results[:sets]
+        set_results = set_results[sets:]
+        accesses = sum(row[2] for row in rows)
+        page_faults = sum(row[4] for row in rows)
+        results.append((rows[0][0], trace_name, frames * sets, sets, accesses, page_faults, sum(row[5] for row in rows),
+                        total_time, get_skew([row[2] for row in rows]), get_skew([row[4] for row in rows])))
+        skew_rows += [(name, set_index, frames, set_accesses, unique_pages, set_faults, writes,
+                       round(set_faults / page_faults, 6) if page_faults else 0)
+                      for name, set_index, set_accesses, unique_pages, set_faults, writes in rows]
+    return results, skew_rows
+
+
+def serialize(rows: list, header: tuple, output_file: str):
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--numframes", required=True, type=int, help="frames of all sets")
+    parser.add_argument("--sets", required=True, type=int, help="number of sets")
+    parser.add_argument("--tracefile", required=True, help="tracefile: <tracefile>")
+    parser.add_argument("--index", default=HASH, choices=INDEXES, help="set index of VPN")
+    parser.add_argument("--algorithms", default=DEFAULT_ALGORITHMS, help="comma separated algorithms")
+    parser.add_argument("--workers", type=int, help="worker processes (number of CPUs by default)")
+    parser.add_argument("--refresh", default=5, type=int, help="refresh time [ms] (for aging alg): <refresh>")
+    parser.add_argument("--seed", default=0, type=int, help="seed (for random alg): <seed>")
+    parser.add_argument("--window", default=vmsim.wsclock.WSClock.DEFAULT_WINDOW, type=int,
+                        help="working set window [accesses] (for WSClock alg): <window>")
+    parser.add_argument("--pagesize", default='4K', choices=pt.PAGE_SIZES.keys(), help="page size")
+    parser.add_argument("--address-bits", default=pt.DEFAULT_ADDRESS_BITS, type=int, choices=pt.ADDRESS_BITS,
+                        help="virtual address width")
+    parser.add_argument("--format", default=iparser.AUTO, choices=iparser.TRACE_FORMATS, help="trace format")
+    args = parser.parse_args()
+
+    LOG.info("Parsed args: %s", vars(args))
+
+    if not os.path.isfile(args.tracefile):
+        LOG.error("Trace file '%s' doesn't exist. Terminating.", args.tracefile)
+        sys.exit(0)
+    if args.sets < 1 or args.numframes % args.sets or args.numframes < args.sets:
+        LOG.error("Number of frames should be a positive multiple of number of sets. Terminating.")
+        sys.exit(0)
+    if args.window < 1:
+        LOG.error("Working set window should be positive. Terminating.")
+        sys.exit(0)
+    names = args.algorithms.split(',')
+    for name in names:
+        if name not in vmsim.ALGORITHM_NAMES:
+            LOG.error("Unknown algorithm '%s'. Available: %s. Terminating.", name, ', '.join(vmsim.ALGORITHM_NAMES))
+            sys.exit(0)
+    algorithms = [vmsim.ALGORITHM_NAMES[name] for name in names]
+    frames = args.numframes // args.sets
+
+    t_0 = time.perf_counter()
+    accesses = pt.iterate_decoded(iparser.iterate_trace_file(args.tracefile, args.format),
+                                  pt.PAGE_SIZES[args.pagesize], args.address_bits)
+    set_traces = split_trace(accesses, args.sets, args.index, keep_time=True)
+    LOG.info("Trace split into %s sets in %.1f ms", args.sets, (time.perf_counter() - t_0) * 1000)
+
+    factory = functools.partial(vmsim.create_algorithm, refresh=args.refresh, seed=args.seed, window=args.window)
+    set_results = simulate(set_traces, algorithms, frames, factory, args.workers)
+    total_time = (time.perf_counter() - t_0) * 1000
+    LOG.info("TOTAL SET-PARTITIONED TIME: %s ms", str(total_time))
+
+    results, skew_rows = merge_results(set_results, algorithms, os.path.basename(args.tracefile), frames, args.sets,
+                                       total_time)
+    for result in results:
+        LOG.info("%s: %s page faults, %s writes, access skew %s, fault skew %s", result[0], result[5], result[6],
+                 result[8], result[9])
+
+    output_file = os.path.splitext(vmsim.create_results_dir(args.tracefile, args.numframes))[0] \
+        + '_{}_sets.csv'.format(args.sets)
+    serialize(results, RESULT_HEADER, output_file)
+    serialize(skew_rows, SKEW_HEADER, os.path.splitext(output_file)[0] + '_skew.csv')
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import collections
+import random
+import unittest
+
+import algorithms.aging as aging
+import algorithms.clock as clock
+import algorithms.lru as lru
+import algorithms.opt as opt
+import algorithms.wsclock as wsclock
+import attribution
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestSpaceSaving(unittest.TestCase):
+
+    def test_exact_within_capacity(self):
+        sketch = attribution.SpaceSaving(4)
+        for key in 'abacabad':
+            sketch.add(key)
+
+        self.assertEqual([('a', 4, 0), ('b', 2, 0)], sketch.top(2))
+        self.assertEqual(8, sketch.total)
+
+    def test_heavy_hitters_bounded(self):
+        """
+        Pages accessed more than total / capacity times are found, their counts are overestimated
+        by at most the error.
+        """
+        generator = random.Random(0)
+        keys = [generator.randrange(10000) for _ in range(20000)] + [1] * 3000 + [2] * 2000
+        generator.shuffle(keys)
+        exact = collections.Counter(keys)
+        sketch = attribution.SpaceSaving(50)
+        for key in keys:
+            sketch.add(key)
+
+        self.assertEqual(50, len(sketch.counts))
+        self.assertLessEqual(len(sketch.heap), 4 * 50)
+        top = sketch.top(2)
+        self.assertEqual([1, 2], [key for key, _, _ in top])
+        for key, count, error in top:
+            self.assertLessEqual(exact[key], count)
+            self.assertLessEqual(count - error, exact[key])
+
+    def test_invalid_capacity(self):
+        self.assertRaises(ValueError, attribution.SpaceSaving, 0)
+
+
+class TestFaultAttribution(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_totals_match_results(self):
+        for alg in (clock.Clock(pt.PageTable(self.params.frames), list(self.memory_addresses)),
+                    lru.LRU(pt.PageTable(self.params.frames), list(self.memory_addresses)),
+                    aging.Aging(pt.PageTable(self.params.frames), list(self.memory_addresses), self.params.refresh),
+                    opt.Opt(pt.PageTable(self.params.frames), list(self.memory_addresses)),
+                    wsclock.WSClock(pt.PageTable(self.params.frames), list(self.memory_addresses), 2)):
+            fault_attribution = attribution.FaultAttribution()
+            fault_attribution.attach(alg)
+            result_tuple = alg.run_algorithm()
+
+            sketches = fault_attribution.sketches
+            self.assertEqual(result_tuple.page_faults, sketches[attribution.FAULTS].total, alg)
+            self.assertEqual(result_tuple.writes, sketches[attribution.DIRTY_WRITES].total, alg)
+            self.assertEqual(result_tuple.page_faults - self.params.frames, sketches[attribution.EVICTIONS].total, alg)
+
+    def test_rows(self):
+        alg = clock.Clock(pt.PageTable(self.params.frames), list(self.memory_addresses))
+        fault_attribution = attribution.FaultAttribution()
+        fault_attribution.attach(alg)
+        alg.run_algorithm()
+        rows = fault_attribution.get_rows('Clock', 2)
+
+        self.assertEqual([('Clock', metric, rank) for metric in attribution.METRICS for rank in (1, 2)],
+                         [row[:3] for row in rows])
+        self.assertEqual(('Clock', 'faults', 1, '12345', 2, 0), rows[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
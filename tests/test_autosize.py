@@ -0,0 +1,83 @@
+import functools
+import random
+import unittest
+
+import algorithms.aging as aging
+import algorithms.clock as clock
+import algorithms.lookahead_opt as lookahead_opt
+import autosize
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+import vmsim
+
+
+class TestAutosize(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.trace = pt.decode_trace(parser.parse_trace_file(self.params.trace_path))
+        self.vpns = [access[0] for access in self.trace]
+        self.factory = functools.partial(vmsim.create_algorithm, refresh=self.params.refresh, seed=0)
+
+    def test_miss_curves(self):
+        """
+        Test trace: 7 distinct pages, OPT faults 7 times with 3 frames.
+        """
+        self.assertEqual([10, 10, 10, 9, 8, 8, 8, 7], autosize.lru_miss_curve(self.vpns))
+        self.assertEqual([10, 10, 8, 7, 7, 7, 7, 7], autosize.opt_miss_curve(self.vpns))
+        self.assertEqual([10, 10, 8, 7], autosize.opt_miss_curve(self.vpns, 3))
+
+    def test_opt_miss_curve_matches_simulation(self):
+        """
+        Every point of OPT miss curve equals faults of OPT with full lookahead.
+        """
+        generator = random.Random(0)
+        trace = [(generator.randrange(12), 'R') for _ in range(100)]
+        curve = autosize.opt_miss_curve([access[0] for access in trace])
+
+        for frames in range(1, len(curve)):
+            page_table = pt.DecodedPageTable(frames)
+            lookahead_opt.LookaheadOpt(page_table, trace, len(trace)).run_algorithm()
+            self.assertEqual(page_table.page_faults, curve[frames])
+
+    def test_min_frames_from_curve(self):
+        curve = [10, 10, 8, 7]
+        self.assertEqual(2, autosize.min_frames_from_curve(curve, 8))
+        self.assertEqual(1, autosize.min_frames_from_curve(curve, 10))
+        self.assertIsNone(autosize.min_frames_from_curve(curve, 6))
+
+    def test_autosize(self):
+        """
+        Target 0.8: at most 8 page faults in 10 accesses.
+        """
+        results, _, _ = autosize.autosize(self.trace, 0.8, (clock.Clock, aging.Aging), self.factory, 2)
+
+        self.assertEqual([('LRU', 4, 8, autosize.CURVE),
+                          ('Opt', 2, 8, autosize.CURVE),
+                          ('Clock', 4, 8, autosize.SEARCH),
+                          ('Aging', 4, 8, autosize.SEARCH)], results)
+
+    def test_autosize_unreachable_target(self):
+        """
+        Compulsory faults (7 distinct pages) exceed target 0.6.
+        """
+        results, _, _ = autosize.autosize(self.trace, 0.6, (clock.Clock,), self.factory, 2)
+
+        self.assertEqual([None, None, None], [frames for _, frames, _, _ in results])
+
+    def test_search_matches_linear_scan(self):
+        generator = random.Random(1)
+        trace = [(generator.choice((generator.randrange(4), generator.randrange(20))), 'W') for _ in range(200)]
+        max_faults = 80
+
+        autosize.init_worker(trace, self.factory)
+        expected = next(frames for frames in range(1, 21)
+                        if autosize.count_faults(clock.Clock, frames)[1] <= max_faults)
+
+        results, _, _ = autosize.autosize(trace, max_faults / len(trace), (clock.Clock,), self.factory, 3)
+        self.assertEqual(expected, results[-1][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
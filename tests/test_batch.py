@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import tempfile
+import unittest
+
+import algorithms.clock as clock
+import algorithms.opt as opt
+import cost_model as cm
+import tests.test_config as params
+import tlb
+import vmsim
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.args = argparse.Namespace(device=cm.NVME.name, writeback=cm.ASYNC, tlb_entries=0,
+                                       tlb_ways=tlb.DEFAULT_WAYS, tlb_policy=tlb.LRU, seed=0, stats=False)
+
+    def test_parse_manifest(self):
+        configurations = vmsim.parse_manifest({'runs': [
+            {'trace': self.params.trace_path, 'frames': [3, 4], 'refresh': [1, 2], 'algorithms': ['Clock', 'Opt']}]})
+        trace_key = (self.params.trace_path, 'auto', '4K', 32)
+
+        self.assertEqual([(trace_key, 3, 1, 0, 100, [clock.Clock, opt.Opt]),
+                          (trace_key, 4, 1, 0, 100, [clock.Clock, opt.Opt]),
+                          (trace_key, 3, 2, 0, 100, [clock.Clock, opt.Opt]),
+                          (trace_key, 4, 2, 0, 100, [clock.Clock, opt.Opt])], configurations)
+        self.assertEqual(len(vmsim.ALGORITHMS),
+                         len(vmsim.parse_manifest({'runs': [{'trace': self.params.trace_path}]})[0][5]))
+
+    def test_invalid_manifest(self):
+        self.assertRaises(ValueError, vmsim.parse_manifest, {})
+        self.assertRaises(ValueError, vmsim.parse_manifest, [{'trace': self.params.trace_path}])
+        self.assertRaises(ValueError, vmsim.parse_manifest, {'runs': [self.params.trace_path]})
+        self.assertRaises(ValueError, vmsim.parse_manifest, {'runs': [{'trace': 'missing.trace'}]})
+        self.assertRaises(ValueError, vmsim.parse_manifest,
+                          {'runs': [{'trace': self.params.trace_path, 'algorithms': ['Foo']}]})
+        self.assertRaises(ValueError, vmsim.parse_manifest, {'runs': [{'trace': self.params.trace_path, 'frames': 0}]})
+        self.assertRaises(ValueError, vmsim.parse_manifest,
+                          {'runs': [{'trace': self.params.trace_path, 'pagesize': '3K'}]})
+        self.assertRaises(ValueError, vmsim.parse_manifest, {'runs': [{'trace': self.params.trace_path, 'window': 0}]})
+
+    def test_load_manifest(self):
+        manifest = {'runs': [{'trace': self.params.trace_path, 'frames': 3}]}
+        with tempfile.TemporaryDirectory() as directory:
+            json_file = os.path.join(directory, 'manifest.json')
+            with open(json_file, 'w') as output:
+                json.dump(manifest, output)
+            toml_file = os.path.join(directory, 'manifest.toml')
+            with open(toml_file, 'w') as output:
+                output.write('[[runs]]\ntrace = "{}"\nframes = 3\n'.format(self.params.trace_path))
+
+            self.assertEqual(manifest, vmsim.load_manifest(json_file))
+            try:
+                self.assertEqual(manifest, vmsim.load_manifest(toml_file))
+            except ValueError:
+                # Python older than 3.11
+                pass
+
+    def test_trace_cache(self):
+        cache = vmsim.TraceCache(2)
+        loads = []
+
+        for key in ('a', 'b', 'a', 'c', 'b', 'a'):
+            cache.get(key, lambda: loads.append(key) or key.upper())
+
+        # 'b' is evicted by 'c' ('a' was used more recently), then 'a' is evicted by 'b'
+        self.assertEqual(['a', 'b', 'c', 'b', 'a'], loads)
+        self.assertEqual((1, 5), (cache.hits, cache.misses))
+        self.assertEqual(2, len(cache))
+
+        # nothing is kept without capacity
+        cache = vmsim.TraceCache(0)
+        self.assertEqual('A', cache.get('a', lambda: 'A'))
+        self.assertEqual(0, len(cache))
+
+    def test_run_batch(self):
+        configurations = vmsim.parse_manifest({'runs': [
+            {'trace': self.params.trace_path, 'frames': [3, 4], 'algorithms': ['Clock', 'Opt']},
+            {'trace': self.params.trace_path, 'frames': 3, 'refresh': self.params.refresh, 'algorithms': ['Aging']}]})
+        cache = vmsim.TraceCache()
+
+        results = vmsim.run_batch(configurations, cache, self.args)
+
+        self.assertEqual([('Clock', 3, 9, 2), ('Opt', 3, 7, 3), ('Clock', 4, 8, 2), ('Opt', 4, 7, 2),
+                          ('Aging', 3, 9, 3)],
+                         [(row[0], row[2], row[4], row[5]) for row in results])
+        self.assertEqual(len(vmsim.RESULT_HEADER), len(results[0]))
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import algorithms.clock_pro as clock_pro
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestClockPro(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.page_table = pt.PageTable(self.params.frames)
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_algorithm(self):
+        """
+        Important frame fields:
+        - vpn
+        - dirty
+        - in_use
+
+        12345678  12345678    12345678    a9012345    a9012345    a9012345    a9012345    a9012345    a9012345    a9012345
+                  01234567    01234567    01234567    12345678    12345678    12345678    cba90123    cba90123    01234567
+                              90123456    90123456    90123456    ba901234    ba901234    ba901234    dcba9012    dcba9012
+        fault     fault       fault       fault       fault       fault       hit         fault       fault       fault
+        """
+        clock_pro_algorithm = clock_pro.ClockPro(self.page_table, self.memory_addresses, keep_states=True)
+        clock_pro_algorithm.run_algorithm()
+
+        self.assertEqual(10, clock_pro_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(9, clock_pro_algorithm.page_table.page_faults)
+        self.assertEqual(3, clock_pro_algorithm.page_table.writes_to_disk)
+
+        final_state = clock_pro_algorithm.get_table_states()[-1].frame_table
+        self.assertEqual([0xa9012, 0x01234, 0xdcba9], [frame.vpn for frame in final_state])
+        self.assertEqual([False, True, False], [frame.dirty for frame in final_state])
+
+    def test_loop(self):
+        """
+        Loop over one page more than there are frames: every access is a fault for LRU and Clock.
+        """
+        loop = [('{:05x}000'.format(i % (self.params.frames + 1)), 'R') for i in range(40)]
+        clock_pro_algorithm = clock_pro.ClockPro(self.page_table, loop)
+        result = clock_pro_algorithm.run_algorithm()
+
+        self.assertEqual(40, result.total_mem_access)
+        self.assertEqual(32, result.page_faults)
+        self.assertLessEqual(clock_pro_algorithm.count_non_resident, self.params.frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import argparse
+import unittest
+
+import algorithms.fifo as fifo
+import cost_model as cm
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+import tlb
+import vmsim
+
+
+class TestCostModel(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.profile = cm.DeviceProfile('test', 1000, 2000)
+
+    def test_sync_writeback(self):
+        """
+        hit: RAM, fault: RAM + read, dirty eviction: RAM + write + read
+        """
+        cost = cm.CostModel(self.profile, cm.SYNC, ram_latency=10)
+
+        self.assertEqual(10, cost.record(0, 0))
+        self.assertEqual(1010, cost.record(1, 0))
+        self.assertEqual(3010, cost.record(1, 1))
+        self.assertEqual(4030 / 3, cost.effective_access_time())
+
+    def test_async_writeback(self):
+        """
+        Write is queued after the read, so only the next fault waits for it.
+        """
+        cost = cm.CostModel(self.profile, cm.ASYNC, ram_latency=10)
+
+        self.assertEqual(1010, cost.record(1, 1))
+        self.assertEqual(10, cost.record(0, 0))
+        # device is busy with the write for another 1990 ns
+        self.assertEqual(2990, cost.record(1, 0))
+        self.assertEqual(1010, cost.record(1, 0))
+
+    def test_percentiles(self):
+        cost = cm.CostModel(self.profile, cm.SYNC, ram_latency=10)
+        for _ in range(98):
+            cost.record(0, 0)
+        cost.record(1, 0)
+        cost.record(1, 1)
+
+        self.assertEqual(10, cost.percentile(50))
+        self.assertEqual(1010, cost.percentile(99))
+        self.assertEqual(3010, cost.percentile(100))
+        self.assertEqual((50.0, 10, 1010), cost.get_result())
+
+    def test_attach(self):
+        page_table = pt.PageTable(self.params.frames)
+        algorithm = fifo.FIFO(page_table, parser.parse_trace_file(self.params.trace_path))
+        cost = cm.CostModel(self.profile, cm.SYNC, ram_latency=10)
+        cost.attach(algorithm)
+        algorithm.run_algorithm()
+
+        # 10 accesses, 9 page faults, 2 writes to disk
+        self.assertEqual(10, cost.accesses)
+        self.assertEqual(10 * 10 + 9 * 1000 + 2 * 2000, cost.total_latency)
+
+    def test_attached_with_device_only(self):
+        args = argparse.Namespace(device=None, writeback=cm.ASYNC, tlb_entries=0, tlb_ways=tlb.DEFAULT_WAYS,
+                                  tlb_policy=tlb.LRU, seed=0)
+        algorithm = fifo.FIFO(pt.PageTable(self.params.frames), parser.parse_trace_file(self.params.trace_path))
+        step = algorithm.step
+        models = vmsim.attach_models(algorithm, args)
+
+        self.assertEqual((None, None), models)
+        self.assertEqual(step, algorithm.step)
+        self.assertEqual(('N/A',) * 5, vmsim.get_model_columns(models))
+
+        args.device = cm.HDD.name
+        cost, _ = vmsim.attach_models(algorithm, args)
+        algorithm.run_algorithm()
+        self.assertEqual(10, cost.accesses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import algorithms.fifo as fifo
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestFifo(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.page_table = pt.PageTable(self.params.frames)
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_algorithm(self):
+        """
+        Important frame fields:
+        - vpn
+        - dirty
+        - in_use
+
+        12345678  12345678    12345678    a9012345    a9012345    a9012345    a9012345    cba90123    cba90123    cba90123
+                  01234567    01234567    01234567    12345678    12345678    12345678    12345678    dcba9012    dcba9012
+                              90123456    90123456    90123456    ba901234    ba901234    ba901234    ba901234    01234567
+        fault     fault       fault       fault       fault       fault       hit         fault       fault       fault
+        """
+        fifo_algorithm = fifo.FIFO(self.page_table, self.memory_addresses, keep_states=True)
+        fifo_algorithm.run_algorithm()
+
+        self.assertEqual(10, fifo_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(9, fifo_algorithm.page_table.page_faults)
+        self.assertEqual(2, fifo_algorithm.page_table.writes_to_disk)
+
+        final_state = fifo_algorithm.get_table_states()[-1].frame_table
+        self.assertEqual([0xcba90, 0xdcba9, 0x01234], [frame.vpn for frame in final_state])
+        self.assertEqual([True, False, True], [frame.dirty for frame in final_state])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import random
+import tempfile
+import unittest
+
+import generator
+import input_parser as parser
+
+
+class TestGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def generate(self, pages: int, workload: str = None, seed: int = generator.DEFAULT_SEED) -> list:
+        output_file = os.path.join(self.directory.name, 'generated.trace')
+        generator.Generator(pages, workload, seed, output_file).generate()
+        return parser.parse_trace_file(output_file)
+
+    def test_same_seed_same_trace(self):
+        workload = 'zipf:pages=100;phases:pages=50,working_set=5,phase_length=20;scan:pages=30'
+        self.assertEqual(self.generate(1000, workload, 7), self.generate(1000, workload, 7))
+        self.assertNotEqual(self.generate(1000, workload, 7), self.generate(1000, workload, 8))
+
+    def test_default_workload(self):
+        trace = self.generate(1000)
+
+        self.assertEqual(1000, len(trace))
+        self.assertTrue(all(int(address, 16) >> 12 <= generator.VPN_UPPER_BOUND for address, _ in trace))
+
+    def test_regions(self):
+        """
+        Regions are laid out one after another, each with its own write ratio.
+        """
+        trace = self.generate(2000, 'uniform:pages=10,write=1;loop:pages=4,write=0')
+        vpns = [int(address, 16) >> 12 for address, _ in trace]
+
+        self.assertEqual(set(range(14)), set(vpns))
+        self.assertTrue(all(access == 'W' for vpn, (_, access) in zip(vpns, trace) if vpn < 10))
+        self.assertTrue(all(access == 'R' for vpn, (_, access) in zip(vpns, trace) if vpn >= 10))
+        self.assertEqual([10, 11, 12, 13, 10, 11], [vpn for vpn in vpns if vpn >= 10][:6])
+
+    def test_blocks_dont_change_trace(self):
+        workload = generator.Workload(generator.parse_workload('scan:pages=7,run=2;phases:pages=20,working_set=3'))
+        blocks = ''.join(workload.iterate_blocks(100, random.Random(1), 10))
+        workload = generator.Workload(generator.parse_workload('scan:pages=7,run=2;phases:pages=20,working_set=3'))
+        self.assertEqual(100, blocks.count('\n'))
+        self.assertEqual(blocks, ''.join(workload.iterate_blocks(100, random.Random(1), 10)))
+
+    def test_scan_run(self):
+        region = generator.ScanRegion(pages=3, run=2)
+        self.assertEqual([0, 0, 1, 1, 2], region.draw(random.Random(), 5))
+        self.assertEqual([2, 0, 0], region.draw(random.Random(), 3))
+
+    def test_phases(self):
+        region = generator.PhaseRegion(pages=100, working_set=4, phase_length=50)
+        pages = region.draw(random.Random(0), 100)
+
+        self.assertLessEqual(len(set(pages[:50])), 4)
+        self.assertLessEqual(len(set(pages[50:])), 4)
+
+    def test_zipf_skew(self):
+        region = generator.ZipfRegion(pages=1000, exponent=1.2)
+        pages = region.draw(random.Random(0), 10000)
+
+        self.assertGreater(pages.count(0), pages.count(1))
+        self.assertGreater(pages.count(0), 1000)
+
+    def test_sharded_generation_independent_of_workers(self):
+        workload = 'zipf:pages=100;scan:pages=30'
+        traces = []
+        for workers in (1, 2):
+            output_file = os.path.join(self.directory.name, '{}.trace'.format(workers))
+            generator.ShardedGenerator(1003, workload, 5, output_file, shards=4, workers=workers).generate()
+            traces.append(parser.parse_trace_file(output_file))
+
+        self.assertEqual(1003, len(traces[0]))
+        self.assertEqual(traces[0], traces[1])
+        self.assertEqual(['1.trace', '2.trace'], sorted(os.listdir(self.directory.name)))
+
+    def test_shard_index(self):
+        output_file = os.path.join(self.directory.name, 'indexed.trace')
+        sharded = generator.ShardedGenerator(10, None, 5, output_file, shards=3, workers=1, index=True)
+        sharded.generate()
+
+        self.assertEqual([4, 3, 3], sharded.get_shard_sizes())
+        self.assertEqual([os.path.join(self.directory.name, 'indexed.{:04d}.trace'.format(shard))
+                          for shard in range(3)], parser.read_shard_index(sharded.get_index_file()))
+        shards = [parser.parse_trace_file(sharded.get_shard_file(shard)) for shard in range(3)]
+        self.assertEqual(shards[0] + shards[1] + shards[2],
+                         list(parser.iterate_trace_file(sharded.get_index_file())))
+
+    def test_invalid_workload(self):
+        self.assertRaises(ValueError, generator.parse_workload, 'normal:pages=10')
+        self.assertRaises(ValueError, generator.parse_workload, 'zipf:size=10')
+        self.assertRaises(ValueError, generator.parse_workload, 'scan:pages=10,write=2')
+        self.assertRaises(ValueError, generator.parse_workload, 'phases:pages=10,working_set=20')
+
+
+if __name__ == '__main__':
+    unittest.main()
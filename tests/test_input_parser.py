@@ -0,0 +1,74 @@
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import input_parser as parser
+import tests.test_config as params
+
+LACKEY_PATH = './resources/lackey.trace'
+LACKEY_ACCESSES = [('0400d7d4', 'R'), ('7ff000398', 'W'), ('0400d7d8', 'R'), ('04f6b868', 'R'), ('0421c7f0', 'W')]
+
+
+class TestInputParser(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+
+    def test_synthetic(self):
+        self.assertEqual(parser.parse_trace_file(self.params.trace_path),
+                         list(parser.iterate_trace_file(self.params.trace_path)))
+
+    def test_lackey(self):
+        self.assertEqual(LACKEY_ACCESSES, list(parser.iterate_trace_file(LACKEY_PATH)))
+        self.assertEqual(LACKEY_ACCESSES, list(parser.iterate_trace_file(LACKEY_PATH, parser.LACKEY)))
+
+    def test_addresses(self):
+        lines = ['# address per line\n', '0x0400d7d4\n', '7ff000398 W\n', '\n', '0X04f6b868\n']
+
+        self.assertEqual(parser.ADDRESSES, parser.detect_format(lines))
+        self.assertEqual([('0400d7d4', 'R'), ('7ff000398', 'W'), ('04f6b868', 'R')],
+                         list(parser.iterate_trace_lines(lines)))
+        self.assertEqual([('0400d7d4', 'W'), ('7ff000398', 'R')],
+                         list(parser.iterate_address_lines(['0400d7d4 w\n', '7ff000398 r\n'])))
+        self.assertRaises(ValueError, list, parser.iterate_address_lines(['0400d7d4 X\n']))
+
+    def test_compressed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for extension, compression in (('.gz', gzip), ('.xz', lzma)):
+                compressed_path = os.path.join(directory, 'lackey.trace' + extension)
+                with open(LACKEY_PATH, 'rb') as source, compression.open(compressed_path, 'wb') as target:
+                    shutil.copyfileobj(source, target)
+
+                self.assertEqual(LACKEY_ACCESSES, list(parser.iterate_trace_file(compressed_path)))
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), "named pipes are not supported")
+    def test_named_pipe(self):
+        """
+        Named pipe is read from its first byte, magic bytes of compressed traces are not consumed.
+        """
+        with open(LACKEY_PATH, 'rb') as source:
+            content = source.read()
+        with tempfile.TemporaryDirectory() as directory:
+            for compress in (bytes, gzip.compress, lzma.compress):
+                pipe_path = os.path.join(directory, 'lackey.pipe')
+                os.mkfifo(pipe_path)
+                writer = threading.Thread(target=write_pipe, args=(pipe_path, compress(content)))
+                writer.start()
+                try:
+                    self.assertEqual(LACKEY_ACCESSES, list(parser.iterate_trace_file(pipe_path)), compress)
+                finally:
+                    writer.join()
+                    os.remove(pipe_path)
+
+
+def write_pipe(pipe_path, content):
+    with open(pipe_path, 'wb') as pipe:
+        pipe.write(content)
+
+
+if __name__ == '__main__':
+    unittest.main()
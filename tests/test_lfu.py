@@ -0,0 +1,49 @@
+import unittest
+
+import algorithms.lfu as lfu
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestLfu(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.page_table = pt.PageTable(self.params.frames)
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_algorithm(self):
+        """
+        Important frame fields:
+        - vpn
+        - dirty
+        - in_use
+
+        12345678  12345678    12345678    a9012345    a9012345    a9012345    a9012345    a9012345    a9012345    a9012345
+                  01234567    01234567    01234567    12345678    12345678    12345678    cba90123    cba90123    01234567
+                              90123456    90123456    90123456    ba901234    ba901234    ba901234    dcba9012    dcba9012
+        fault     fault       fault       fault       fault       fault       hit         fault       fault       fault
+        """
+        lfu_algorithm = lfu.LFU(self.page_table, self.memory_addresses, keep_states=True)
+        lfu_algorithm.run_algorithm()
+
+        self.assertEqual(10, lfu_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(9, lfu_algorithm.page_table.page_faults)
+        self.assertEqual(3, lfu_algorithm.page_table.writes_to_disk)
+
+        final_state = lfu_algorithm.get_table_states()[-1].frame_table
+        self.assertEqual([0xa9012, 0x01234, 0xdcba9], [frame.vpn for frame in final_state])
+        self.assertEqual([False, True, False], [frame.dirty for frame in final_state])
+
+    def test_frequent_page_is_kept(self):
+        trace = [('00001000', 'R'), ('00001000', 'R'), ('00002000', 'R'), ('00003000', 'R'),
+                 ('00004000', 'R'), ('00005000', 'R'), ('00001000', 'R')]
+        result = lfu.LFU(self.page_table, trace).run_algorithm()
+
+        self.assertEqual(5, result.page_faults)
+        self.assertEqual([0x1, 0x4, 0x5], [frame.vpn for frame in self.page_table.frame_table])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import algorithms.lirs as lirs
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestLirs(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.page_table = pt.PageTable(self.params.frames)
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_algorithm(self):
+        """
+        Important frame fields:
+        - vpn
+        - dirty
+        - in_use
+
+        12345678  12345678    12345678    12345678    12345678    12345678    12345678    12345678    12345678    12345678
+                  01234567    01234567    01234567    01234567    01234567    01234567    cba90123    dcba9012    01234567
+                              90123456    a9012345    a9012345    ba901234    a9012345    a9012345    a9012345    a9012345
+        fault     fault       fault       fault       hit         fault       fault       fault       fault       fault
+        """
+        lirs_algorithm = lirs.LIRS(self.page_table, self.memory_addresses, keep_states=True)
+        lirs_algorithm.run_algorithm()
+
+        self.assertEqual(10, lirs_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(9, lirs_algorithm.page_table.page_faults)
+        self.assertEqual(2, lirs_algorithm.page_table.writes_to_disk)
+
+        final_state = lirs_algorithm.get_table_states()[-1].frame_table
+        self.assertEqual([0x12345, 0x01234, 0xa9012], [frame.vpn for frame in final_state])
+        self.assertEqual([True, True, False], [frame.dirty for frame in final_state])
+
+    def test_loop(self):
+        """
+        Loop over one page more than there are frames: every access is a fault for LRU and Clock.
+        """
+        loop = [('{:05x}000'.format(i % (self.params.frames + 1)), 'R') for i in range(40)]
+        lirs_algorithm = lirs.LIRS(self.page_table, loop)
+        result = lirs_algorithm.run_algorithm()
+
+        self.assertEqual(40, result.total_mem_access)
+        self.assertEqual(22, result.page_faults)
+        self.assertLessEqual(len(lirs_algorithm.non_resident), self.params.frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+import lookahead_divergence
+import tests.test_config as params
+
+
+class TestLookaheadDivergence(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+
+    def test_divergence(self):
+        """
+        Full OPT: 7 page faults, 3 writes. Divergence shrinks as the lookahead grows.
+        """
+        results = lookahead_divergence.divergence(self.params.trace_path, self.params.frames, (0, 1, 10))
+
+        self.assertEqual([(0, 9, 2, 7, 3, 2, 28.57),
+                          (1, 8, 2, 7, 3, 1, 14.29),
+                          (10, 7, 3, 7, 3, 0, 0.0)], results)
+
+
+if __name__ == '__main__':
+    unittest.main()
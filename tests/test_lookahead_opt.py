@@ -0,0 +1,63 @@
+import unittest
+
+import algorithms.lookahead_opt as lookahead_opt
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestLookaheadOpt(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.page_table = pt.PageTable(self.params.frames)
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_algorithm(self):
+        """
+        Lookahead covers the whole trace, so the result is the same as OPT.
+        """
+        opt_algorithm = lookahead_opt.LookaheadOpt(self.page_table, self.memory_addresses, 10, keep_states=True)
+        result = opt_algorithm.run_algorithm()
+
+        self.assertEqual(10, opt_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(7, opt_algorithm.page_table.page_faults)
+        self.assertEqual(3, opt_algorithm.page_table.writes_to_disk)
+        self.assertEqual(10, result.refresh)
+
+        final_state = opt_algorithm.get_table_states()[-1].frame_table
+        self.assertEqual([0xdcba9, 0x01234, 0xa9012], [frame.vpn for frame in final_state])
+
+    def test_bounded_lookahead(self):
+        """
+        Pages used again out of lookahead window look like never used again.
+        12345678 01234567 90123456 90123456 12345678 - on 90123456 fault 1 access lookahead evicts 12345678
+        (lowest ppn among pages not seen in the window), full lookahead evicts 01234567.
+        """
+        trace = [('12345678', 'R'), ('01234567', 'R'), ('90123456', 'R'), ('90123456', 'R'), ('12345678', 'R')]
+
+        bounded = lookahead_opt.LookaheadOpt(pt.PageTable(2), list(trace), 1)
+        bounded.run_algorithm()
+        full = lookahead_opt.LookaheadOpt(pt.PageTable(2), list(trace), 5)
+        full.run_algorithm()
+
+        self.assertEqual(4, bounded.page_table.page_faults)
+        self.assertEqual(3, full.page_table.page_faults)
+
+    def test_feed(self):
+        """
+        Access is processed once `lookahead` accesses after it are fed.
+        """
+        opt_algorithm = lookahead_opt.LookaheadOpt(self.page_table, [], 3)
+        for access in self.memory_addresses[:5]:
+            opt_algorithm.feed(access)
+        self.assertEqual(2, opt_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(3, len(opt_algorithm.window))
+
+        opt_algorithm.flush()
+        self.assertEqual(5, opt_algorithm.page_table.total_memory_accesses)
+        self.assertEqual({}, opt_algorithm.next_uses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import io
+import json
+import unittest
+
+import algorithms.clock as clock
+import algorithms.fifo as fifo
+import input_parser as parser
+import metrics
+import page_table as pt
+import tests.test_config as params
+
+
+class TestWindowedMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def run_with_metrics(self, algorithm, window):
+        output = io.StringIO()
+        alg = algorithm(pt.PageTable(self.params.frames), self.memory_addresses)
+        windowed_metrics = metrics.WindowedMetrics(output, window, alg.__str__())
+        windowed_metrics.attach(alg)
+        alg.run_algorithm()
+        windowed_metrics.close()
+        return [json.loads(line) for line in output.getvalue().splitlines()]
+
+    def test_clock(self):
+        lines = self.run_with_metrics(clock.Clock, 4)
+
+        self.assertEqual([0, 4, 8], [line['start'] for line in lines])
+        self.assertEqual([4, 4, 2], [line['accesses'] for line in lines])
+        self.assertEqual([1.0, 0.75, 1.0], [line['fault_rate'] for line in lines])
+        self.assertEqual([0.25, 0.25, 0.0], [line['dirty_write_rate'] for line in lines])
+        self.assertEqual([3, 3, 3], [line['resident_pages'] for line in lines])
+        self.assertEqual([1, 1, 0], [line['swap_daemon_runs'] for line in lines])
+
+    def test_no_swap_daemon(self):
+        lines = self.run_with_metrics(fifo.FIFO, 5)
+
+        self.assertEqual(['FIFO', 'FIFO'], [line['alg'] for line in lines])
+        self.assertEqual([1.0, 0.8], [line['fault_rate'] for line in lines])
+        self.assertEqual([None, None], [line['swap_daemon_runs'] for line in lines])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+
+import algorithms.aging as aging
+import algorithms.lru as lru
+import algorithms.wsclock as wsclock
+import multiprocess as mp
+
+
+def trace_of(*pages):
+    return iter([('{:05x}000'.format(page), 'R') for page in pages])
+
+
+class TestMultiprocess(unittest.TestCase):
+
+    def test_round_robin(self):
+        accesses = mp.round_robin([trace_of(1, 2, 3), trace_of(4)], quantum=2)
+        self.assertEqual([0, 0, 1, 0], [pid for pid, _ in accesses])
+
+    def test_proportional(self):
+        accesses = list(mp.proportional([trace_of(*range(10)), trace_of(*range(10))], [3, 1]))
+        pids = [pid for pid, _ in accesses]
+
+        self.assertEqual(20, len(accesses))
+        self.assertEqual(6, pids[:8].count(0))
+        self.assertEqual([0] * 10, [pid for pid, _ in accesses if pid == 0])
+
+    def test_timestamped(self):
+        first = iter([('00001000', 'R', '1'), ('00002000', 'W', '5')])
+        second = iter([('00003000', 'R', '2'), ('00004000', 'R', '3')])
+        accesses = list(mp.timestamped([first, second]))
+
+        self.assertEqual([0, 1, 1, 0], [pid for pid, _ in accesses])
+        self.assertEqual('00002000', accesses[-1][1][0])
+
+    def test_global_replacement(self):
+        """
+        Both processes use the same virtual pages, which must not be shared between processes.
+        """
+        accesses = mp.round_robin([trace_of(1, 2, 1, 2), trace_of(1, 2, 1, 2)])
+        _, results = mp.simulate_global(lru.LRU, accesses, 2, 4, 0, 0)
+
+        self.assertEqual(8, results[-1].total_mem_access)
+        self.assertEqual(4, results[-1].page_faults)
+        self.assertEqual([2, 2], [result.page_faults for result in results[:-1]])
+
+    def test_local_replacement(self):
+        accesses = mp.round_robin([trace_of(1, 2, 1, 2), trace_of(1, 2, 3, 1)])
+        _, results = mp.simulate_local(lru.LRU, accesses, [2, 1], 0, 0)
+
+        self.assertEqual([2, 1], [result.frames for result in results[:-1]])
+        self.assertEqual([2, 4], [result.page_faults for result in results[:-1]])
+        self.assertEqual(6, results[-1].page_faults)
+        self.assertEqual(3, results[-1].frames)
+
+    def test_refresh_column(self):
+        """
+        Refresh column holds the parameter of the algorithm, as in vmsim results.
+        """
+        for algorithm, refresh_rate in ((lru.LRU, 'N/A'), (aging.Aging, 5),
+                                        (wsclock.WSClock, wsclock.WSClock.DEFAULT_WINDOW)):
+            _, global_results = mp.simulate_global(algorithm, mp.round_robin([trace_of(1, 2), trace_of(3)]), 2, 2, 5, 0)
+            _, local_results = mp.simulate_local(algorithm, mp.round_robin([trace_of(1, 2), trace_of(3)]), [1, 1], 5, 0)
+
+            self.assertEqual({refresh_rate}, {result.refresh for result in global_results + local_results}, algorithm)
+
+    def test_split_frames(self):
+        self.assertEqual([3, 3, 2], mp.split_frames(8, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
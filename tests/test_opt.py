@@ -48,6 +48,16 @@ class TestOpt(unittest.TestCase):
                     params.cast_decimal_or_none(expected_state[frame_index]['instructions_until_next_reference']),
                     state[frame_index].instructions_until_next_reference)
 
+    def test_hit_refreshes_next_use(self):
+        """
+        Page 3 is accessed again at the end, so pages 0 and 1 (never accessed again) are evicted instead of it.
+        """
+        trace = [(3, 'R'), (3, 'R'), (0, 'R'), (1, 'R'), (2, 'R'), (3, 'R')]
+        for next_uses in (None, [1, 5, 6, 6, 6, 6]):
+            page_table = pt.DecodedPageTable(3)
+            opt.Opt(page_table, list(trace), next_uses=next_uses).run_algorithm()
+            self.assertEqual(4, page_table.page_faults)
+
 
 if __name__ == '__main__':
     unittest.main()
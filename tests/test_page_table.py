@@ -0,0 +1,73 @@
+import itertools
+import random
+import unittest
+
+import algorithms.lru as lru
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+import vmsim
+
+
+class TestPageTable(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_decode_trace(self):
+        trace = [('7ff000398', 'W'), ('12345678', 'R')]
+
+        # 4K pages, 32-bit addresses: the same as PageTable.get_vpn
+        self.assertEqual([(pt.PageTable.get_vpn('7ff000398'), 'W'), (0x12345, 'R')], pt.decode_trace(trace))
+        self.assertEqual([(0x7ff000, 'W'), (0x12345, 'R')], pt.decode_trace(trace, address_bits=64))
+        self.assertEqual([(0x1ffc00, 'W'), (0x48d1, 'R')], pt.decode_trace(trace, pt.PAGE_SIZES['16K'], 64))
+        self.assertEqual([(0x3ff8, 'W'), (0x91, 'R')], pt.decode_trace(trace, pt.PAGE_SIZES['2M'], 64))
+        self.assertEqual(pt.decode_trace(trace, pt.PAGE_SIZES['64K'], 64),
+                         list(pt.iterate_decoded(iter(trace), pt.PAGE_SIZES['64K'], 64)))
+
+    def test_decoded_page_table(self):
+        """
+        Algorithm gives the same results on trace decoded up front.
+        """
+        page_table = pt.DecodedPageTable(self.params.frames)
+        lru_algorithm = lru.LRU(page_table, pt.decode_trace(self.memory_addresses))
+        lru_algorithm.run_algorithm()
+
+        self.assertEqual(10, page_table.total_memory_accesses)
+        self.assertEqual(9, page_table.page_faults)
+        self.assertEqual(2, page_table.writes_to_disk)
+
+    def test_resident_map(self):
+        """
+        VPN map of the page table matches frames holding pages after every access of every algorithm.
+        """
+        generator = random.Random(0)
+        trace = [(generator.randrange(12), generator.choice('RW')) for _ in range(300)]
+        for algorithm in vmsim.ALGORITHMS:
+            page_table = pt.DecodedPageTable(4)
+            alg = vmsim.create_algorithm(algorithm, page_table, [], self.params.refresh, 0, 10,
+                                         next_uses=[0] * len(trace))
+            if algorithm == vmsim.opt.Opt:
+                alg = algorithm(page_table, list(trace))
+            for access in trace:
+                alg.step(access)
+                frames = {frame.vpn: frame for frame in itertools.chain(page_table.frame_table,
+                                                                        page_table.frame_queue.list)
+                          if frame.in_use}
+                self.assertEqual(frames, page_table.resident, alg)
+            self.assertEqual(4, page_table.resident_pages(), alg)
+
+    def test_page_zero_faults(self):
+        """
+        Free frames hold no page, even though their vpn is 0 until the first eviction.
+        """
+        for algorithm in vmsim.ALGORITHMS:
+            page_table = pt.DecodedPageTable(2)
+            vmsim.create_algorithm(algorithm, page_table, [(0, 'R'), (1, 'R'), (0, 'W')], self.params.refresh,
+                                   0).run_algorithm()
+            self.assertEqual(2, page_table.page_faults, algorithm)
+
+
+if __name__ == '__main__':
+    unittest.main()
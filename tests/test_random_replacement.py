@@ -0,0 +1,41 @@
+import unittest
+
+import algorithms.random_replacement as random_replacement
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestRandomReplacement(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.page_table = pt.PageTable(self.params.frames)
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_algorithm(self):
+        random_algorithm = random_replacement.RandomReplacement(self.page_table, self.memory_addresses, seed=0,
+                                                                keep_states=True)
+        random_algorithm.run_algorithm()
+
+        self.assertEqual(10, random_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(9, random_algorithm.page_table.page_faults)
+        self.assertEqual(3, random_algorithm.page_table.writes_to_disk)
+
+        table_states = random_algorithm.get_table_states()
+        # empty frames are used first
+        self.assertEqual([0x12345, 0x01234, 0x90123], [frame.vpn for frame in table_states[2].frame_table])
+        self.assertEqual([0xa9012, 0x01234, 0xdcba9], [frame.vpn for frame in table_states[-1].frame_table])
+
+    def test_same_seed_same_result(self):
+        trace = [('{:05x}000'.format((i * 7) % 11), 'W' if i % 3 else 'R') for i in range(200)]
+        results = []
+        for _ in range(2):
+            result = random_replacement.RandomReplacement(pt.PageTable(self.params.frames), list(trace), seed=42)
+            results.append(vars(result.run_algorithm()))
+
+        self.assertEqual(results[0], results[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+import report
+import results_store
+import vmsim
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = results_store.ResultsStore(':memory:')
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def append(self, trace_file: str, frames: int, page_faults: dict, refresh='N/A'):
+        self.store.append([(alg, trace_file, frames, 100, faults, faults // 2, refresh, 1.5)
+                           for alg, faults in page_faults.items()])
+
+    def test_render_chart(self):
+        document = ElementTree.fromstring(report.render_chart('a.trace', 'Page faults', ['Clock', 'Opt'],
+                                                              [[16, 80, 60], [32, None, 40]]))
+        bars = [bar for bar in document.iter(SVG + 'rect') if bar.find(SVG + 'title') is not None]
+
+        self.assertEqual(['Clock: 80', 'Opt: 60', 'Opt: 40'], [bar.find(SVG + 'title').text for bar in bars])
+        self.assertAlmostEqual(2 * float(bars[2].get('height')), float(bars[0].get('height')))
+
+    def test_tick_step(self):
+        self.assertEqual(20000, report.get_tick_step(80384))
+        self.assertEqual(2, report.get_tick_step(10))
+        self.assertEqual(0.5, report.get_tick_step(2.3))
+
+    def test_only_changed_charts_rendered(self):
+        self.append('a.trace', 16, {'Opt': 60, 'Clock': 80})
+        self.append('b.trace', 16, {'Clock': 90})
+
+        self.assertEqual(['a_faults.svg', 'a_writes.svg', 'a_time.svg', 'b_faults.svg', 'b_writes.svg',
+                          'b_time.svg'], report.generate_report(self.store, self.directory.name))
+        self.assertEqual([], report.generate_report(self.store, self.directory.name))
+
+        self.append('b.trace', 32, {'Clock': 70})
+        self.assertEqual(['b_faults.svg', 'b_writes.svg', 'b_time.svg'],
+                         report.generate_report(self.store, self.directory.name))
+        self.assertEqual(6, len(report.generate_report(self.store, self.directory.name, force=True)))
+
+    def test_algorithm_order(self):
+        self.append('a.trace', 16, {'Opt': 60, 'Aging': 70, 'Clock': 80})
+        report.generate_report(self.store, self.directory.name, ['Clock', 'Opt'])
+
+        document = ElementTree.parse(os.path.join(self.directory.name, 'a_faults.svg'))
+        self.assertEqual(['Clock: 80', 'Opt: 60'], [title.text for title in document.iter(SVG + 'title')])
+
+    def test_algorithm_order_matches_vmsim(self):
+        self.assertEqual(tuple(vmsim.ALGORITHM_NAMES), report.ALGORITHM_ORDER)
+
+    def test_chart_per_refresh(self):
+        """
+        Results of different refresh values aren't averaged, results without refresh are in every chart.
+        """
+        self.append('a.trace', 16, {'Clock': 80})
+        self.append('a.trace', 16, {'Aging': 70}, 1)
+        self.append('a.trace', 16, {'Aging': 50}, 5)
+
+        self.assertEqual(['a_refresh1_faults.svg', 'a_refresh1_writes.svg', 'a_refresh1_time.svg',
+                          'a_refresh5_faults.svg', 'a_refresh5_writes.svg', 'a_refresh5_time.svg'],
+                         report.generate_report(self.store, self.directory.name))
+        document = ElementTree.parse(os.path.join(self.directory.name, 'a_refresh5_faults.svg'))
+        self.assertEqual(['Clock: 80', 'Aging: 50'], [title.text for title in document.iter(SVG + 'title')])
+
+        self.assertEqual(['a_refresh1_faults.svg', 'a_refresh1_writes.svg', 'a_refresh1_time.svg'],
+                         report.generate_report(self.store, self.directory.name, force=True, refreshes=[1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+import results_store
+import vmsim
+
+
+class TestResultsStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = results_store.ResultsStore(os.path.join(self.directory.name, 'results.db'))
+
+    def tearDown(self):
+        self.store.close()
+        self.directory.cleanup()
+
+    def write_results(self, name: str, results: list) -> str:
+        output_file = os.path.join(self.directory.name, name)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+        vmsim.serialize_results(results, output_file)
+        return output_file
+
+    def test_columns_match_vmsim_results(self):
+        self.assertEqual(vmsim.RESULT_HEADER, results_store.COLUMN_NAMES)
+
+    def test_import_tree(self):
+        self.write_results('a_trace/2_frames.csv', [('Clock', 'a.trace', 2, 10, 6, 2, 'N/A', 0.1, 'N/A', 'N/A',
+                                                     'N/A', 'N/A', 'N/A'),
+                                                    ('Aging', 'a.trace', 2, 10, 5, 1, 5, 0.1, 'N/A', 'N/A',
+                                                     'N/A', 'N/A', 'N/A')])
+        self.write_results('a_trace/4_frames.csv', [('Clock', 'a.trace', 4, 10, 4, 1, 'N/A', 0.1, 'N/A', 'N/A',
+                                                     'N/A', 'N/A', 'N/A')])
+        with open(os.path.join(self.directory.name, 'a_trace/miss_curves.csv'), 'w') as other:
+            other.write('frames,lru_faults,opt_faults\n1,10,10\n')
+
+        self.assertEqual(3, self.store.import_tree(self.directory.name))
+        # unchanged files aren't imported again
+        self.assertEqual(0, self.store.import_tree(self.directory.name))
+
+        column_keys, rows = self.store.pivot('page_faults', 'frames', 'alg', 'avg', {'trace_file': ['a.trace']})
+        self.assertEqual(['Aging', 'Clock'], column_keys)
+        self.assertEqual([[2, 5.0, 6.0], [4, None, 4.0]], rows)
+        self.assertEqual([[None, 2]], self.store.pivot('frames', 'refresh', 'alg', 'count',
+                                                       {'alg': ['Clock']})[1])
+
+    def test_sync_tree(self):
+        """
+        Rewritten results file replaces its rows, rows of deleted file are dropped.
+        """
+        row = ('LRU', 'b.trace', 3, 8, 5, 2, 'N/A', 0.2, 'N/A', 'N/A', 'N/A', 'N/A', 'N/A')
+        output_file = self.write_results('b_trace/3_frames.csv', [row])
+        other_file = self.write_results('b_trace/4_frames.csv', [row[:2] + (4,) + row[3:]])
+        self.assertEqual(2, self.store.sync_tree(self.directory.name))
+        self.assertEqual(0, self.store.sync_tree(self.directory.name))
+
+        self.write_results('b_trace/3_frames.csv', [row, row])
+        os.utime(output_file, ns=(0, 0))
+        os.remove(other_file)
+        self.assertEqual(2, self.store.sync_tree(self.directory.name))
+
+        self.assertEqual([[3, 2]], self.store.pivot('page_faults', 'frames', 'alg', 'count')[1])
+        self.assertEqual([None], self.store.distinct('refresh', {'frames': [3]}))
+
+    def test_append_only(self):
+        """
+        Rewritten results file is appended as another run.
+        """
+        row = ('LRU', 'b.trace', 3, 8, 5, 2, 'N/A', 0.2, 'N/A', 'N/A', 'N/A', 'N/A', 'N/A')
+        output_file = self.write_results('b_trace/3_frames.csv', [row])
+        self.store.import_csv(output_file)
+        self.write_results('b_trace/3_frames.csv', [row, row])
+        os.utime(output_file, ns=(0, 0))
+        self.store.import_csv(output_file)
+
+        self.assertEqual([[3, 3]], self.store.pivot('page_faults', 'frames', 'alg', 'count')[1])
+        self.assertEqual([[3, 15]], self.store.pivot('page_faults', 'frames', 'alg', 'sum')[1])
+
+    def test_short_results(self):
+        """
+        Results written before TLB and cost model columns were added.
+        """
+        output_file = os.path.join(self.directory.name, 'old.csv')
+        with open(output_file, 'w') as old:
+            old.write('alg,trace_file,frames,total_mem_access,page_faults,writes,refresh,total_time\n'
+                      'Opt,c.trace,2,10,4,1,N/A,0.5\n')
+
+        self.assertEqual(1, self.store.import_csv(output_file))
+        self.assertEqual([['Opt', None]], self.store.pivot('tlb_hits', 'alg', 'trace_file', 'max')[1])
+
+    def test_timing_results(self):
+        """
+        Timing summary columns follow the results columns, total_time is the median run time.
+        """
+        output_file = os.path.join(self.directory.name, '3_frames_timing.csv')
+        vmsim.serialize_timings([('LRU', 'b.trace', 3, 8, 5, 2, 'N/A', 0.3, 'N/A', 'N/A', 'N/A', 'N/A', 'N/A',
+                                  5, 0.2, 0.05, 26667)], output_file)
+
+        self.assertEqual(1, self.store.import_csv(output_file))
+        self.assertEqual([[3, 0.3]], self.store.pivot('total_time', 'frames', 'alg', 'avg')[1])
+
+    def test_invalid_columns(self):
+        self.assertRaises(ValueError, self.store.pivot, 'faults')
+        self.assertRaises(ValueError, self.store.pivot, 'page_faults', 'frames', 'alg', 'median')
+        self.assertRaises(ValueError, self.store.pivot, filters={'alg; DROP TABLE results': ['x']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import collections
+import os
+import random
+import tempfile
+import unittest
+
+import autosize
+import reuse_analysis
+
+
+class TestReuseAnalysis(unittest.TestCase):
+
+    def test_analyze(self):
+        distances, gaps, page_accesses = reuse_analysis.analyze(iter([1, 2, 1, 1, 3, 2]))
+
+        self.assertEqual({None: 3, 2: 1, 1: 1, 3: 1}, distances)
+        self.assertEqual({None: 3, 2: 1, 1: 1, 4: 1}, gaps)
+        self.assertEqual({1: 3, 2: 2, 3: 1}, page_accesses)
+
+    def test_tree_compaction(self):
+        """
+        Renumbering positions of a small Fenwick tree doesn't change reuse distances.
+        """
+        generator = random.Random(0)
+        vpns = [generator.randrange(30) for _ in range(1000)]
+        expected = list(autosize.iterate_reuse(vpns))
+
+        min_tree_size = autosize.MIN_TREE_SIZE
+        autosize.MIN_TREE_SIZE = 4
+        try:
+            self.assertEqual(expected, list(autosize.iterate_reuse(vpns)))
+        finally:
+            autosize.MIN_TREE_SIZE = min_tree_size
+
+        # LRU stack: distinct pages since the previous access, the page itself included
+        stack = []
+        for vpn, (distance, _) in zip(vpns, expected):
+            self.assertEqual(len(stack) - stack.index(vpn) if vpn in stack else None, distance)
+            if vpn in stack:
+                stack.remove(vpn)
+            stack.append(vpn)
+
+    def test_bucket_log2(self):
+        self.assertEqual({None: 2, 1: 1, 2: 5, 4: 4, 8: 1},
+                         reuse_analysis.bucket_log2(collections.Counter({None: 2, 1: 1, 2: 2, 3: 3, 4: 1, 7: 3, 8: 1})))
+
+    def test_serialize_histogram(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output_file = os.path.join(directory, 'histogram.csv')
+            reuse_analysis.serialize_histogram(collections.Counter({None: 1, 3: 2, 1: 1}), 'gap', output_file)
+            with open(output_file) as output:
+                self.assertEqual('gap,accesses,cumulative_share\ncold,1,0.25\n1,1,0.5\n3,2,1.0\n', output.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import asyncio
+import concurrent.futures
+import unittest
+from unittest import mock
+
+import service
+import tests.test_config as params
+
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+
+    def test_parse_job(self):
+        tasks = service.parse_job({'trace': self.params.trace_path, 'algorithms': ['Clock', 'Opt'], 'frames': [3, 4]})
+
+        self.assertEqual([(self.params.trace_path, 'Clock', 3, 5, 0), (self.params.trace_path, 'Opt', 3, 5, 0),
+                          (self.params.trace_path, 'Clock', 4, 5, 0), (self.params.trace_path, 'Opt', 4, 5, 0)],
+                         tasks)
+        self.assertEqual(len(service.ALGORITHM_NAMES), len(service.parse_job({'trace': self.params.trace_path})))
+        self.assertRaises(ValueError, service.parse_job, {'trace': 'missing.trace'})
+        self.assertRaises(ValueError, service.parse_job, {'trace': self.params.trace_path, 'algorithms': ['Foo']})
+        self.assertRaises(ValueError, service.parse_job, {'trace': self.params.trace_path, 'frames': 0})
+
+    def test_load_trace_is_cached(self):
+        trace = service.load_trace(self.params.trace_path)
+
+        self.assertIs(trace, service.load_trace(self.params.trace_path))
+        self.assertEqual(10, len(trace))
+        self.assertEqual((0x12345, 'R'), trace[0])
+
+    def test_run_job(self):
+        simulation_service = service.SimulationService(workers=2)
+        try:
+            response = asyncio.run(simulation_service.run_job(
+                {'trace': self.params.trace_path, 'algorithms': ['Clock', 'Aging'], 'frames': 3,
+                 'refresh': self.params.refresh}))
+        finally:
+            simulation_service.close()
+
+        results = response['results']
+        self.assertEqual(['Clock', 'Aging'], [result['alg'] for result in results])
+        self.assertEqual([9, 9], [result['page_faults'] for result in results])
+        self.assertEqual([2, 3], [result['writes'] for result in results])
+        self.assertEqual(['N/A', 3], [result['refresh'] for result in results])
+
+        error = asyncio.run(simulation_service.run_job({'trace': 'missing.trace'}))
+        self.assertEqual({'error': "Trace file 'missing.trace' doesn't exist."}, error)
+
+    def test_run_job_worker_errors(self):
+        simulation_service = service.SimulationService(workers=1)
+        simulation_service.executor.shutdown()
+        simulation_service.executor = concurrent.futures.ThreadPoolExecutor(1)
+        request = {'trace': self.params.trace_path, 'algorithms': ['Clock'], 'frames': 3}
+        try:
+            with mock.patch('service.run_task', side_effect=KeyError('Clock')), self.assertLogs(service.LOG):
+                self.assertEqual({'error': "KeyError: 'Clock'"}, asyncio.run(simulation_service.run_job(request)))
+            with mock.patch('service.run_task', side_effect=concurrent.futures.process.BrokenProcessPool('died')), \
+                    self.assertLogs(service.LOG):
+                self.assertIn('error', asyncio.run(simulation_service.run_job(request)))
+            self.assertEqual(9, asyncio.run(simulation_service.run_job(request))['results'][0]['page_faults'])
+        finally:
+            simulation_service.close()
+
+        self.assertEqual({'error': 'Request should be a JSON object.'},
+                         asyncio.run(simulation_service.run_job([request])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import functools
+import unittest
+
+import algorithms.aging as aging
+import algorithms.clock as clock
+import algorithms.lru as lru
+import algorithms.opt as opt
+import algorithms.wsclock as wsclock
+import input_parser as parser
+import page_table as pt
+import set_partition
+import tests.test_config as params
+import vmsim
+
+
+class TestSetPartition(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.trace = list(pt.iterate_decoded(parser.iterate_trace_file(self.params.trace_path)))
+        self.factory = functools.partial(vmsim.create_algorithm, refresh=self.params.refresh, seed=0)
+
+    def test_split_keeps_order(self):
+        set_traces = set_partition.split_trace(self.trace, 3)
+
+        self.assertEqual(3, len(set_traces))
+        self.assertEqual(len(self.trace), sum(len(set_trace) for set_trace in set_traces))
+        for set_index, set_trace in enumerate(set_traces):
+            self.assertEqual([access for access in self.trace if set_partition.get_set(access[0], 3) == set_index],
+                             set_trace)
+
+    def test_modulo_index(self):
+        set_traces = set_partition.split_trace([(vpn, 'R') for vpn in range(10)], 4, set_partition.MODULO)
+
+        self.assertEqual([[(0, 'R'), (4, 'R'), (8, 'R')], [(1, 'R'), (5, 'R'), (9, 'R')], [(2, 'R'), (6, 'R')],
+                          [(3, 'R'), (7, 'R')]], set_traces)
+
+    def test_hash_index_spreads_strides(self):
+        set_traces = set_partition.split_trace([(vpn * 8, 'R') for vpn in range(800)], 8)
+
+        self.assertTrue(all(set_traces))
+
+    def test_single_set_matches_run(self):
+        algorithms = [clock.Clock, lru.LRU, opt.Opt]
+        set_results = set_partition.simulate([list(self.trace)], algorithms, self.params.frames, self.factory,
+                                             workers=1)
+
+        for algorithm, set_result in zip(algorithms, set_results):
+            page_table = pt.DecodedPageTable(self.params.frames)
+            result_tuple = vmsim.create_algorithm(algorithm, page_table, list(self.trace), self.params.refresh,
+                                                   0).run_algorithm()
+            self.assertEqual((result_tuple.page_faults, result_tuple.writes), set_result[4:], algorithm)
+
+    def test_virtual_time(self):
+        """
+        Set traces keep virtual time of the whole trace, with one set it's the same as virtual time of the set.
+        """
+        set_traces = set_partition.split_trace(self.trace, 1, keep_time=True)
+        self.assertEqual([(vpn, read_or_write, virtual_time)
+                          for virtual_time, (vpn, read_or_write) in enumerate(self.trace, 1)], set_traces[0])
+
+        algorithms = [aging.Aging, wsclock.WSClock, opt.Opt]
+        self.assertEqual(set_partition.simulate([list(self.trace)], algorithms, self.params.frames, self.factory,
+                                                workers=1),
+                         set_partition.simulate(set_traces, algorithms, self.params.frames, self.factory, workers=1))
+
+    def test_aging_idle_ticks(self):
+        """
+        Refresh = 2 accesses. Page 1 is accessed at time 1, page 2 at time 10: 8 idle ticks in between
+        shift counters 4 times, the access of page 2 completes the next refresh.
+        """
+        alg = aging.Aging(pt.DecodedPageTable(2), [], 2)
+        alg.step((1, 'R'))
+        alg.page_table.total_memory_accesses = 9
+        alg.step((2, 'R'))
+
+        self.assertEqual([(1, 0x0400), (2, 0x4000)], [(frame.vpn, frame.aging_value)
+                                                      for frame in alg.page_table.frame_table])
+        self.assertEqual(0, alg.time_of_last_refresh)
+
+    def test_merge(self):
+        set_traces = set_partition.split_trace(self.trace, 2)
+        set_results = set_partition.simulate(set_traces, [clock.Clock, lru.LRU], 2, self.factory, workers=2)
+        results, skew_rows = set_partition.merge_results(set_results, [clock.Clock, lru.LRU], 'test.trace', 2, 2, 1.0)
+
+        self.assertEqual(set_results, set_partition.simulate(set_traces, [clock.Clock, lru.LRU], 2, self.factory,
+                                                             workers=1))
+        self.assertEqual(['Clock', 'LRU'], [result[0] for result in results])
+        self.assertEqual([('Clock', 0), ('Clock', 1), ('LRU', 0), ('LRU', 1)], [row[:2] for row in skew_rows])
+        for result in results:
+            rows = [row for row in skew_rows if row[0] == result[0]]
+            self.assertEqual(len(self.trace), result[4])
+            self.assertEqual(sum(row[5] for row in rows), result[5])
+            self.assertEqual(sum(row[6] for row in rows), result[6])
+            self.assertAlmostEqual(1, sum(row[7] for row in rows), places=5)
+
+    def test_skew(self):
+        self.assertEqual(1.0, set_partition.get_skew([5, 5, 5]))
+        self.assertEqual(4.0, set_partition.get_skew([4, 0, 0, 0]))
+        self.assertEqual(1.0, set_partition.get_skew([0, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
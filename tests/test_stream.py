@@ -0,0 +1,89 @@
+import argparse
+import copy
+import csv
+import os
+import tempfile
+import unittest
+
+import algorithms.clock as clock
+import algorithms.lookahead_opt as lookahead_opt
+import algorithms.opt as opt
+import autosize
+import cost_model as cm
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+import vmsim
+
+
+class TestStream(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_run_stream(self):
+        """
+        Streamed results are the same as results of runs on the whole trace, snapshots are taken
+        after every buffered batch which crosses snapshot interval.
+        """
+        algs = [vmsim.create_algorithm(algorithm, pt.PageTable(self.params.frames), [], self.params.refresh, 0)
+                for algorithm in vmsim.STREAM_ALGORITHMS]
+        models = [(cm.CostModel(cm.NVME), None) for _ in algs]
+        for alg, (cost, _) in zip(algs, models):
+            cost.attach(alg)
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_file = os.path.join(output_dir, '3_frames.csv')
+            results = vmsim.run_stream(iter(self.memory_addresses), 'test.trace', algs, models, output_file, 4, 6)
+            with open(os.path.join(output_dir, '3_frames_snapshots.csv')) as snapshots:
+                snapshot_rows = list(csv.DictReader(snapshots))
+
+        self.assertEqual(['Clock', 'LRU', 'Aging', 'LookaheadOpt'], [result[0] for result in results])
+        self.assertEqual([10, 10, 10, 10], [result[3] for result in results])
+        self.assertEqual([9, 9, 9, 7], [result[4] for result in results])
+        self.assertEqual([2, 2, 3, 3], [result[5] for result in results])
+
+        # snapshot after 8 accesses, LookaheadOpt still keeps all of them in its lookahead window
+        self.assertEqual(['8', '8', '8', '0'], [row['total_mem_access'] for row in snapshot_rows])
+
+    def test_lockstep_same_as_separate_runs(self):
+        """
+        All algorithms (OPT with next-use array) for several numbers of frames fed access by access in lock-step
+        give the same results as separate runs on the whole trace.
+        """
+        trace = pt.decode_trace(self.memory_addresses)
+        next_uses = autosize.get_next_uses([access[0] for access in trace])
+        expected = []
+        algs = []
+        for num_frames in (2, 3, 4):
+            for algorithm in vmsim.ALGORITHMS:
+                alg = vmsim.create_algorithm(algorithm, pt.DecodedPageTable(num_frames), copy.copy(trace),
+                                             self.params.refresh, 0, next_uses=next_uses)
+                expected.append(alg.run_algorithm().get_result(alg.__str__(), 'test.trace', 0)[:7])
+                algs.append(vmsim.create_algorithm(algorithm, pt.DecodedPageTable(num_frames), [],
+                                                   self.params.refresh, 0, next_uses=next_uses))
+        models = [(cm.CostModel(cm.NVME), None) for _ in algs]
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = vmsim.run_stream(iter(trace), 'test.trace', algs, models,
+                                       os.path.join(output_dir, '2_3_4_frames.csv'), 4, 100)
+
+        self.assertEqual(expected, [result[:7] for result in results])
+
+    def test_stream_algorithms(self):
+        args = argparse.Namespace(algorithms=None)
+        self.assertEqual(list(vmsim.STREAM_ALGORITHMS), vmsim.get_stream_algorithms(args))
+        self.assertEqual(opt.Opt, vmsim.get_stream_algorithms(args, [1])[-1])
+        self.assertEqual(list(vmsim.ALGORITHMS), vmsim.get_stream_algorithms(args, [1], vmsim.ALGORITHMS))
+
+        args.algorithms = 'Clock,Opt'
+        self.assertEqual([clock.Clock, lookahead_opt.LookaheadOpt], vmsim.get_stream_algorithms(args))
+        self.assertEqual([clock.Clock, opt.Opt], vmsim.get_stream_algorithms(args, [1]))
+
+        args.algorithms = 'Clock,MRU'
+        self.assertRaises(ValueError, vmsim.get_stream_algorithms, args)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import gc
+import logging
+import unittest
+
+import algorithms.clock as clock
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+import timing
+
+
+class TestTiming(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+        self.created = 0
+
+    def create(self):
+        self.created += 1
+        return clock.Clock(pt.PageTable(self.params.frames), list(self.memory_addresses))
+
+    def test_time_algorithm(self):
+        result_tuple, summary = timing.time_algorithm(self.create, repeat=3, warmup=2)
+
+        self.assertEqual(5, self.created)
+        self.assertEqual(3, len(summary.times))
+        self.assertEqual('Clock', summary.name)
+        self.assertEqual(len(self.memory_addresses), result_tuple.total_mem_access)
+        self.assertLessEqual(summary.min, summary.median)
+
+    def test_gc_and_logging_restored(self):
+        gc_enabled = gc.isenabled()
+        timing.time_run(self.create())
+
+        self.assertEqual(gc_enabled, gc.isenabled())
+        self.assertEqual(logging.NOTSET, logging.root.manager.disable)
+
+    def test_summary(self):
+        summary = timing.TimingSummary('LRU', 1000, [4.0, 2.0, 3.0])
+
+        self.assertEqual(2.0, summary.min)
+        self.assertEqual(3.0, summary.median)
+        self.assertEqual(1.0, summary.stddev)
+        self.assertAlmostEqual(1000 / 3.0 * 1000, summary.accesses_per_second)
+        self.assertEqual((3, 2.0, 1.0, 333333), summary.get_columns())
+        self.assertEqual(0.0, timing.TimingSummary('LRU', 10, [1.0]).stddev)
+
+    def test_invalid_repeat(self):
+        self.assertRaises(ValueError, timing.time_algorithm, self.create, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import algorithms.lirs as lirs
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+import tlb
+
+
+class TestTLB(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+
+    @staticmethod
+    def resident_frame(vpn):
+        frame = pt.Frame()
+        frame.in_use = True
+        frame.vpn = vpn
+        return frame
+
+    def test_lru_set(self):
+        """
+        4 entries, 2 ways: even VPNs go to set 0, odd VPNs to set 1.
+        """
+        tlb_model = tlb.TLB(4, 2)
+        for vpn in (0, 2, 1):
+            self.assertFalse(tlb_model.lookup(vpn))
+            tlb_model.insert(vpn, self.resident_frame(vpn))
+
+        self.assertTrue(tlb_model.lookup(0))
+        # set 0 is full, 2 is the least recently used entry
+        tlb_model.insert(4, self.resident_frame(4))
+
+        self.assertTrue(tlb_model.lookup(0))
+        self.assertFalse(tlb_model.lookup(2))
+        self.assertTrue(tlb_model.lookup(4))
+        self.assertTrue(tlb_model.lookup(1))
+        self.assertEqual((4, 4), tlb_model.get_result())
+
+    def test_random_set(self):
+        tlb_model = tlb.TLB(2, 2, tlb.RANDOM, seed=1)
+        for vpn in range(10):
+            tlb_model.insert(vpn, self.resident_frame(vpn))
+
+        self.assertEqual(2, len(tlb_model.sets[0]))
+        self.assertRaises(ValueError, tlb.TLB, 6, 4)
+
+    def test_evicted_page(self):
+        """
+        Translation of evicted page is invalid.
+        """
+        tlb_model = tlb.TLB(4, 4)
+        frame = self.resident_frame(7)
+        tlb_model.insert(7, frame)
+        frame.vpn = 8
+
+        self.assertFalse(tlb_model.lookup(7))
+        self.assertEqual(0, len(tlb_model.sets[0]))
+
+    def test_attach(self):
+        """
+        2 entries, direct mapped. 12345678 is a page table hit on 5th access, but its translation was replaced
+        by 90123456 in set 1. Translation of a9012345 is still cached on 7th access, but LIRS evicted the page
+        on 6th access.
+        """
+        page_table = pt.PageTable(self.params.frames)
+        algorithm = lirs.LIRS(page_table, parser.parse_trace_file(self.params.trace_path))
+        tlb_model = tlb.TLB(2, 1)
+        tlb_model.attach(algorithm)
+        algorithm.run_algorithm()
+
+        self.assertEqual(9, page_table.page_faults)
+        self.assertEqual((0, 10), tlb_model.get_result())
+
+
+if __name__ == '__main__':
+    unittest.main()
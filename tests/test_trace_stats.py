@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import algorithms.opt as opt
+import autosize
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+import trace_stats
+
+
+class TestTraceStats(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.directory = tempfile.TemporaryDirectory()
+        self.trace_file = os.path.join(self.directory.name, 'test.trace')
+        shutil.copyfile(self.params.trace_path, self.trace_file)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_stats(self):
+        """
+        Test trace: 10 accesses of 7 pages, 4 writes.
+        """
+        stats = trace_stats.load_stats(self.trace_file)
+
+        self.assertEqual({'accesses': 10, 'unique_pages': 7, 'footprint': 7 * 4096, 'write_ratio': 0.4},
+                         stats.get_summary())
+        self.assertEqual(7, stats.cold_accesses)
+        self.assertEqual(10, sum(stats.vpn_histogram.values()))
+        self.assertEqual([10, 10, 10, 9, 8, 8, 8, 7], stats.lru_miss_curve())
+        self.assertEqual(10, len(stats.next_uses))
+
+    def test_sidecar_is_reused(self):
+        stats = trace_stats.load_stats(self.trace_file)
+        sidecar = trace_stats.read_sidecar(trace_stats.get_sidecar_file(self.trace_file))
+
+        self.assertEqual(vars(stats), vars(sidecar))
+
+        # sidecar is used as long as the trace doesn't change, even if it's out of date
+        stale = trace_stats.TraceStats(stats.content_hash, stats.layout, 10, 1.0, 0, {}, {}, stats.next_uses)
+        trace_stats.write_sidecar(stale, trace_stats.get_sidecar_file(self.trace_file))
+        self.assertEqual(1.0, trace_stats.load_stats(self.trace_file).write_ratio)
+
+    def test_sidecar_is_not_saved(self):
+        stats = trace_stats.load_stats(self.trace_file, save=False)
+
+        self.assertEqual(10, stats.accesses)
+        self.assertIsNone(stats.content_hash)
+        self.assertFalse(os.path.exists(trace_stats.get_sidecar_file(self.trace_file)))
+
+        # existing sidecar is still read
+        trace_stats.load_stats(self.trace_file)
+        self.assertIsNotNone(trace_stats.load_stats(self.trace_file, save=False).content_hash)
+
+    def test_sidecar_is_invalidated(self):
+        trace_stats.load_stats(self.trace_file)
+
+        with open(self.trace_file, 'a') as trace:
+            trace.write('\n0badc0de W\n')
+        self.assertEqual(11, trace_stats.load_stats(self.trace_file).accesses)
+
+        # other page size
+        stats = trace_stats.load_stats(self.trace_file, page_size=pt.PAGE_SIZES['2M'])
+        self.assertEqual(pt.PAGE_SIZES['2M'], stats.layout['page_size'])
+        trace = pt.decode_trace(parser.parse_trace_file(self.trace_file), pt.PAGE_SIZES['2M'])
+        self.assertEqual(len({access[0] for access in trace}), stats.unique_pages)
+
+    def test_corrupted_sidecar(self):
+        with open(trace_stats.get_sidecar_file(self.trace_file), 'w') as sidecar:
+            sidecar.write('{not json\n')
+        self.assertEqual(10, trace_stats.load_stats(self.trace_file).accesses)
+
+    def test_opt_with_next_uses(self):
+        stats = trace_stats.load_stats(self.trace_file)
+        trace = pt.decode_trace(parser.parse_trace_file(self.trace_file))
+
+        page_table = pt.DecodedPageTable(self.params.frames)
+        opt.Opt(page_table, list(trace), next_uses=stats.next_uses).run_algorithm()
+        self.assertEqual(7, page_table.page_faults)
+        self.assertEqual(3, page_table.writes_to_disk)
+        self.assertEqual(autosize.get_next_uses([access[0] for access in trace]), list(stats.next_uses))
+
+
+if __name__ == '__main__':
+    unittest.main()
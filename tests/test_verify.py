@@ -0,0 +1,83 @@
+import unittest
+
+import algorithms.clock as clock
+import algorithms.fifo as fifo
+import algorithms.lru as lru
+import input_parser as parser
+import tests.test_config as params
+import verify
+
+
+def run_broken_clock(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+    """
+    Clock which counts an extra fault for traces with writes.
+    """
+    page_faults, writes, states = verify.run_on_vpns(clock.Clock)(trace, frames, refresh, keep_states)
+    return page_faults + any(access[1] == 'W' for access in trace), writes, states
+
+
+class TestVerify(unittest.TestCase):
+
+    def tearDown(self):
+        for check in ('Broken', 'CandidateLRU', 'FifoAsLRU'):
+            verify.CHECKS.pop(check, None)
+
+    def test_reference_models(self):
+        """
+        Reference models on the test trace (3 frames) give the results of the tests of the algorithms.
+        """
+        test_params = params.PublicParams()
+        trace = parser.parse_trace_file(test_params.trace_path)
+        expected = {'Clock': (9, 2), 'LRU': (9, 2), 'Aging': (9, 3), 'Opt': (7, 3)}
+
+        self.assertEqual(expected, {name: reference(trace, 3, test_params.refresh, False)[:2]
+                                    for name, reference in verify.REFERENCE_MODELS.items()})
+
+    def test_engines_agree(self):
+        done, failures = verify.verify(list(verify.CHECKS), cases=6, max_length=30, keep_states=True, workers=1)
+
+        self.assertEqual(6, done)
+        self.assertEqual([], failures)
+
+    def test_mismatch_shrunk(self):
+        verify.CHECKS['Broken'] = (verify.run_on_addresses(clock.Clock), run_broken_clock)
+        done, failures = verify.verify(['Broken'], cases=4, max_length=50, workers=1)
+
+        self.assertEqual(4, done)
+        self.assertTrue(failures)
+        for check, _, _, _, _, mismatch, trace in failures:
+            self.assertEqual('Broken', check)
+            self.assertTrue(mismatch.startswith('faults'))
+            self.assertEqual(1, len(trace))
+            self.assertEqual('W', trace[0][1])
+
+    def test_register_candidate(self):
+        self.assertEqual('CandidateLRU', verify.load_candidate('LRU=algorithms.lru:LRU'))
+        verify.register_candidate('FifoAsLRU', 'LRU', fifo.FIFO)
+
+        self.assertEqual((6, []), verify.verify(['CandidateLRU'], cases=6, max_length=30, workers=1))
+        self.assertTrue(verify.verify(['FifoAsLRU'], cases=20, max_length=50, workers=1)[1])
+        self.assertIs(verify.REFERENCE_MODELS['LRU'], verify.CHECKS['CandidateLRU'][0])
+        self.assertRaises(ValueError, verify.register_candidate, 'Foo', 'Foo', lru.LRU)
+        self.assertRaises(ValueError, verify.load_candidate, 'LRU=algorithms.lru')
+        self.assertRaises(ValueError, verify.load_candidate, 'LRU=algorithms.lru:Foo')
+
+    def test_shrink(self):
+        trace = [(address, 'W') for address in ('1000', '2000', '3000', '4000', '5000', '6000', '7000')]
+        shrunk = verify.shrink(trace, lambda candidate: {'2000', '6000'} <= {access[0] for access in candidate})
+
+        self.assertEqual([('2000', 'R'), ('6000', 'R')], shrunk)
+
+    def test_cases_reproducible(self):
+        self.assertEqual(verify.generate_case(11, 100), verify.generate_case(11, 100))
+        self.assertLessEqual(len(verify.generate_case(12, 100)[1]), 100)
+
+    def test_budget(self):
+        done, failures = verify.verify(['Clock'], cases=100, workers=1, budget=-1)
+
+        self.assertEqual(0, done)
+        self.assertEqual([], failures)
+
+
+if __name__ == '__main__':
+    unittest.main()
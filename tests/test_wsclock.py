@@ -0,0 +1,74 @@
+import unittest
+
+import algorithms.wsclock as wsclock
+import input_parser as parser
+import page_table as pt
+import tests.test_config as params
+
+
+class TestWSClock(unittest.TestCase):
+
+    def setUp(self):
+        self.params = params.PublicParams()
+        self.page_table = pt.PageTable(self.params.frames)
+        self.memory_addresses = parser.parse_trace_file(self.params.trace_path)
+
+    def test_algorithm(self):
+        """
+        Window = 2 accesses. Important frame fields:
+        - vpn
+        - dirty
+        - in_use
+
+        12345678  12345678    12345678    a9012345    a9012345    a9012345    a9012345    cba90123    cba90123    cba90123
+                  01234567    01234567    01234567    12345678    12345678    12345678    12345678    dcba9012    dcba9012
+                              90123456    90123456    90123456    ba901234    ba901234    ba901234    ba901234    01234567
+        fault     fault       fault       fault       fault       fault       hit         fault       fault       fault
+                                                                  (write)                 (write)
+        """
+        wsclock_algorithm = wsclock.WSClock(self.page_table, self.memory_addresses, 2, sample_interval=2,
+                                            keep_states=True)
+        result = wsclock_algorithm.run_algorithm()
+
+        self.assertEqual(10, wsclock_algorithm.page_table.total_memory_accesses)
+        self.assertEqual(9, wsclock_algorithm.page_table.page_faults)
+        self.assertEqual(2, wsclock_algorithm.page_table.writes_to_disk)
+        self.assertEqual(2, result.refresh)
+
+        final_state = wsclock_algorithm.get_table_states()[-1].frame_queue.list
+        self.assertEqual([0xcba90, 0xdcba9, 0x01234], [frame.vpn for frame in final_state])
+        self.assertEqual([True, False, True], [frame.dirty for frame in final_state])
+
+    def test_pending_writes(self):
+        """
+        Window = 1 access. The write of page 2 is scheduled on the fault of page 5 and done when the hand
+        comes back to it, page 2 is then evicted without another write. If page 2 is written while its write
+        is pending, it stays dirty and its write is scheduled again.
+        """
+        for read_or_write, writes, page_2_dirty in (('R', 2, None), ('W', 3, True)):
+            trace = [(1, 'W'), (2, 'W'), (3, 'R'), (4, 'R'), (5, 'R'), (2, read_or_write), (6, 'R'), (7, 'R')]
+            wsclock_algorithm = wsclock.WSClock(pt.DecodedPageTable(3), trace, 1)
+            wsclock_algorithm.run_algorithm()
+
+            self.assertEqual(7, wsclock_algorithm.page_table.page_faults)
+            self.assertEqual(writes, wsclock_algorithm.page_table.writes_to_disk)
+            self.assertEqual(page_2_dirty, {frame.vpn: frame.dirty
+                                            for frame in wsclock_algorithm.frame_queue.list}.get(2))
+
+    def test_working_set_sizes(self):
+        wsclock_algorithm = wsclock.WSClock(self.page_table, self.memory_addresses, 100, sample_interval=2)
+        wsclock_algorithm.run_algorithm()
+
+        self.assertEqual([(2, 2, 2), (4, 4, 3), (6, 5, 3), (8, 6, 3), (10, 7, 3)],
+                         wsclock_algorithm.get_working_set_sizes())
+
+    def test_invalid_window(self):
+        self.assertRaises(ValueError, wsclock.WSClock, self.page_table, self.memory_addresses, 0)
+
+        wsclock_algorithm = wsclock.WSClock(self.page_table, self.memory_addresses, 1)
+        wsclock_algorithm.run_algorithm()
+        self.assertEqual(10, wsclock_algorithm.page_table.total_memory_accesses)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Timing harness
+
+Repeatable timing of algorithm runs:
+- monotonic high-resolution clock (time.perf_counter),
+- warmup runs, which aren't measured (imports, caches, allocator),
+- every run on a fresh algorithm instance, which is created outside the measured time,
+- garbage collection before every run and disabled during it, logging below WARNING suppressed during it.
+Summary of measured runs: min, median, standard deviation and accesses per second (of the median run).
+vmsim writes the median as `total_time` of results row followed by TIMING_COLUMNS, so the results store
+and report use it as any other run time.
+
+Used by vmsim timing mode (`--repeat`, `--warmup`).
+"""
+import gc
+import logging
+import statistics
+import time
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 5
+DEFAULT_WARMUP = 1
+
+# columns following the results columns (vmsim.RESULT_HEADER), whose total_time is the median
+TIMING_COLUMNS = ('runs', 'min_ms', 'stddev_ms', 'accesses_per_sec')
+
+
+class TimingSummary:
+    """
+    Times of repeated runs of one algorithm.
+    """
+
+    def __init__(self, name: str, accesses: int, times: list):
+        """
+        :param name: algorithm name
+        :param accesses: number of memory accesses of a run
+        :param times: times of measured runs [ms]
+        """
+        self.name: str = name
+        self.accesses: int = accesses
+        self.times: list = times
+
+    @property
+    def min(self) -> float:
+        return min(self.times)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def stddev(self) -> float:
+        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+
+    @property
+    def accesses_per_second(self) -> float:
+        return self.accesses / self.median * 1000 if self.median > 0 else 0.0
+
+    def get_columns(self) -> tuple:
+        """
+        :return: values of TIMING_COLUMNS
+        """
+        return len(self.times), round(self.min, 3), round(self.stddev, 3), round(self.accesses_per_second)
+
+
+def time_run(alg, disable_gc: bool = True) -> tuple:
+    """
+    :param alg: algorithm instance
+    :param disable_gc: disable garbage collection during the run
+    :return: tuple (result tuple of the run, time of the run [ms])
+    """
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    if disable_gc:
+        gc.disable()
+    logging.disable(logging.INFO)
+    try:
+        t_0 = time.perf_counter()
+        result_tuple = alg.run_algorithm()
+        total_time = (time.perf_counter() - t_0) * 1000
+    finally:
+        logging.disable(logging.NOTSET)
+        if gc_enabled:
+            gc.enable()
+    return result_tuple, total_time
+
+
+def time_algorithm(create, repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+                   disable_gc: bool = True) -> tuple:
+    """
+    :param create: function creating a fresh algorithm instance
+    :param repeat: number of measured runs
+    :param warmup: number of runs before the measured ones
+    :param disable_gc: disable garbage collection during runs
+    :return: tuple (result tuple of the last run, timing summary)
+    """
+    if repeat < 1:
+        raise ValueError("Number of measured runs should be positive, got {}.".format(repeat))
+    for _ in range(warmup):
+        time_run(create(), disable_gc)
+
+    times = []
+    result_tuple = None
+    name = None
+    for _ in range(repeat):
+        alg = create()
+        name = alg.__str__()
+        result_tuple, total_time = time_run(alg, disable_gc)
+        times.append(total_time)
+    summary = TimingSummary(name, result_tuple.total_mem_access, times)
+    LOG.info("%s: min %.3f ms, median %.3f ms, stddev %.3f ms, %.0f accesses/s", name, summary.min, summary.median,
+             summary.stddev, summary.accesses_per_second)
+    return result_tuple, summary
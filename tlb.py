@@ -0,0 +1,105 @@
+"""
+Set-associative TLB (Translation Lookaside Buffer) model
+
+Every access looks up its VPN in the TLB before it reaches the page replacement algorithm.
+An entry keeps the frame the page was mapped to, the entry is valid as long as that frame holds the page,
+so entries of evicted pages are invalidated lazily (as if the TLB was shot down on eviction).
+On a TLB miss the page table is walked (the algorithm handles the access, possibly with a page fault)
+and the translation (frame found in the VPN map of the page table) is inserted into the TLB,
+evicting an entry of the set if it's full.
+"""
+import collections
+import random
+
+LRU = 'lru'
+RANDOM = 'random'
+POLICIES = (LRU, RANDOM)
+
+DEFAULT_WAYS = 4
+
+
+class TLB:
+    """
+    TLB with `entries` entries in sets of `ways` entries, a page can be cached only in set `VPN mod number of sets`.
+    """
+
+    def __init__(self, entries: int, ways: int = DEFAULT_WAYS, policy: str = LRU, seed: int = 0):
+        if entries % ways:
+            raise ValueError("Number of TLB entries should be a multiple of ways.")
+        self.entries: int = entries
+        self.ways: int = ways
+        self.policy: str = policy
+        self.num_sets: int = entries // ways
+        # KEY = VPN, VALUE = frame, least recently used first
+        self.sets: list = [collections.OrderedDict() for _ in range(self.num_sets)]
+        self.random: random.Random = random.Random(seed)
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_set(self, vpn) -> collections.OrderedDict:
+        """
+        :param vpn: virtual page number (or process-tagged tuple (pid, VPN))
+        :return: set the page can be cached in
+        """
+        return self.sets[hash(vpn) % self.num_sets]
+
+    def lookup(self, vpn) -> bool:
+        """
+        Looks up translation of VPN, counting a hit or a miss.
+        :param vpn: virtual page number
+        :return: True for a TLB hit
+        """
+        tlb_set = self.get_set(vpn)
+        frame = tlb_set.get(vpn)
+        if frame is not None:
+            if frame.in_use and frame.vpn == vpn:
+                self.hits += 1
+                if self.policy == LRU:
+                    tlb_set.move_to_end(vpn)
+                return True
+            # page was evicted since the translation was cached
+            del tlb_set[vpn]
+        self.misses += 1
+        return False
+
+    def insert(self, vpn, frame):
+        """
+        Caches translation of VPN.
+        :param vpn: virtual page number
+        :param frame: frame holding the page
+        """
+        tlb_set = self.get_set(vpn)
+        if len(tlb_set) >= self.ways:
+            if self.policy == LRU:
+                tlb_set.popitem(last=False)
+            else:
+                del tlb_set[self.random.choice(list(tlb_set))]
+        tlb_set[vpn] = frame
+
+    def attach(self, alg):
+        """
+        Filters every access processed by algorithm's step through the TLB.
+        :param alg: algorithm instance
+        :return: algorithm instance
+        """
+        step = alg.step
+        page_table = alg.page_table
+
+        def step_with_tlb(next_address):
+            vpn = page_table.get_vpn(next_address[0])
+            hit = self.lookup(vpn)
+            step(next_address)
+            if not hit:
+                frame = page_table.resident.get(vpn)
+                if frame is not None:
+                    self.insert(vpn, frame)
+
+        alg.step = step_with_tlb
+        return alg
+
+    def get_result(self):
+        """
+        :return: columns appended to results CSV: TLB hits and misses
+        """
+        return self.hits, self.misses
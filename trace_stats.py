@@ -0,0 +1,240 @@
+"""
+Trace statistics sidecar
+
+Facts about a trace which don't depend on the algorithm are computed once and stored next to the trace
+in `<tracefile>.stats`:
+- number of accesses, unique pages, footprint [B] and write ratio,
+- LRU reuse (stack) distance histogram, which is also the LRU miss curve for every number of frames,
+- VPN histogram (accesses of every page),
+- next-use array (position of the next access of the same page for every access), used by OPT.
+The sidecar is valid as long as the SHA-256 hash of trace content and the page layout (page size, address width,
+trace format) match, otherwise statistics are recomputed and the sidecar is rewritten.
+
+Sidecar format: JSON header line followed by next-use array as raw 8-byte integers.
+
+Usage:  python trace_stats.py --tracefile <tracefile> [--pagesize 4K|16K|64K|2M] [--address-bits 32|64]
+            [--format auto|synthetic|lackey|addresses] [--force]
+"""
+import argparse
+import array
+import collections
+import hashlib
+import json
+import logging
+import os
+import sys
+
+import autosize
+import input_parser as iparser
+import page_table as pt
+
+LOG = logging.getLogger(__name__)
+
+SIDECAR_SUFFIX = '.stats'
+SIDECAR_VERSION = 1
+# type code of next-use array, 8-byte signed integers
+ARRAY_TYPE = 'q'
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class TraceStats:
+    """
+    Statistics of a trace decoded with given page layout.
+    """
+
+    def __init__(self, content_hash: str, layout: dict, accesses: int, write_ratio: float, cold_accesses: int,
+                 reuse_histogram: dict, vpn_histogram: dict, next_uses: array.array):
+        """
+        :param content_hash: SHA-256 of trace content (None if the trace wasn't hashed)
+        :param layout: dictionary with page_size, address_bits and trace_format the trace was decoded with
+        :param accesses: number of accesses
+        :param write_ratio: share of write accesses
+        :param cold_accesses: number of first accesses of pages
+        :param reuse_histogram: KEY = LRU stack distance, VALUE = number of accesses
+        :param vpn_histogram: KEY = VPN, VALUE = number of accesses
+        :param next_uses: position of the next access of the same page for every access (`accesses` if none)
+        """
+        self.content_hash: str = content_hash
+        self.layout: dict = layout
+        self.accesses: int = accesses
+        self.write_ratio: float = write_ratio
+        self.cold_accesses: int = cold_accesses
+        self.reuse_histogram: dict = reuse_histogram
+        self.vpn_histogram: dict = vpn_histogram
+        self.next_uses: array.array = next_uses
+
+    @property
+    def unique_pages(self) -> int:
+        return len(self.vpn_histogram)
+
+    @property
+    def footprint(self) -> int:
+        """
+        :return: size of all pages accessed by the trace [B]
+        """
+        return self.unique_pages * self.layout['page_size']
+
+    def lru_miss_curve(self, max_frames: int = None) -> list:
+        """
+        :param max_frames: length of the curve, number of unique pages by default
+        :return: list of LRU page faults indexed by number of frames
+        """
+        if max_frames is None:
+            max_frames = self.unique_pages
+        return autosize.get_histogram_miss_curve(self.reuse_histogram, self.cold_accesses, max_frames)
+
+    def get_summary(self) -> dict:
+        """
+        :return: scalar statistics
+        """
+        return {'accesses': self.accesses, 'unique_pages': self.unique_pages, 'footprint': self.footprint,
+                'write_ratio': self.write_ratio}
+
+
+def get_layout(page_size: int = pt.DEFAULT_PAGE_SIZE, address_bits: int = pt.DEFAULT_ADDRESS_BITS,
+               trace_format: str = iparser.AUTO) -> dict:
+    """
+    :return: page layout and format the trace is decoded with
+    """
+    return {'page_size': page_size, 'address_bits': address_bits, 'trace_format': trace_format}
+
+
+def get_sidecar_file(trace_file: str) -> str:
+    """
+    :param trace_file: path to trace file
+    :return: path to sidecar file
+    """
+    return trace_file + SIDECAR_SUFFIX
+
+
+def compute_content_hash(trace_file: str) -> str:
+    """
+    :param trace_file: path to trace file or shard index (content of all shards is hashed)
+    :return: SHA-256 of trace content as hex string
+    """
+    content_hash = hashlib.sha256()
+    files = iparser.read_shard_index(trace_file) if trace_file.endswith(iparser.SHARD_INDEX_SUFFIX) else [trace_file]
+    for file_path in files:
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+def compute_stats(trace: list, content_hash: str, layout: dict) -> TraceStats:
+    """
+    :param trace: list of tuples (VPN, R/W) decoded by page_table.decode_trace
+    :param content_hash: SHA-256 of trace content
+    :param layout: page layout the trace was decoded with
+    :return: trace statistics
+    """
+    vpns = [access[0] for access in trace]
+    reuse_histogram = collections.Counter(autosize.lru_stack_distances(vpns))
+    cold_accesses = reuse_histogram.pop(None, 0)
+    writes = sum(1 for access in trace if access[1] == 'W')
+    return TraceStats(content_hash, layout, len(trace), writes / len(trace) if trace else 0, cold_accesses,
+                      dict(reuse_histogram), dict(collections.Counter(vpns)),
+                      array.array(ARRAY_TYPE, autosize.get_next_uses(vpns)))
+
+
+def write_sidecar(stats: TraceStats, sidecar_file: str):
+    """
+    Writes sidecar atomically (concurrent readers see the old or the new one).
+    :param stats: trace statistics
+    :param sidecar_file: path to sidecar file
+    """
+    header = {'version': SIDECAR_VERSION, 'content_hash': stats.content_hash, 'layout': stats.layout,
+              'accesses': stats.accesses, 'write_ratio': stats.write_ratio, 'cold_accesses': stats.cold_accesses,
+              'reuse_histogram': stats.reuse_histogram, 'vpn_histogram': stats.vpn_histogram}
+    temporary_file = '{}.{}.tmp'.format(sidecar_file, os.getpid())
+    with open(temporary_file, 'wb') as sidecar:
+        sidecar.write(json.dumps(header).encode() + b'\n')
+        stats.next_uses.tofile(sidecar)
+    os.replace(temporary_file, sidecar_file)
+
+
+def read_sidecar(sidecar_file: str):
+    """
+    :param sidecar_file: path to sidecar file
+    :return: trace statistics or None if sidecar doesn't exist or can't be read
+    """
+    if not os.path.isfile(sidecar_file):
+        return None
+    try:
+        with open(sidecar_file, 'rb') as sidecar:
+            header = json.loads(sidecar.readline())
+            if header.get('version') != SIDECAR_VERSION:
+                return None
+            next_uses = array.array(ARRAY_TYPE)
+            next_uses.fromfile(sidecar, header['accesses'])
+    except (ValueError, KeyError, EOFError, OSError):
+        LOG.warning("Sidecar '%s' is corrupted, it will be recomputed.", sidecar_file)
+        return None
+    return TraceStats(header['content_hash'], header['layout'], header['accesses'], header['write_ratio'],
+                      header['cold_accesses'],
+                      {int(distance): count for distance, count in header['reuse_histogram'].items()},
+                      {int(vpn): count for vpn, count in header['vpn_histogram'].items()}, next_uses)
+
+
+def load_stats(trace_file: str, trace: list = None, page_size: int = pt.DEFAULT_PAGE_SIZE,
+               address_bits: int = pt.DEFAULT_ADDRESS_BITS, trace_format: str = iparser.AUTO,
+               save: bool = True) -> TraceStats:
+    """
+    Reads statistics from the sidecar, if it's missing or stale computes them and writes the sidecar.
+    :param trace_file: path to trace file
+    :param trace: decoded trace (to avoid parsing the file again if statistics have to be computed)
+    :param page_size: page size [B]
+    :param address_bits: width of virtual address
+    :param trace_format: one of input_parser.TRACE_FORMATS
+    :param save: write the sidecar next to the trace, otherwise an existing sidecar is only read
+                 (trace content isn't hashed if there is none)
+    :return: trace statistics
+    """
+    layout = get_layout(page_size, address_bits, trace_format)
+    sidecar_file = get_sidecar_file(trace_file)
+
+    content_hash = None
+    if save or os.path.isfile(sidecar_file):
+        content_hash = compute_content_hash(trace_file)
+        stats = read_sidecar(sidecar_file)
+        if stats and stats.content_hash == content_hash and stats.layout == layout:
+            LOG.info("Trace statistics loaded from %s", sidecar_file)
+            return stats
+
+    if trace is None:
+        trace = pt.decode_trace(list(iparser.iterate_trace_file(trace_file, trace_format)), page_size, address_bits)
+    stats = compute_stats(trace, content_hash, layout)
+    if not save:
+        return stats
+    try:
+        write_sidecar(stats, sidecar_file)
+        LOG.info("Trace statistics written to %s", sidecar_file)
+    except OSError as error:
+        LOG.warning("Sidecar '%s' can't be written: %s", sidecar_file, error)
+    return stats
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tracefile", required=True, help="tracefile: <tracefile>")
+    parser.add_argument("--pagesize", default='4K', choices=pt.PAGE_SIZES.keys(), help="page size")
+    parser.add_argument("--address-bits", default=pt.DEFAULT_ADDRESS_BITS, type=int, choices=pt.ADDRESS_BITS,
+                        help="virtual address width")
+    parser.add_argument("--format", default=iparser.AUTO, choices=iparser.TRACE_FORMATS, help="trace format")
+    parser.add_argument("--force", action="store_true", help="recompute statistics even if sidecar is valid")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.tracefile):
+        LOG.error("Trace file '%s' doesn't exist. Terminating.", args.tracefile)
+        sys.exit(0)
+    if args.force and os.path.isfile(get_sidecar_file(args.tracefile)):
+        os.remove(get_sidecar_file(args.tracefile))
+
+    stats = load_stats(args.tracefile, None, pt.PAGE_SIZES[args.pagesize], args.address_bits, args.format)
+    for name, value in stats.get_summary().items():
+        LOG.info("%-12s %s", name + ':', value)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,532 @@
+"""
+Differential verification of optimised engines
+
+Every check runs a reference engine and an optimised engine side by side on thousands of random and adversarial
+traces made with generator workloads, and compares page faults, writes and (with `--states`, for checks whose
+engines both keep frame states) frame states after every access. A mismatching trace is shrunk to a minimal one (accesses removed while the mismatch remains,
+then writes turned into reads) and written to `results/verify/<check>_<seed>.trace`, all mismatches are listed
+in `results/verify/failures.csv`.
+
+Reference models are written independently of the algorithms package: a few lines of list operations each,
+slow but easy to check by reading (REFERENCE_MODELS).
+
+Checks:
+- Clock, LRU, Aging, Opt - reference model vs algorithm on VPNs decoded up front (DecodedPageTable),
+  Opt with the next-use array of trace_stats,
+- ClockDecoding, LRUDecoding, AgingDecoding, OptDecoding - algorithm on hex addresses (PageTable)
+  vs on decoded VPNs, frame states included,
+- OptCurve - reference Belady's OPT vs the OPT miss curve of autosize (faults only).
+Other engines are checked against a reference model with `--candidate <reference>=<module>:<class>`
+(or register_candidate).
+
+Cases are run in batches on a process pool, no new batches are started after `--budget` seconds.
+Exit status is 1 if any mismatch was found.
+
+Usage:  python verify.py [--cases <cases>] [--max-length <accesses>] [--checks <check,...>] [--states]
+            [--seed <seed>] [--workers <workers>] [--budget <seconds>] [--candidate <reference>=<module>:<class>]
+"""
+import argparse
+import concurrent.futures
+import csv
+import importlib
+import itertools
+import logging
+import os
+import random
+import sys
+import time
+
+import algorithms.aging as aging
+import algorithms.clock as clock
+import algorithms.lru as lru
+import algorithms.opt as opt
+import autosize
+import generator
+import input_parser as iparser
+import page_table as pt
+import vmsim
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CASES = 1000
+DEFAULT_MAX_LENGTH = 200
+DEFAULT_BUDGET = 60
+MAX_FRAMES = 8
+MAX_REFRESH = 10
+# cases run by a worker at once
+BATCH_SIZE = 25
+OUTPUT_DIR = vmsim.RESULT_DIR + 'verify/'
+FAILURE_HEADER = ('check', 'seed', 'workload', 'frames', 'refresh', 'mismatch', 'accesses', 'trace_file')
+
+RANDOM_MODELS = ('uniform', 'zipf', 'phases', 'scan', 'loop')
+
+
+def create(algorithm, page_table: pt.PageTable, trace: list, refresh: int, keep_states: bool, next_uses=None,
+           with_refresh: bool = None):
+    """
+    Creates algorithm instance, passing parameters specific for the algorithm.
+    :param with_refresh: pass refresh time as the third argument (Aging and its subclasses by default)
+    """
+    if with_refresh is None:
+        with_refresh = issubclass(algorithm, aging.Aging)
+    if with_refresh:
+        return algorithm(page_table, trace, refresh, keep_states)
+    if algorithm == opt.Opt:
+        return algorithm(page_table, trace, keep_states, next_uses)
+    return algorithm(page_table, trace, keep_states)
+
+
+def get_states(alg) -> list:
+    """
+    :param alg: algorithm instance run with keep_states
+    :return: replacement-visible fields of all frames after every access
+    """
+    return [[(frame.vpn, frame.dirty, frame.in_use, frame.reference, frame.aging_value)
+             for frame in itertools.chain(table.frame_table, table.frame_queue.list)]
+            for table in alg.get_table_states()]
+
+
+def run_on_addresses(algorithm):
+    """
+    :return: engine running the algorithm on hex addresses (reference)
+    """
+
+    def run(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+        alg = create(algorithm, pt.PageTable(frames), list(trace), refresh, keep_states)
+        result_tuple = alg.run_algorithm()
+        return result_tuple.page_faults, result_tuple.writes, get_states(alg) if keep_states else None
+
+    return run
+
+
+def run_on_vpns(algorithm, with_refresh: bool = None):
+    """
+    :param with_refresh: pass refresh time to the constructor (Aging and its subclasses by default)
+    :return: engine running the algorithm on decoded VPNs (as vmsim does), OPT with precomputed next uses
+    """
+
+    def run(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+        decoded = pt.decode_trace(trace)
+        next_uses = autosize.get_next_uses([access[0] for access in decoded]) if algorithm == opt.Opt else None
+        alg = create(algorithm, pt.DecodedPageTable(frames), decoded, refresh, keep_states, next_uses, with_refresh)
+        result_tuple = alg.run_algorithm()
+        return result_tuple.page_faults, result_tuple.writes, get_states(alg) if keep_states else None
+
+    return run
+
+
+def reference_lru(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+    """
+    Reference LRU: list of [VPN, dirty] from the least to the most recently used.
+    """
+    pages = []
+    page_faults = writes = 0
+    for vpn, read_or_write in pt.decode_trace(trace):
+        page = next((page for page in pages if page[0] == vpn), None)
+        if page is None:
+            page_faults += 1
+            if len(pages) == frames:
+                writes += pages.pop(0)[1]
+            page = [vpn, False]
+        else:
+            pages.remove(page)
+        pages.append(page)
+        page[1] = page[1] or read_or_write == 'W'
+    return page_faults, writes, None
+
+
+def reference_clock(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+    """
+    Reference Clock: list of [VPN, referenced, dirty] and a hand. Reads set the reference bit, writes the dirty bit.
+    The victim is the first clean unreferenced page under the hand (which clears reference bits it passes),
+    if there is none the swap daemon writes all dirty unreferenced pages.
+    """
+    pages = []
+    hand = 0
+    page_faults = writes = 0
+    for vpn, read_or_write in pt.decode_trace(trace):
+        page = next((page for page in pages if page[0] == vpn), None)
+        if page is None:
+            page_faults += 1
+            page = [vpn, False, False]
+            if len(pages) < frames:
+                pages.append(page)
+            else:
+                victim = None
+                while victim is None:
+                    for _ in range(frames):
+                        if not pages[hand][1] and not pages[hand][2]:
+                            victim = hand
+                            break
+                        pages[hand][1] = False
+                        hand = (hand + 1) % frames
+                    else:
+                        # swap daemon
+                        for other in pages:
+                            if other[2] and not other[1]:
+                                other[2] = False
+                                writes += 1
+                pages[victim] = page
+        if read_or_write == 'W':
+            page[2] = True
+        else:
+            page[1] = True
+    return page_faults, writes, None
+
+
+def reference_aging(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+    """
+    Reference Aging: frames of [VPN, dirty, counter]. Every access sets the most significant bit of the counter
+    of its page, every `refresh` accesses all counters are shifted right. The victim is the first page
+    with the lowest counter.
+    """
+    pages = []
+    page_faults = writes = 0
+    for position, (vpn, read_or_write) in enumerate(pt.decode_trace(trace)):
+        page = next((page for page in pages if page[0] == vpn), None)
+        if page is None:
+            page_faults += 1
+            page = [vpn, False, 0]
+            if len(pages) < frames:
+                pages.append(page)
+            else:
+                victim = min(range(frames), key=lambda index: pages[index][2])
+                writes += pages[victim][1]
+                pages[victim] = page
+        page[1] = page[1] or read_or_write == 'W'
+        page[2] |= 1 << (aging.Aging.COUNTER_LENGTH - 1)
+        if (position + 1) % refresh == 0:
+            for other in pages:
+                other[2] >>= 1
+    return page_faults, writes, None
+
+
+def reference_opt(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+    """
+    Reference Belady's OPT: frames of [VPN, dirty], the victim is the first page whose next access
+    (searched in the rest of the trace) is the furthest or never comes.
+    """
+    decoded = pt.decode_trace(trace)
+    vpns = [access[0] for access in decoded]
+    pages = []
+    page_faults = writes = 0
+    for position, (vpn, read_or_write) in enumerate(decoded):
+        page = next((page for page in pages if page[0] == vpn), None)
+        if page is None:
+            page_faults += 1
+            page = [vpn, False]
+            if len(pages) < frames:
+                pages.append(page)
+            else:
+                future = vpns[position + 1:]
+                victim = max(range(frames), key=lambda index: future.index(pages[index][0])
+                             if pages[index][0] in future else len(future))
+                writes += pages[victim][1]
+                pages[victim] = page
+        page[1] = page[1] or read_or_write == 'W'
+    return page_faults, writes, None
+
+
+def run_opt_curve(trace: list, frames: int, refresh: int, keep_states: bool) -> tuple:
+    """
+    Engine of OPT faults read from the miss curve (writes aren't known).
+    """
+    vpns = [access[0] for access in pt.decode_trace(trace)]
+    return autosize.opt_miss_curve(vpns, frames)[frames], None, None
+
+
+# KEY = algorithm name, VALUE = reference engine
+REFERENCE_MODELS = {'Clock': reference_clock, 'LRU': reference_lru, 'Aging': reference_aging, 'Opt': reference_opt}
+
+# KEY = check name, VALUE = (reference engine, optimised engine)
+CHECKS = {'Clock': (reference_clock, run_on_vpns(clock.Clock)),
+          'LRU': (reference_lru, run_on_vpns(lru.LRU)),
+          'Aging': (reference_aging, run_on_vpns(aging.Aging)),
+          'Opt': (reference_opt, run_on_vpns(opt.Opt)),
+          'ClockDecoding': (run_on_addresses(clock.Clock), run_on_vpns(clock.Clock)),
+          'LRUDecoding': (run_on_addresses(lru.LRU), run_on_vpns(lru.LRU)),
+          'AgingDecoding': (run_on_addresses(aging.Aging), run_on_vpns(aging.Aging)),
+          'OptDecoding': (run_on_addresses(opt.Opt), run_on_vpns(opt.Opt)),
+          'OptCurve': (reference_opt, run_opt_curve)}
+
+
+def register_candidate(check: str, reference: str, candidate, with_refresh: bool = None):
+    """
+    Adds check of a candidate engine against a reference model, e.g. of a new implementation of an algorithm.
+    Worker processes look checks up by name, candidates given by specification (see load_candidate)
+    are registered in them by verify.
+    :param check: name of the new check
+    :param reference: one of REFERENCE_MODELS
+    :param candidate: engine, function (trace, frames, refresh, keep_states) -> (page faults, writes, states),
+                      or algorithm class constructed as (page table, trace[, refresh], keep_states) and run on VPNs
+    :param with_refresh: pass refresh time to the constructor of algorithm class (Aging subclasses by default)
+    """
+    if reference not in REFERENCE_MODELS:
+        raise ValueError("Unknown reference model '{}'. Available: {}.".format(reference,
+                                                                             ', '.join(REFERENCE_MODELS)))
+    if isinstance(candidate, type):
+        candidate = run_on_vpns(candidate, with_refresh if with_refresh is not None else reference == 'Aging')
+    CHECKS[check] = (REFERENCE_MODELS[reference], candidate)
+
+
+def load_candidate(specification: str) -> str:
+    """
+    Registers check of algorithm class against a reference model.
+    :param specification: `<reference>=<module>:<class>`, e.g. `LRU=algorithms.lru:LRU`
+    :return: name of the check, `Candidate<class>`
+    """
+    reference, _, path = specification.partition('=')
+    module_name, _, class_name = path.partition(':')
+    if not module_name or not class_name:
+        raise ValueError("Candidate should be <reference>=<module>:<class>, got '{}'.".format(specification))
+    try:
+        algorithm = getattr(importlib.import_module(module_name), class_name)
+    except (ImportError, AttributeError) as error:
+        raise ValueError("Candidate '{}' can't be loaded: {}".format(specification, error))
+    check = 'Candidate' + class_name
+    register_candidate(check, reference, algorithm)
+    return check
+
+
+def get_random_workload(generator_: random.Random) -> str:
+    """
+    :return: workload of 1-3 regions of random models and parameters
+    """
+    regions = []
+    for _ in range(generator_.randint(1, 3)):
+        model = generator_.choice(RANDOM_MODELS)
+        pages = generator_.randint(1, 16)
+        params = 'pages={},write={:.2f},weight={}'.format(pages, generator_.random(), generator_.randint(1, 4))
+        if model == 'zipf':
+            params += ',exponent={:.1f}'.format(generator_.uniform(0.5, 2))
+        elif model == 'phases':
+            params += ',working_set={},phase_length={}'.format(generator_.randint(1, pages), generator_.randint(1, 30))
+        elif model in ('scan', 'loop'):
+            params += ',run={}'.format(generator_.randint(1, 3))
+        regions.append('{}:{}'.format(model, params))
+    return ';'.join(regions)
+
+
+def get_adversarial_workload(generator_: random.Random, frames: int) -> str:
+    """
+    :return: workload which is a known corner case for the number of frames
+    """
+    return generator_.choice((
+        # one page more than frames: every access faults in LRU and Clock
+        'loop:pages={},write=0.5'.format(frames + 1),
+        # exactly fits
+        'loop:pages={},write=1'.format(frames),
+        # a single page
+        'uniform:pages=1,write=0.5',
+        # only compulsory faults
+        'scan:pages=1000,write=0.5',
+        # working set changes often and is one page bigger than memory
+        'phases:pages=30,working_set={},phase_length=7'.format(min(30, frames + 1)),
+        # hot pages polluted by a scan
+        'zipf:pages={},exponent=1.5,weight=3;scan:pages=50,write=0'.format(frames),
+    ))
+
+
+def generate_case(seed: int, max_length: int) -> tuple:
+    """
+    :param seed: seed of the case, even seeds are random cases, odd ones adversarial
+    :param max_length: maximum number of accesses
+    :return: tuple (workload, trace, frames, refresh)
+    """
+    generator_ = random.Random(seed)
+    frames = generator_.randint(1, MAX_FRAMES)
+    refresh = generator_.randint(1, MAX_REFRESH)
+    if seed % 2:
+        workload = get_adversarial_workload(generator_, frames)
+    else:
+        workload = get_random_workload(generator_)
+    blocks = generator.Workload(generator.parse_workload(workload)).iterate_blocks(
+        generator_.randint(1, max_length), generator_)
+    return workload, list(iparser.iterate_synthetic_lines(''.join(blocks).splitlines())), frames, refresh
+
+
+def compare(check: str, trace: list, frames: int, refresh: int, keep_states: bool):
+    """
+    :return: description of the first difference of both engines or None if they agree
+    """
+    reference, candidate = CHECKS[check]
+    logging.disable(logging.INFO)
+    try:
+        expected = reference(trace, frames, refresh, keep_states)
+        actual = candidate(trace, frames, refresh, keep_states)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    for name, expected_value, actual_value in zip(('faults', 'writes'), expected, actual):
+        if expected_value is not None and actual_value is not None and expected_value != actual_value:
+            return '{}: {} != {}'.format(name, expected_value, actual_value)
+    if expected[2] is not None and actual[2] is not None:
+        for step, (expected_state, actual_state) in enumerate(zip(expected[2], actual[2])):
+            if expected_state != actual_state:
+                return 'state after access {}: {} != {}'.format(step + 1, expected_state, actual_state)
+    return None
+
+
+def shrink(trace: list, fails) -> list:
+    """
+    Removes chunks of accesses (halving chunk size) while the trace still fails, then turns writes into reads.
+    :param trace: failing trace
+    :param fails: function telling if a trace fails
+    :return: trace which fails but none of its single accesses can be removed
+    """
+    chunk = max(1, len(trace) // 2)
+    while True:
+        start = 0
+        removed = False
+        while start < len(trace):
+            candidate = trace[:start] + trace[start + chunk:]
+            if candidate and fails(candidate):
+                trace = candidate
+                removed = True
+            else:
+                start += chunk
+        if chunk == 1 and not removed:
+            break
+        chunk = max(1, chunk // 2)
+
+    for index, access in enumerate(trace):
+        if access[1] == 'W':
+            candidate = trace[:index] + [(access[0], 'R')] + trace[index + 1:]
+            if fails(candidate):
+                trace = candidate
+    return trace
+
+
+def run_case(check: str, seed: int, max_length: int, keep_states: bool):
+    """
+    :return: failure (check, seed, workload, frames, refresh, mismatch, shrunk trace) or None
+    """
+    workload, trace, frames, refresh = generate_case(seed, max_length)
+    mismatch = compare(check, trace, frames, refresh, keep_states)
+    if mismatch is None:
+        return None
+    trace = shrink(trace, lambda candidate: compare(check, candidate, frames, refresh, keep_states) is not None)
+    return check, seed, workload, frames, refresh, compare(check, trace, frames, refresh, keep_states), trace
+
+
+def run_batch(checks: list, seeds: list, max_length: int, keep_states: bool, candidates: list = ()) -> list:
+    """
+    :param candidates: specifications of candidates registered before the run (see load_candidate)
+    :return: failures of all checks on cases of the seeds
+    """
+    for specification in candidates:
+        load_candidate(specification)
+    failures = []
+    for seed in seeds:
+        for check in checks:
+            failure = run_case(check, seed, max_length, keep_states)
+            if failure:
+                failures.append(failure)
+    return failures
+
+
+def verify(checks: list, cases: int = DEFAULT_CASES, max_length: int = DEFAULT_MAX_LENGTH, keep_states: bool = False,
+           seed: int = 0, workers: int = None, budget: float = DEFAULT_BUDGET, candidates: list = ()) -> tuple:
+    """
+    Runs cases in batches on a process pool (in this process for one worker) until all are done or time is up.
+    :param checks: names of CHECKS
+    :param cases: number of cases of every check
+    :param max_length: maximum number of accesses of a case
+    :param keep_states: compare frame states after every access
+    :param seed: seed of the first case
+    :param workers: number of worker processes (number of CPUs by default)
+    :param budget: no batches are started after this many seconds
+    :param candidates: specifications of candidates checked in worker processes (see load_candidate)
+    :return: tuple (number of run cases, list of failures)
+    """
+    deadline = time.monotonic() + budget
+    batches = [list(range(start, min(seed + cases, start + BATCH_SIZE)))
+               for start in range(seed, seed + cases, BATCH_SIZE)]
+    done = 0
+    failures = []
+    if workers == 1:
+        for batch in batches:
+            if time.monotonic() > deadline:
+                break
+            failures += run_batch(checks, batch, max_length, keep_states, candidates)
+            done += len(batch)
+        return done, failures
+
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pending = {}
+        batches = iter(batches)
+        while True:
+            while len(pending) < 2 * workers and time.monotonic() <= deadline:
+                batch = next(batches, None)
+                if batch is None:
+                    break
+                pending[executor.submit(run_batch, checks, batch, max_length, keep_states, candidates)] = len(batch)
+            if not pending:
+                break
+            finished, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                failures += future.result()
+                done += pending.pop(future)
+    return done, sorted(failures, key=lambda failure: (failure[1], failure[0]))
+
+
+def serialize_failures(failures: list, output_dir: str):
+    """
+    Writes shrunk traces of failures and their list to the output directory.
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    with open(os.path.join(output_dir, 'failures.csv'), 'w') as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(FAILURE_HEADER)
+        for check, seed, workload, frames, refresh, mismatch, trace in failures:
+            trace_file = os.path.join(output_dir, '{}_{}.trace'.format(check, seed))
+            with open(trace_file, 'w') as trace_output:
+                trace_output.writelines('{} {}\n'.format(*access) for access in trace)
+            writer.writerow((check, seed, workload, frames, refresh, mismatch, len(trace), trace_file))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", default=DEFAULT_CASES, type=int, help="number of cases of every check")
+    parser.add_argument("--max-length", default=DEFAULT_MAX_LENGTH, type=int, help="maximum accesses of a case")
+    parser.add_argument("--checks", help="comma separated checks (all by default)")
+    parser.add_argument("--states", action="store_true", help="compare frame states after every access")
+    parser.add_argument("--seed", default=0, type=int, help="seed of the first case")
+    parser.add_argument("--workers", type=int, help="worker processes (number of CPUs by default)")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET, type=float,
+                        help="time budget [s], no new cases are started after it")
+    parser.add_argument("--candidate", action="append", default=[],
+                        help="check algorithm class against reference model: <reference>=<module>:<class> "
+                             "(only candidates are checked unless --checks is given)")
+    args = parser.parse_args()
+
+    checks = args.checks.split(',') if args.checks else ([] if args.candidate else list(CHECKS))
+    for specification in args.candidate:
+        try:
+            checks.append(load_candidate(specification))
+        except ValueError as error:
+            LOG.error("%s Terminating.", error)
+            sys.exit(0)
+    for check in checks:
+        if check not in CHECKS:
+            LOG.error("Unknown check '%s'. Available: %s. Terminating.", check, ', '.join(CHECKS))
+            sys.exit(0)
+
+    t_0 = time.perf_counter()
+    done, failures = verify(checks, args.cases, args.max_length, args.states, args.seed, args.workers, args.budget,
+                            args.candidate)
+    LOG.info("Verified %s cases of %s checks in %.1f s, %s mismatches", done, len(checks),
+             time.perf_counter() - t_0, len(failures))
+    if done < args.cases:
+        LOG.warning("Time budget exceeded, %s of %s cases were run", done, args.cases)
+    if failures:
+        for check, seed, _, frames, _, mismatch, trace in failures:
+            LOG.error("%s (seed %s, %s frames, %s accesses): %s", check, seed, frames, len(trace), mismatch)
+        serialize_failures(failures, OUTPUT_DIR)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
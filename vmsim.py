@@ -1,42 +1,166 @@
 """
 VM Simulator for Page Replacement Algorithms
 
-Usage:  python vmsim.py --numframes <numframes> --tracefile tracefile [--refresh <refresh>]
+Usage:  python vmsim.py --numframes <numframes> --tracefile tracefile [--refresh <refresh>] [--seed <seed>]
+            [--window <window>] [--device nvme|sata-ssd|hdd] [--writeback async|sync]
+            [--metrics-window <accesses>] [--format auto|synthetic|lackey|addresses]
+            [--tlb-entries <entries>] [--tlb-ways <ways>] [--tlb-policy lru|random]
+            [--pagesize 4K|16K|64K|2M] [--address-bits 32|64] [--store <results.db>]
+            [--topk <pages>] [--sketch-size <counters>] [--stats]
+
+Timing mode (every algorithm run <repeat> times after <warmup> runs, see timing):
+        python vmsim.py --numframes <numframes> --tracefile <tracefile> --repeat <repeat> [--warmup <warmup>]
+
+Auto-sizing mode (the smallest number of frames meeting the target fault rate for every algorithm):
+        python vmsim.py --tracefile <tracefile> --target-fault-rate <rate> [--workers <workers>]
+
+Batch mode (many configurations from a JSON or TOML manifest, see run_batch):
+        python vmsim.py --manifest <manifest.json|manifest.toml> [--cache <traces>]
+
+Streaming mode (`--tracefile -` for stdin, path to a named pipe or any trace file with `--stream`):
+        python vmsim.py --numframes <numframes> --tracefile - [--lookahead <lookahead>] [--buffer <accesses>]
+            [--snapshot <accesses>] [--stream] [--algorithms <alg,...>]
+
+Lock-step mode (trace file read and decoded once for all algorithms and numbers of frames):
+        python vmsim.py --numframes <numframes,...> --tracefile <tracefile> [--algorithms <alg,...>] [--lockstep]
 """
 import argparse
+import collections
 import copy
 import csv
 import datetime
+import functools
+import itertools
+import json
 import logging
 import os
+import stat
 import sys
+import time
 
 import algorithms.aging as aging
 import algorithms.clock as clock
+import algorithms.clock_pro as clock_pro
+import algorithms.fifo as fifo
+import algorithms.lfu as lfu
+import algorithms.lirs as lirs
+import algorithms.lookahead_opt as lookahead_opt
 import algorithms.lru as lru
 import algorithms.opt as opt
+import algorithms.random_replacement as random_replacement
+import algorithms.wsclock as wsclock
+import attribution
+import autosize
+import cost_model as cm
 import input_parser as iparser
+import metrics
 import page_table as pt
+import result_tuple as rt
+import results_store
+import timing
+import tlb
+import trace_stats
 
 logging.basicConfig(level=logging.INFO)
 LOG = logging.getLogger(__name__)
 
 RESULT_DIR = 'results/'
 
+ALGORITHMS = (clock.Clock, lru.LRU, aging.Aging, opt.Opt, clock_pro.ClockPro, lirs.LIRS,
+              wsclock.WSClock, lfu.LFU, fifo.FIFO, random_replacement.RandomReplacement)
+
+ALGORITHM_NAMES = {algorithm.__name__: algorithm for algorithm in ALGORITHMS}
+
+# algorithms which process a stream incrementally, OPT is replaced with its bounded-lookahead variant
+STREAM_ALGORITHMS = (clock.Clock, lru.LRU, aging.Aging, lookahead_opt.LookaheadOpt)
+
+RESULT_HEADER = ('alg', 'trace_file', 'frames', 'total_mem_access', 'page_faults', 'writes', 'refresh', 'total_time',
+                 'eat_ns', 'p50_ns', 'p99_ns', 'tlb_hits', 'tlb_misses')
+
+# algorithms sized by simulation in auto-sizing mode, LRU and OPT are sized from their miss curves
+AUTOSIZE_SEARCH_ALGORITHMS = tuple(algorithm for algorithm in ALGORITHMS if algorithm not in (lru.LRU, opt.Opt))
+
+STDIN = '-'
+DEFAULT_STREAM_BUFFER = 1024
+DEFAULT_SNAPSHOT_INTERVAL = 100000
+
+DEFAULT_TRACE_CACHE_SIZE = 4
+
+
+class TraceCache:
+    """
+    Keeps up to `capacity` most recently used traces in memory.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_TRACE_CACHE_SIZE):
+        self.capacity: int = capacity
+        # KEY = trace key, VALUE = loaded trace, least recently used first
+        self.traces: collections.OrderedDict = collections.OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get(self, key, load):
+        """
+        :param key: hashable key of the trace
+        :param load: function loading the trace if it isn't cached
+        :return: loaded trace
+        """
+        trace = self.traces.get(key)
+        if trace is None:
+            self.misses += 1
+            trace = load()
+            self.traces[key] = trace
+            while len(self.traces) > self.capacity:
+                self.traces.popitem(last=False)
+        else:
+            self.hits += 1
+            self.traces.move_to_end(key)
+        return trace
+
+    def __len__(self):
+        return len(self.traces)
+
 
 def serialize_results(results, output_file: str):
     """
     Writes algorithm results to CSV file.
-    :param results: an array of result tuples
+    :param results: an array of result tuples extended with effective access time, its p50 and p99,
+                    TLB hits and misses
     :param output_file: path to output file
     """
     with open(output_file, "w") as output:
         writer = csv.writer(output, lineterminator='\n')
-        writer.writerow(
-            ('alg', 'trace_file', 'frames', 'total_mem_access', 'page_faults', 'writes', 'refresh', 'total_time'))
+        writer.writerow(RESULT_HEADER)
         writer.writerows(results)
 
 
+def store_results(store_file: str, results_file: str):
+    """
+    Appends results written by serialize_results to the results store (later imports of the file are skipped).
+    :param store_file: path to results database, nothing is stored if None
+    :param results_file: path to CSV file with results
+    """
+    if store_file is None:
+        return
+    store = results_store.ResultsStore(store_file)
+    try:
+        store.import_csv(results_file)
+    finally:
+        store.close()
+
+
+def serialize_working_set_sizes(working_set_sizes, output_file: str):
+    """
+    Writes working set size over time (WSClock algorithm) to CSV file.
+    :param working_set_sizes: an array of tuples (virtual time, working set size, resident pages)
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(('virtual_time', 'working_set_size', 'resident_pages'))
+        writer.writerows(working_set_sizes)
+
+
 def create_results_dir(trace_file, num_frames: int) -> str:
     """
     Creates (if doesn't exist) and returns path to write results.
@@ -44,19 +168,448 @@ def create_results_dir(trace_file, num_frames: int) -> str:
     :param num_frames: number of frames that were used to perform algorithm
     :return: output directory path to write results
     """
+    return create_trace_results_dir(trace_file) + str(num_frames) + '_frames.csv'
+
+
+def create_trace_results_dir(trace_file) -> str:
+    """
+    Creates (if doesn't exist) and returns directory of all results of the trace.
+    :param trace_file: path to generated trace file
+    :return: `results/<trace name>_trace/`
+    """
     output_path: str = RESULT_DIR + os.path.splitext(os.path.basename(trace_file))[0] + '_trace/'
     if not os.path.exists(RESULT_DIR):
         os.makedirs(RESULT_DIR)
     if not os.path.exists(output_path):
         os.makedirs(output_path)
-    return output_path + str(num_frames) + '_frames.csv'
+    return output_path
+
+
+def create_metrics_file(output_file: str) -> str:
+    """
+    :param output_file: path to results CSV file
+    :return: path to windowed metrics file next to the results
+    """
+    return os.path.splitext(output_file)[0] + '_metrics.jsonl'
+
+
+def serialize_topk(rows, output_file: str):
+    """
+    Writes the most faulting, evicted and written pages of every algorithm to CSV file.
+    :param rows: an array of rows of attribution.TOPK_HEADER columns
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(attribution.TOPK_HEADER)
+        writer.writerows(rows)
+
+
+def attach_attribution(alg, args):
+    """
+    :param alg: algorithm instance
+    :param args: parsed command line arguments
+    :return: fault attribution attached to the algorithm or None if disabled
+    """
+    if int(args.topk) <= 0:
+        return None
+    fault_attribution = attribution.FaultAttribution(int(args.sketch_size))
+    fault_attribution.attach(alg)
+    return fault_attribution
+
+
+def serialize_timings(timings, output_file: str):
+    """
+    Writes timing summaries of algorithms to CSV file.
+    :param timings: an array of result rows followed by timing.TIMING_COLUMNS, total_time is the median
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(RESULT_HEADER + timing.TIMING_COLUMNS)
+        writer.writerows(timings)
+
+
+def serialize_autosize_results(results, output_file: str):
+    """
+    Writes the smallest numbers of frames meeting the target fault rate to CSV file.
+    :param results: an array of tuples (alg, trace file, target fault rate, frames, page faults, fault rate, method)
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(('alg', 'trace_file', 'target_fault_rate', 'frames', 'page_faults', 'fault_rate', 'method'))
+        writer.writerows(results)
+
+
+def serialize_miss_curves(lru_curve: list, opt_curve: list, output_file: str):
+    """
+    Writes LRU and OPT page faults for every number of frames to CSV file.
+    :param lru_curve: LRU page faults indexed by number of frames
+    :param opt_curve: OPT page faults indexed by number of frames (may be shorter than LRU curve)
+    :param output_file: path to output file
+    """
+    with open(output_file, "w") as output:
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(('frames', 'lru_page_faults', 'opt_page_faults'))
+        for frames in range(1, len(lru_curve)):
+            writer.writerow((frames, lru_curve[frames], opt_curve[frames] if frames < len(opt_curve) else 'N/A'))
+
+
+def create_algorithm(algorithm, page_table: pt.PageTable, trace: list, refresh: int, seed: int,
+                     window: int = wsclock.WSClock.DEFAULT_WINDOW,
+                     lookahead: int = lookahead_opt.LookaheadOpt.DEFAULT_LOOKAHEAD, next_uses=None):
+    """
+    Creates algorithm instance, passing parameters specific for the algorithm.
+    :param algorithm: algorithm class
+    :param page_table: page table to run the algorithm on
+    :param trace: list of memory accesses
+    :param refresh: refresh time (for aging algorithm)
+    :param seed: seed (for random algorithm)
+    :param window: working set window (for WSClock algorithm)
+    :param lookahead: lookahead window (for bounded-lookahead OPT algorithm)
+    :param next_uses: next-use array of the trace (for OPT algorithm)
+    :return: algorithm instance
+    """
+    if algorithm == aging.Aging:
+        return algorithm(page_table, trace, refresh)
+    if algorithm == random_replacement.RandomReplacement:
+        return algorithm(page_table, trace, seed)
+    if algorithm == wsclock.WSClock:
+        return algorithm(page_table, trace, window)
+    if algorithm == lookahead_opt.LookaheadOpt:
+        return algorithm(page_table, trace, lookahead)
+    if algorithm == opt.Opt and next_uses is not None:
+        return algorithm(page_table, trace, next_uses=next_uses)
+    return algorithm(page_table, trace)
+
+
+def is_stream(trace_file: str) -> bool:
+    """
+    :param trace_file: path to trace file or '-' for stdin
+    :return: True if the trace has to be consumed as a stream (stdin or named pipe)
+    """
+    return trace_file == STDIN or (os.path.exists(trace_file) and stat.S_ISFIFO(os.stat(trace_file).st_mode))
+
+
+def iterate_stream(trace_file: str, trace_format: str = iparser.AUTO):
+    """
+    :param trace_file: path to trace file or named pipe, '-' for stdin
+    :param trace_format: one of input_parser.TRACE_FORMATS
+    :return: a generator of tuples (MEM, R/W)
+    """
+    if trace_file == STDIN:
+        return iparser.iterate_trace_lines(sys.stdin, trace_format)
+    return iparser.iterate_trace_file(trace_file, trace_format)
+
+
+def get_refresh_rate(alg):
+    """
+    :param alg: algorithm instance
+    :return: parameter of the algorithm written in refresh column (refresh time of Aging, lookahead window
+             of bounded-lookahead OPT, working set window of WSClock) or 'N/A'
+    """
+    if isinstance(alg, aging.Aging):
+        return alg.refresh_time_in_processed_instructions
+    if isinstance(alg, lookahead_opt.LookaheadOpt):
+        return alg.lookahead
+    if isinstance(alg, wsclock.WSClock):
+        return alg.window
+    return 'N/A'
+
+
+def create_snapshot(alg) -> rt.ResultTuple:
+    """
+    Creates result tuple from current (partial) state of algorithm.
+    :param alg: algorithm instance
+    :return: result tuple
+    """
+    page_table = alg.page_table
+    return rt.ResultTuple(page_table.num_frames, page_table.total_memory_accesses, page_table.page_faults,
+                          page_table.writes_to_disk, get_refresh_rate(alg))
+
+
+def attach_models(alg, args) -> tuple:
+    """
+    Attaches cost model (if a device is given) and TLB (if enabled) to algorithm.
+    :param alg: algorithm instance
+    :param args: parsed command line arguments
+    :return: tuple (cost model or None, TLB or None)
+    """
+    cost = None
+    if args.device:
+        cost = cm.CostModel(cm.PROFILES[args.device], args.writeback)
+        cost.attach(alg)
+    tlb_model = None
+    if int(args.tlb_entries) > 0:
+        tlb_model = tlb.TLB(int(args.tlb_entries), int(args.tlb_ways), args.tlb_policy, int(args.seed))
+        tlb_model.attach(alg)
+    return cost, tlb_model
+
+
+def get_model_columns(models: tuple) -> tuple:
+    """
+    :param models: tuple (cost model or None, TLB or None)
+    :return: columns appended to result tuple: effective access time, p50, p99, TLB hits and misses
+    """
+    cost, tlb_model = models
+    return ((cost.get_result() if cost else ('N/A', 'N/A', 'N/A'))
+            + (tlb_model.get_result() if tlb_model else ('N/A', 'N/A')))
+
+
+def run_stream(accesses, trace_name: str, algs: list, models: list, output_file: str, buffer_size: int,
+               snapshot_interval: int) -> list:
+    """
+    Feeds all algorithms with accesses as they arrive. At most `buffer_size` accesses are buffered
+    (plus the lookahead window of bounded-lookahead OPT). Every `snapshot_interval` accesses partial results
+    are appended to snapshot file next to the results.
+    :param accesses: iterator of memory accesses
+    :param trace_name: name of the stream written in results
+    :param algs: algorithm instances
+    :param models: tuples (cost model or None, TLB or None) attached to algorithms
+    :param output_file: path to results file
+    :param buffer_size: number of accesses read at once
+    :param snapshot_interval: number of accesses between snapshots
+    :return: final results
+    """
+    feeds = [getattr(alg, 'feed', alg.step) for alg in algs]
+    # processing time of every algorithm [s], reading and decoding of the stream is shared and not included
+    elapsed = [0.0] * len(algs)
+    received = 0
+    next_snapshot = snapshot_interval
+
+    with open(os.path.splitext(output_file)[0] + '_snapshots.csv', "w") as snapshots:
+        writer = csv.writer(snapshots, lineterminator='\n')
+        writer.writerow(RESULT_HEADER)
+
+        while True:
+            batch = list(itertools.islice(accesses, buffer_size))
+            if not batch:
+                break
+            for index, feed in enumerate(feeds):
+                t_0 = time.perf_counter()
+                for access in batch:
+                    feed(access)
+                elapsed[index] += time.perf_counter() - t_0
+            received += len(batch)
+
+            if received >= next_snapshot:
+                next_snapshot = received + snapshot_interval
+                for alg, alg_models, alg_elapsed in zip(algs, models, elapsed):
+                    writer.writerow(create_snapshot(alg).get_result(alg.__str__(), trace_name, alg_elapsed * 1000)
+                                    + get_model_columns(alg_models))
+                snapshots.flush()
+                LOG.info("Processed %s accesses", received)
+
+    results = []
+    for alg, alg_models, alg_elapsed in zip(algs, models, elapsed):
+        if isinstance(alg, lookahead_opt.LookaheadOpt):
+            t_0 = time.perf_counter()
+            alg.flush()
+            alg_elapsed += time.perf_counter() - t_0
+        alg.print_results()
+        results.append(create_snapshot(alg).get_result(alg.__str__(), trace_name, alg_elapsed * 1000)
+                       + get_model_columns(alg_models))
+    return results
+
+
+def load_manifest(manifest_file: str) -> dict:
+    """
+    :param manifest_file: path to JSON manifest or TOML manifest (`.toml` extension)
+    :return: decoded manifest
+    """
+    if manifest_file.endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            raise ValueError("TOML manifests need Python 3.11 or newer, use JSON manifest.")
+        with open(manifest_file, 'rb') as manifest:
+            return tomllib.load(manifest)
+    with open(manifest_file) as manifest:
+        return json.load(manifest)
+
+
+def as_list(value) -> list:
+    """
+    :param value: single value or list of values
+    :return: list of values
+    """
+    return value if isinstance(value, list) else [value]
+
+
+def parse_manifest(manifest: dict) -> list:
+    """
+    Validates manifest and expands its runs into configurations.
+    Run: {"trace": <tracefile>, "frames": <numframes> or [...], "refresh": <refresh> or [...],
+          "algorithms": [<class name>, ...] (all by default), "seed": <seed>, "window": <window>,
+          "format": <format>, "pagesize": <pagesize>, "address_bits": <address bits>}
+    :param manifest: decoded manifest, object with list of runs under "runs" key
+    :return: list of tuples (trace key, frames, refresh, seed, window, algorithm classes),
+             trace key is tuple (trace file, format, page size, address bits)
+    """
+    runs = manifest.get('runs') if isinstance(manifest, dict) else None
+    if not runs or not isinstance(runs, list):
+        raise ValueError("Manifest should be an object with a non-empty list of runs.")
+
+    configurations = []
+    for run in runs:
+        if not isinstance(run, dict):
+            raise ValueError("Run should be an object, got: {}.".format(run))
+        trace_file = run.get('trace')
+        if not trace_file or not os.path.isfile(trace_file):
+            raise ValueError("Trace file '{}' doesn't exist.".format(trace_file))
+        trace_format = run.get('format', iparser.AUTO)
+        page_size = run.get('pagesize', '4K')
+        address_bits = int(run.get('address_bits', pt.DEFAULT_ADDRESS_BITS))
+        if trace_format not in iparser.TRACE_FORMATS or page_size not in pt.PAGE_SIZES \
+                or address_bits not in pt.ADDRESS_BITS:
+            raise ValueError("Unknown format, page size or address width of trace '{}'.".format(trace_file))
+
+        algorithm_names = as_list(run.get('algorithms', list(ALGORITHM_NAMES)))
+        unknown = [name for name in algorithm_names if name not in ALGORITHM_NAMES]
+        if unknown:
+            raise ValueError("Unknown algorithms: {}. Available: {}.".format(', '.join(unknown),
+                                                                             ', '.join(ALGORITHM_NAMES)))
+        algorithms = [ALGORITHM_NAMES[name] for name in algorithm_names]
+
+        frames = [int(elem) for elem in as_list(run.get('frames', 3))]
+        if min(frames) < 1:
+            raise ValueError("Number of frames should be positive.")
+        seed = int(run.get('seed', random_replacement.RandomReplacement.DEFAULT_SEED))
+        window = int(run.get('window', wsclock.WSClock.DEFAULT_WINDOW))
+        if window < 1:
+            raise ValueError("Working set window should be positive.")
+
+        trace_key = (trace_file, trace_format, page_size, address_bits)
+        for refresh in as_list(run.get('refresh', 5)):
+            for num_frames in frames:
+                configurations.append((trace_key, num_frames, int(refresh), seed, window, algorithms))
+    return configurations
+
+
+def load_decoded_trace(trace_key: tuple, with_stats: bool = False) -> tuple:
+    """
+    :param trace_key: tuple (trace file, format, page size, address bits)
+    :param with_stats: load trace statistics sidecar (written next to the trace if missing or stale)
+    :return: tuple (decoded trace, trace statistics or None)
+    """
+    trace_file, trace_format, page_size, address_bits = trace_key
+    trace = pt.decode_trace(list(iparser.iterate_trace_file(trace_file, trace_format)), pt.PAGE_SIZES[page_size],
+                            address_bits)
+    if not trace:
+        raise ValueError("Trace file '{}' is empty.".format(trace_file))
+    if not with_stats:
+        return trace, None
+    return trace, trace_stats.load_stats(trace_file, trace, pt.PAGE_SIZES[page_size], address_bits, trace_format)
+
+
+def run_batch(configurations: list, cache: TraceCache, args) -> list:
+    """
+    Runs all configurations in one process, every distinct trace is parsed once as long as it stays in cache.
+    :param configurations: configurations expanded by parse_manifest
+    :param cache: cache of decoded traces
+    :param args: parsed command line arguments (cost model and TLB)
+    :return: result rows of all configurations
+    """
+    results = []
+    for trace_key, num_frames, refresh, seed, window, algorithms in configurations:
+        trace, stats = cache.get(trace_key, lambda: load_decoded_trace(trace_key, args.stats))
+        for algorithm in algorithms:
+            alg = create_algorithm(algorithm, pt.DecodedPageTable(num_frames), copy.copy(trace), refresh, seed,
+                                   window, next_uses=stats.next_uses if stats else None)
+            models = attach_models(alg, args)
+            t_0 = time.perf_counter()
+            result_tuple = alg.run_algorithm()
+            total_time = (time.perf_counter() - t_0) * 1000
+            results.append(result_tuple.get_result(alg.__str__(), os.path.basename(trace_key[0]), total_time)
+                           + get_model_columns(models))
+    return results
+
+
+def main_batch(args):
+    """
+    Runs configurations of the manifest, all results are written to one CSV file.
+    """
+    try:
+        configurations = parse_manifest(load_manifest(args.manifest))
+    except (ValueError, TypeError, OSError) as error:
+        LOG.error("Invalid manifest '%s': %s Terminating.", args.manifest, error)
+        sys.exit(0)
+    if args.cache < 0:
+        LOG.error("Number of cached traces should be non-negative. Terminating.")
+        sys.exit(0)
+
+    cache = TraceCache(args.cache)
+    t_0 = time.perf_counter()
+    results = run_batch(configurations, cache, args)
+    LOG.info("TOTAL BATCH TIME: %s ms (%s configurations, trace cache: %s hits, %s misses)",
+             str((time.perf_counter() - t_0) * 1000), len(configurations), cache.hits, cache.misses)
+
+    if not os.path.exists(RESULT_DIR):
+        os.makedirs(RESULT_DIR)
+    output_file = RESULT_DIR + 'batch_' + os.path.splitext(os.path.basename(args.manifest))[0] + '.csv'
+    serialize_results(results, output_file)
+    store_results(args.store, output_file)
 
 
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("--numframes", default=3, help="numframes")
+    parser.add_argument("--numframes", default=3,
+                        help="numframes, comma separated numbers of frames are simulated in lock-step")
     parser.add_argument("--refresh", default=5, help="refresh time [ms] (for aging alg): <refresh>")
     parser.add_argument("--tracefile", default="tests/resources/test.trace", help="tracefile (optional): <tracefile>")
+    parser.add_argument("--seed", default=random_replacement.RandomReplacement.DEFAULT_SEED,
+                        help="seed (for random alg): <seed>")
+    parser.add_argument("--window", default=wsclock.WSClock.DEFAULT_WINDOW,
+                        help="working set window [accesses] (for WSClock alg): <window>")
+    parser.add_argument("--device", choices=cm.PROFILES.keys(),
+                        help="swap device latency profile of the cost model (no cost model by default)")
+    parser.add_argument("--writeback", default=cm.ASYNC, choices=cm.WRITEBACKS,
+                        help="dirty pages writeback mode (cost model)")
+    parser.add_argument("--metrics-window", default=0,
+                        help="write statistics every <accesses> accesses (0 - disabled)")
+    parser.add_argument("--lookahead", default=lookahead_opt.LookaheadOpt.DEFAULT_LOOKAHEAD,
+                        help="lookahead window [accesses] (for bounded-lookahead OPT in streaming mode)")
+    parser.add_argument("--buffer", default=DEFAULT_STREAM_BUFFER,
+                        help="accesses read from the stream at once (streaming mode)")
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT_INTERVAL,
+                        help="write partial results every <accesses> accesses (streaming mode)")
+    parser.add_argument("--format", default=iparser.AUTO, choices=iparser.TRACE_FORMATS,
+                        help="trace format (gzip and xz compressed files are recognized automatically)")
+    parser.add_argument("--tlb-entries", default=0, help="number of TLB entries (0 - no TLB)")
+    parser.add_argument("--tlb-ways", default=tlb.DEFAULT_WAYS, help="TLB associativity")
+    parser.add_argument("--tlb-policy", default=tlb.LRU, choices=tlb.POLICIES, help="TLB replacement policy")
+    parser.add_argument("--pagesize", default='4K', choices=pt.PAGE_SIZES.keys(), help="page size")
+    parser.add_argument("--address-bits", default=pt.DEFAULT_ADDRESS_BITS, type=int, choices=pt.ADDRESS_BITS,
+                        help="virtual address width")
+    parser.add_argument("--topk", default=0,
+                        help="number of the most faulting, evicted and written pages of every algorithm (0 - off)")
+    parser.add_argument("--sketch-size", default=attribution.DEFAULT_CAPACITY,
+                        help="number of pages counted at once by fault attribution (bounds its memory)")
+    parser.add_argument("--repeat", type=int,
+                        help="timing mode: number of measured runs of every algorithm (see timing)")
+    parser.add_argument("--warmup", default=timing.DEFAULT_WARMUP, type=int,
+                        help="timing mode: number of runs before the measured ones")
+    parser.add_argument("--keep-gc", action="store_true",
+                        help="timing mode: keep garbage collection enabled during measured runs")
+    parser.add_argument("--target-fault-rate", type=float,
+                        help="find the smallest number of frames with at most <rate> page faults per access")
+    parser.add_argument("--workers", type=int, help="worker processes of auto-sizing mode (number of CPUs by default)")
+    parser.add_argument("--manifest", help="run configurations of JSON or TOML manifest (batch mode)")
+    parser.add_argument("--cache", default=DEFAULT_TRACE_CACHE_SIZE, type=int,
+                        help="number of decoded traces kept in memory (batch mode, 0 - none)")
+    parser.add_argument("--stats", action="store_true",
+                        help="use trace statistics sidecar `<tracefile>.stats` (next-use array of OPT), "
+                             "computing and writing it next to the trace if it's missing or stale")
+    parser.add_argument("--store", nargs='?', const=results_store.DEFAULT_DB,
+                        help="also append results to the results store (results/results.db by default)")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="read trace file once, feeding every access to all algorithms and numbers of frames")
+    parser.add_argument("--algorithms",
+                        help="comma separated algorithms (streaming mode, Clock,LRU,Aging,Opt by default, "
+                             "and lock-step mode, all by default)")
+    parser.add_argument("--stream", action="store_true",
+                        help="read trace file lazily in streaming mode (memory-capped runs of huge traces)")
     args = parser.parse_args()
 
     cmd_line_args = list()
@@ -66,35 +619,256 @@ def main():
 
     LOG.info("Parsed args: %s", cmd_line_args)
 
-    num_frames = int(cmd_line_args[0])
+    frame_counts = [int(elem) for elem in str(cmd_line_args[0]).split(',')]
+    num_frames = frame_counts[0]
     refresh = int(cmd_line_args[1])
     trace_file = cmd_line_args[2]
+    seed = int(args.seed)
+    window = int(args.window)
+    metrics_window = int(args.metrics_window)
+
+    if window < 1:
+        LOG.error("Working set window should be positive. Terminating.")
+        sys.exit(0)
+
+    if int(args.tlb_entries) % int(args.tlb_ways):
+        LOG.error("Number of TLB entries should be a multiple of TLB ways. Terminating.")
+        sys.exit(0)
 
-    memory_addresses = iparser.parse_trace_file(trace_file)
+    if args.repeat is not None and args.repeat < 1:
+        LOG.error("Number of measured runs should be positive. Terminating.")
+        sys.exit(0)
+
+    if args.manifest:
+        main_batch(args)
+        return
+
+    if args.stream or is_stream(trace_file):
+        main_stream(args, frame_counts, refresh, metrics_window)
+        return
+
+    if args.lockstep or len(frame_counts) > 1:
+        main_lockstep(args, frame_counts, refresh, metrics_window)
+        return
+
+    memory_addresses = None
+    if os.path.isfile(trace_file):
+        # addresses are decoded into VPNs once, algorithms run on DecodedPageTable
+        memory_addresses = pt.decode_trace(list(iparser.iterate_trace_file(trace_file, args.format)),
+                                           pt.PAGE_SIZES[args.pagesize], args.address_bits)
     if not memory_addresses:
         LOG.error("Trace file parsing error. Terminating.")
         sys.exit(0)
 
+    # statistics are needed by auto-sizing, otherwise OPT builds its own index unless the sidecar is asked for
+    stats = None
+    if args.stats or args.target_fault_rate is not None:
+        stats = trace_stats.load_stats(trace_file, memory_addresses, pt.PAGE_SIZES[args.pagesize],
+                                       args.address_bits, args.format, args.stats)
+        LOG.info("Trace statistics: %s", stats.get_summary())
+    next_uses = stats.next_uses if stats else None
+
+    if args.target_fault_rate is not None:
+        main_autosize(args, trace_file, memory_addresses, refresh, seed, window, stats)
+        return
+
+    if args.repeat is not None:
+        main_timing(args, trace_file, memory_addresses, num_frames, refresh, seed, window, stats)
+        return
+
     # build the model for our page table, 32bit address space, initialize the table
-    algorithms = (clock.Clock, lru.LRU, aging.Aging, opt.Opt)
     results = []
+    working_set_sizes = []
+    output_file = create_results_dir(trace_file, num_frames)
+    metrics_output = open(create_metrics_file(output_file), "w") if metrics_window > 0 else None
 
-    for algorithm in algorithms:
-        page_table = pt.PageTable(num_frames)
-        if not algorithm == aging.Aging:
-            alg = algorithm(page_table, copy.copy(memory_addresses))
-        else:
-            alg = algorithm(page_table, copy.copy(memory_addresses), refresh)
-        t_0 = datetime.datetime.now()
+    topk_rows = []
+    for algorithm in ALGORITHMS:
+        page_table = pt.DecodedPageTable(num_frames)
+        alg = create_algorithm(algorithm, page_table, copy.copy(memory_addresses), refresh, seed, window,
+                               next_uses=next_uses)
+        models = attach_models(alg, args)
+        fault_attribution = attach_attribution(alg, args)
+        if metrics_output:
+            windowed_metrics = metrics.WindowedMetrics(metrics_output, metrics_window, alg.__str__())
+            windowed_metrics.attach(alg)
+        t_0 = time.perf_counter()
         result_tuple = alg.run_algorithm()
-        t_1 = datetime.datetime.now()
+        t_1 = time.perf_counter()
+        if metrics_output:
+            windowed_metrics.close()
         LOG.info(vars(result_tuple))
-        total_time = (t_1 - t_0).total_seconds() * 1000
-        results.append(result_tuple.get_result(alg.__str__(), os.path.basename(trace_file), total_time))
+        total_time = (t_1 - t_0) * 1000
+        results.append(result_tuple.get_result(alg.__str__(), os.path.basename(trace_file), total_time)
+                       + get_model_columns(models))
         LOG.info("TOTAL %s TIME: %s ms", alg.__str__(), str(total_time))
+        if fault_attribution:
+            topk_rows += fault_attribution.get_rows(alg.__str__(), int(args.topk))
+        if algorithm == wsclock.WSClock:
+            working_set_sizes = alg.get_working_set_sizes()
 
-    output_file = create_results_dir(trace_file, num_frames)
+    if metrics_output:
+        metrics_output.close()
     serialize_results(results, output_file)
+    store_results(args.store, output_file)
+    if topk_rows:
+        serialize_topk(topk_rows, os.path.splitext(output_file)[0] + '_topk.csv')
+    serialize_working_set_sizes(working_set_sizes, os.path.splitext(output_file)[0] + '_wsclock_ws.csv')
+
+
+def main_timing(args, trace_file: str, memory_addresses: list, num_frames: int, refresh: int, seed: int,
+                window: int, stats: trace_stats.TraceStats):
+    """
+    Runs every algorithm repeatedly and writes summaries of run times next to the results.
+    Cost model and TLB are attached to every run as in results mode, so run times of both modes are comparable.
+    """
+    timings = []
+    for algorithm in ALGORITHMS:
+        # models of the last created (measured) run
+        models = []
+
+        def create(algorithm=algorithm):
+            alg = create_algorithm(algorithm, pt.DecodedPageTable(num_frames), copy.copy(memory_addresses), refresh,
+                                   seed, window, next_uses=stats.next_uses if stats else None)
+            models[:] = [attach_models(alg, args)]
+            return alg
+
+        result_tuple, summary = timing.time_algorithm(create, args.repeat, args.warmup, not args.keep_gc)
+        timings.append(result_tuple.get_result(summary.name, os.path.basename(trace_file), round(summary.median, 3))
+                       + get_model_columns(models[0]) + summary.get_columns())
+
+    output_file = os.path.splitext(create_results_dir(trace_file, num_frames))[0] + '_timing.csv'
+    serialize_timings(timings, output_file)
+    store_results(args.store, output_file)
+
+
+def main_autosize(args, trace_file: str, memory_addresses: list, refresh: int, seed: int, window: int,
+                  stats: trace_stats.TraceStats = None):
+    """
+    Finds the smallest number of frames meeting the target fault rate for every algorithm.
+    """
+    factory = functools.partial(create_algorithm, refresh=refresh, seed=seed, window=window)
+    t_0 = datetime.datetime.now()
+    sizes, lru_curve, opt_curve = autosize.autosize(memory_addresses, args.target_fault_rate,
+                                                    AUTOSIZE_SEARCH_ALGORITHMS, factory, args.workers, stats)
+    LOG.info("TOTAL AUTO-SIZING TIME: %s ms", str((datetime.datetime.now() - t_0).total_seconds() * 1000))
+
+    trace_name = os.path.basename(trace_file)
+    results = [(name, trace_name, args.target_fault_rate, frames if frames else 'N/A', page_faults,
+                round(page_faults / len(memory_addresses), 6), method)
+               for name, frames, page_faults, method in sizes]
+
+    output_dir = create_trace_results_dir(trace_file)
+    serialize_autosize_results(results, os.path.join(output_dir, 'target_{}.csv'.format(args.target_fault_rate)))
+    serialize_miss_curves(lru_curve, opt_curve, os.path.join(output_dir, 'miss_curves.csv'))
+
+
+def get_stream_algorithms(args, next_uses=None, default_algorithms: tuple = STREAM_ALGORITHMS) -> list:
+    """
+    :param args: parsed command line arguments
+    :param next_uses: next-use array of the trace, OPT is replaced with bounded-lookahead OPT without it
+    :param default_algorithms: algorithm classes used without --algorithms
+    :return: algorithm classes selected with --algorithms, default_algorithms by default
+    """
+    if not args.algorithms:
+        if next_uses is None:
+            return [lookahead_opt.LookaheadOpt if algorithm == opt.Opt else algorithm
+                    for algorithm in default_algorithms]
+        return [opt.Opt if algorithm == lookahead_opt.LookaheadOpt else algorithm for algorithm in default_algorithms]
+    algorithms = []
+    for name in args.algorithms.split(','):
+        if name not in ALGORITHM_NAMES:
+            raise ValueError("Unknown algorithm '{}'. Available: {}.".format(name, ', '.join(ALGORITHM_NAMES)))
+        algorithm = ALGORITHM_NAMES[name]
+        algorithms.append(lookahead_opt.LookaheadOpt if algorithm == opt.Opt and next_uses is None else algorithm)
+    return algorithms
+
+
+def main_stream(args, frame_counts: list, refresh: int, metrics_window: int, next_uses=None,
+                memory_addresses: list = None, default_algorithms: tuple = STREAM_ALGORITHMS):
+    """
+    Runs algorithms for all numbers of frames in lock-step on stdin, named pipe or trace file read lazily:
+    every access is read and decoded once and fed to all of them.
+    Results of every number of frames are written to its own `<numframes>_frames.csv`.
+    :param next_uses: next-use array of the trace (for OPT algorithm)
+    :param memory_addresses: decoded trace fed instead of reading the trace file
+    :param default_algorithms: algorithm classes used without --algorithms
+    """
+    trace_name = 'stdin' if args.tracefile == STDIN else os.path.basename(args.tracefile)
+    # snapshots and metrics of all runs are written next to the results of the first (or the only) number of frames
+    output_file = create_results_dir(trace_name, '_'.join(str(num_frames) for num_frames in frame_counts))
+    metrics_output = open(create_metrics_file(output_file), "w") if metrics_window > 0 else None
+    try:
+        algorithms = get_stream_algorithms(args, next_uses, default_algorithms)
+    except ValueError as error:
+        LOG.error("%s Terminating.", error)
+        sys.exit(0)
+
+    algs = []
+    models = []
+    all_metrics = []
+    attributions = []
+    for num_frames in frame_counts:
+        for algorithm in algorithms:
+            alg = create_algorithm(algorithm, pt.DecodedPageTable(num_frames), [], refresh, int(args.seed),
+                                   int(args.window), int(args.lookahead), next_uses)
+            alg_models = attach_models(alg, args)
+            fault_attribution = attach_attribution(alg, args)
+            if fault_attribution:
+                attributions.append((alg, fault_attribution))
+            if metrics_output:
+                alg_name = alg.__str__() if len(frame_counts) == 1 else '{}/{}'.format(alg, num_frames)
+                windowed_metrics = metrics.WindowedMetrics(metrics_output, metrics_window, alg_name)
+                windowed_metrics.attach(alg)
+                all_metrics.append(windowed_metrics)
+            algs.append(alg)
+            models.append(alg_models)
+
+    if memory_addresses is not None:
+        accesses = iter(memory_addresses)
+    else:
+        accesses = pt.iterate_decoded(iterate_stream(args.tracefile, args.format), pt.PAGE_SIZES[args.pagesize],
+                                      args.address_bits)
+    results = run_stream(accesses, trace_name, algs, models, output_file,
+                         int(args.buffer), int(args.snapshot))
+
+    for windowed_metrics in all_metrics:
+        windowed_metrics.close()
+    if metrics_output:
+        metrics_output.close()
+    for num_frames in frame_counts:
+        frames_file = create_results_dir(trace_name, num_frames)
+        serialize_results([result for result in results if result[2] == num_frames], frames_file)
+        store_results(args.store, frames_file)
+        if attributions:
+            serialize_topk([row for alg, fault_attribution in attributions
+                            if alg.page_table.num_frames == num_frames
+                            for row in fault_attribution.get_rows(alg.__str__(), int(args.topk))],
+                           os.path.splitext(frames_file)[0] + '_topk.csv')
+        for alg in algs:
+            if isinstance(alg, wsclock.WSClock) and alg.page_table.num_frames == num_frames:
+                serialize_working_set_sizes(alg.get_working_set_sizes(),
+                                            os.path.splitext(frames_file)[0] + '_wsclock_ws.csv')
+
+
+def main_lockstep(args, frame_counts: list, refresh: int, metrics_window: int):
+    """
+    Runs algorithms for all numbers of frames in lock-step on trace file read once, all algorithms by default.
+    OPT needs the next-use array of the whole trace before the first access, so with OPT the trace is decoded
+    into memory once, the array is built from it (or read from the statistics sidecar) and the lock-step pass
+    runs on the decoded trace. Without OPT the trace file is read lazily.
+    """
+    if not os.path.isfile(args.tracefile):
+        LOG.error("Trace file '%s' doesn't exist. Terminating.", args.tracefile)
+        sys.exit(0)
+    next_uses = None
+    memory_addresses = None
+    if not args.algorithms or 'Opt' in args.algorithms.split(','):
+        memory_addresses = pt.decode_trace(list(iparser.iterate_trace_file(args.tracefile, args.format)),
+                                           pt.PAGE_SIZES[args.pagesize], args.address_bits)
+        next_uses = trace_stats.load_stats(args.tracefile, memory_addresses, pt.PAGE_SIZES[args.pagesize],
+                                           args.address_bits, args.format, args.stats).next_uses
+    main_stream(args, frame_counts, refresh, metrics_window, next_uses, memory_addresses, ALGORITHMS)
 
 
 if __name__ == "__main__":